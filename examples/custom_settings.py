@@ -13,11 +13,50 @@ EXTREME_TIMEOUT = 30
 ARCHIVE_EXISTING_LOGS = False
 ARCHIVE_EXISTING_DOWNLOADS = False
 
+# Screenshot image format ("png", "jpeg", "webp"), quality, and max size.
+SCREENSHOT_FORMAT = "png"
+SCREENSHOT_QUALITY = 85
+
 # Waiting for Document.readyState to be "Complete" after browser actions.
 WAIT_FOR_RSC_ON_PAGE_LOADS = True
 WAIT_FOR_RSC_ON_CLICKS = True
 WAIT_FOR_ANGULARJS = True
 
+# How pages are considered ready: "ready_state" or "network_idle".
+WAIT_STRATEGY = "ready_state"
+NETWORK_IDLE_TIME = 0.5
+
+# Waiting for elements with an in-browser MutationObserver instead of polling.
+WAIT_FOR_ELEMENTS_WITH_OBSERVER = False
+
+# Checking element visibility and text with one JavaScript call per check.
+PROBE_ELEMENTS_WITH_JS = False
+
+# Reusing elements between consecutive actions on the same selector.
+CACHE_ELEMENT_LOOKUPS = False
+
+# The parser for get_beautiful_soup(): "html.parser", "lxml", or "html5lib".
+HTML_PARSER = "html.parser"
+CACHE_PARSED_PAGES = True
+
+# Comparing check_window() layouts with DOM hashes computed in the browser.
+CHECK_WINDOW_WITH_JS = True
+
+# Screenshot comparisons of check_window(level=4): tolerance and max ratio.
+PIXEL_DIFF_TOLERANCE = 16
+PIXEL_DIFF_MAX_RATIO = 0.001
+
+# The file format of check_window() baselines: "compact" or "folders".
+VISUAL_BASELINE_FORMAT = "compact"
+
+# Finding page links with JavaScript instead of parsing the page source.
+GET_LINKS_WITH_JS = False
+
+# Link checks: threads, requests per host, and status code cache (seconds).
+LINK_CHECK_THREADS = 10
+LINK_CHECK_MAX_PER_HOST = 6
+LINK_CHECK_CACHE_TTL = 300
+
 # Changing the default behavior of Demo Mode. Activate with: --demo_mode
 DEFAULT_DEMO_MODE_TIMEOUT = 0.5
 HIGHLIGHTS = 4
@@ -38,6 +77,19 @@ CHROME_START_HEIGHT = 840
 HEADLESS_START_WIDTH = 1440
 HEADLESS_START_HEIGHT = 1880
 
+# Adding JS & CSS libraries inline from "seleniumbase/resources".
+USE_BUNDLED_ASSETS = True
+
+# Recycling browsers from the pool of pre-launched browsers. (--browser-pool)
+BROWSER_POOL_MAX_USES = 25
+BROWSER_POOL_MAX_MEMORY_GROWTH = 500
+
+# Writing log files to disk in background threads.
+WRITE_LOG_FILES_IN_BACKGROUND = True
+
+# Saving test durations for running the slowest tests first. (--duration_order)
+TEST_DURATIONS_FILE = "test_durations.json"
+
 # Changing the default behavior of MasterQA Mode.
 MASTERQA_DEFAULT_VALIDATION_MESSAGE = "Does the page look good?"
 MASTERQA_WAIT_TIME_BEFORE_VERIFY = 0.5
@@ -50,6 +102,10 @@ MASTERQA_MAX_IDLE_TIME_BEFORE_QUIT = 600
 # (Also works with Authy and other compatible apps.)
 TOTP_KEY = "base32secretABCD"
 
+# The database for saving data from tests: "mysql" or "sqlite"
+DB_BACKEND = "mysql"
+SQLITE_DB_PATH = "test_results.db"
+
 # MySQL DB Credentials
 # (For saving data from tests to a MySQL DB)
 # Usage: "--with-db_reporting"
@@ -58,6 +114,8 @@ DB_PORT = 3306
 DB_USERNAME = "root"
 DB_PASSWORD = "test"
 DB_SCHEMA = "test_db"
+DB_REPORTING_IN_BACKGROUND = True
+DB_REPORTING_FLUSH_INTERVAL = 2
 
 # Amazon S3 Bucket Credentials
 # (For saving screenshots and other log files from tests)
@@ -32,11 +32,28 @@ SCREENSHOT_NAME = "screenshot.png"
 BASIC_INFO_NAME = "basic_test_info.txt"
 PAGE_SOURCE_NAME = "page_source.html"
 
+# The image format of saved screenshots: "png", "jpeg", or "webp".
+# JPEG/WebP screenshots use SCREENSHOT_QUALITY (1-100), and are much smaller.
+# If SCREENSHOT_MAX_SIZE is set, screenshots are scaled down (keeping the
+# aspect ratio) so that neither side is larger than that many pixels.
+# The original dimensions are kept in the image metadata (EXIF).
+# (Requires Pillow: "pip install Pillow". Without it, screenshots stay PNGs.)
+# Used for log screenshots, save_screenshot(), and check_window() baselines.
+# The "--screenshot-format", "--screenshot-quality", and
+# "--screenshot-max-size" command-line options override these.
+SCREENSHOT_FORMAT = "png"
+SCREENSHOT_QUALITY = 85
+SCREENSHOT_MAX_SIZE = None
+
 # Default names for files and folders saved when using nosetests reports.
 # Usage: "--report". (NOSETESTS only)
 LATEST_REPORT_DIR = "latest_report"
 REPORT_ARCHIVE_DIR = "archived_reports"
 HTML_REPORT = "report.html"
+# If set, the pytest-html report (--html=FILE) shows screenshot thumbnails
+# of this width (in pixels) with a link to the full screenshot in the logs,
+# instead of embedding full screenshots. (Requires Pillow: "pip install Pillow")
+REPORT_THUMBNAIL_WIDTH = None
 RESULTS_TABLE = "results_table.csv"
 
 """
@@ -54,6 +71,110 @@ This adds wait_for_angularjs() after various browser actions.
 """
 WAIT_FOR_ANGULARJS = True
 
+"""
+This sets how wait_for_ready_state_complete() waits for pages to be ready.
+"ready_state": Waits for document.readyState == "complete" (and AngularJS).
+               After a click that doesn't change the URL, only the AngularJS
+               check runs, since no new page was loaded.
+"network_idle": Also waits until fetch() & XHR calls have been idle for
+                NETWORK_IDLE_TIME seconds. (Better for single-page apps.)
+                Pages that keep requests open (such as long-polling) never
+                go idle, and fall back to the readyState check after
+                SMALL_TIMEOUT seconds.
+The "--wait-strategy=STRATEGY" command-line option overrides this.
+"""
+WAIT_STRATEGY = "ready_state"
+NETWORK_IDLE_TIME = 0.5
+
+"""
+If True, the wait_for_*() methods for elements and text pause inside the
+browser between checks by using a MutationObserver, which resumes the wait
+as soon as the page changes to meet the condition, rather than polling
+WebDriver every 100 ms. This means fewer WebDriver calls and faster waits.
+(Safari and IE always use the polling loop. So do non-CSS/XPath selectors.)
+"""
+WAIT_FOR_ELEMENTS_WITH_OBSERVER = False
+
+"""
+If True, element visibility and text checks (such as is_element_visible(),
+is_text_visible(), assert_text(), and the wait_for_*() loops) use a single
+JavaScript call per check instead of up to three WebDriver calls.
+Visibility is then based on the computed style and the element's rects.
+(Only for CSS Selectors and XPath. Other selectors use WebDriver calls.)
+"""
+PROBE_ELEMENTS_WITH_JS = False
+
+"""
+If True, consecutive actions on the same selector (such as click(),
+update_text(), and assert_text()) reuse the element found by the previous
+action, as long as the element is still attached to the page and visible.
+The element is looked up again if the page changes.
+"""
+CACHE_ELEMENT_LOOKUPS = False
+
+"""
+The parser used by get_beautiful_soup(): "html.parser" (built-in), "lxml"
+(much faster on large pages: "pip install lxml"), or "html5lib".
+Parsers that aren't installed fall back to "html.parser".
+(Different parsers can build slightly different trees from invalid HTML,
+ so reset check_window() baselines after changing this.)
+If CACHE_PARSED_PAGES is True, SeleniumBase methods that only read the page
+(such as check_window() and get_unique_links() on an unchanged page) reuse
+the tree that was already parsed. (get_beautiful_soup() always returns a
+new tree, since tests may modify it.)
+"""
+HTML_PARSER = "html.parser"
+CACHE_PARSED_PAGES = True
+
+"""
+If True, check_window() walks the DOM inside the browser with one script,
+which also computes a hash of each subtree of the page. Pages that match
+the baseline are detected with a single hash comparison, and only the
+subtrees that changed get their tags compared. (Otherwise the page source
+is parsed with BeautifulSoup.) Baselines saved with False (or saved before
+this option existed) keep using BeautifulSoup until they're reset.
+"""
+CHECK_WINDOW_WITH_JS = True
+
+"""
+For check_window(level=4), which also compares screenshots pixel by pixel:
+A pixel is different if one of its color channels differs by more than
+PIXEL_DIFF_TOLERANCE (0-255). (Allows for anti-aliasing and compression.)
+The check fails if the ratio of different pixels is above
+PIXEL_DIFF_MAX_RATIO. (0.001 means 0.1% of the pixels.)
+"""
+PIXEL_DIFF_TOLERANCE = 16
+PIXEL_DIFF_MAX_RATIO = 0.001
+
+"""
+The file format of new check_window() baselines in the visual_baseline/
+folder: "compact" saves each baseline as a single compressed file (plus
+its screenshot), with atomic writes and an index. "folders" saves each
+baseline as a folder of text files (the format before "compact" existed).
+Baselines in either format can be loaded. To convert old baselines, use:
+"sbase migrate-baselines"
+"""
+VISUAL_BASELINE_FORMAT = "compact"
+
+"""
+If True, get_unique_links() (used by assert_no_404_errors() and
+print_unique_links_with_status_codes()) finds links inside the browser
+with JavaScript, instead of downloading and parsing the page source.
+(Faster for very large pages. Links are resolved by the browser.)
+"""
+GET_LINKS_WITH_JS = False
+
+"""
+Settings for the link checks of assert_no_404_errors() and
+print_unique_links_with_status_codes(). Links are checked by up to
+LINK_CHECK_THREADS threads, with no more than LINK_CHECK_MAX_PER_HOST
+requests to the same host at once. Status codes are cached (and shared
+between tests) for LINK_CHECK_CACHE_TTL seconds. (0 disables expiration.)
+"""
+LINK_CHECK_THREADS = 10
+LINK_CHECK_MAX_PER_HOST = 6
+LINK_CHECK_CACHE_TTL = 300
+
 # Default time to wait after each browser action performed during Demo Mode.
 # Use Demo Mode when you want others to see what your automation is doing.
 # Usage: "--demo_mode". (Can be overwritten by using "--demo_sleep=TIME".)
@@ -93,6 +214,28 @@ CHROME_START_HEIGHT = 840
 HEADLESS_START_WIDTH = 1440
 HEADLESS_START_HEIGHT = 1880
 
+# If True, the Javascript & CSS libraries used for Demo Mode, Messenger,
+# Website Tours, MasterQA, and HTML-Inspector are added to pages inline from
+# the copies in "seleniumbase/resources" instead of loading from the CDN.
+# (Libraries without a copy in that folder are still loaded from the CDN.)
+USE_BUNDLED_ASSETS = True
+
+# When using a pool of pre-launched browsers with "--browser-pool=SIZE",
+# a browser gets replaced after it has been used by this many tests,
+# or if its memory grows by more than this many megabytes while in use.
+# (Memory checks require the "psutil" package, and are skipped without it.)
+BROWSER_POOL_MAX_USES = 25
+BROWSER_POOL_MAX_MEMORY_GROWTH = 500
+
+# If True, log files (screenshots, page sources, and test failure data)
+# are written to disk in background threads while the tests keep running.
+# (Pending writes are flushed when the test run ends.)
+WRITE_LOG_FILES_IN_BACKGROUND = True
+
+# The file where test durations are saved, for running the slowest tests
+# first. (Usage: "--duration_order")
+TEST_DURATIONS_FILE = "test_durations.json"
+
 # #####>>>>>----- MasterQA SETTINGS -----<<<<<#####
 # ##### (Used when importing MasterQA as the parent class)
 
@@ -120,6 +263,12 @@ MASTERQA_MAX_IDLE_TIME_BEFORE_QUIT = 600
 TOTP_KEY = "base32secretABCD"
 
 
+# The database for saving data from tests: "mysql" or "sqlite"
+# "sqlite" saves to a local file (SQLITE_DB_PATH), without a DB server.
+# Usage: "--with-db_reporting" (Or "--with-db_reporting --db_backend=sqlite")
+DB_BACKEND = "mysql"
+SQLITE_DB_PATH = "test_results.db"
+
 # MySQL DB Credentials
 # (For saving data from tests to a MySQL DB)
 # Usage: "--with-db_reporting"
@@ -129,6 +278,12 @@ DB_USERNAME = "root"
 DB_PASSWORD = "test"
 DB_SCHEMA = "test_db"
 
+# If True, test results are written to the MySQL DB in batches from a
+# background thread, every DB_REPORTING_FLUSH_INTERVAL seconds.
+# (Pending writes are flushed when the test run ends.)
+DB_REPORTING_IN_BACKGROUND = True
+DB_REPORTING_FLUSH_INTERVAL = 2
+
 
 # Amazon S3 Bucket Credentials
 # (For saving screenshots and other log files from tests)
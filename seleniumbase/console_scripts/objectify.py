@@ -3,16 +3,21 @@ Converts a SeleniumBase Python file into one that uses the Page Object Pattern.
 
 Usage:
         seleniumbase objectify [SELENIUMBASE_PYTHON_FILE].py
+        (Or a folder of test files, which get processed in parallel.)
 Output:
         A modified version of the file where the selectors
         have been replaced with variable names defined in
         "page_objects.py", supporting the Page Object Pattern.
+Selectors are found by the rewrite_engine module, which tokenizes each file
+once, and finds the calls of SeleniumBase methods that take a selector.
 """
 
 import codecs
+import collections
 import os
 import re
 import sys
+from seleniumbase.console_scripts import rewrite_engine
 
 PAGE_OBJECTS_FILE = "page_objects.py"  # Don't change this. It's hard-coded.
 
@@ -105,7 +110,7 @@ def remove_extra_slashes(selector):
     return selector
 
 
-def create_objects_file(selector_list_dict=None):
+def create_objects_file(selector_list_dict=None, file_path=PAGE_OBJECTS_FILE):
     data = []
     if selector_list_dict:
         data.append("# -*- coding: utf-8 -*-")
@@ -130,7 +135,6 @@ def create_objects_file(selector_list_dict=None):
         data.append("class Page(object):")
         data.append('    html = "html"')
         data.append("")
-    file_path = PAGE_OBJECTS_FILE
     file = codecs.open(file_path, "w+", "utf-8")
     file.writelines("\r\n".join(data))
     file.close()
@@ -140,12 +144,12 @@ def create_objects_file(selector_list_dict=None):
         print('\n>>> ["%s"] was updated!' % file_path)
 
 
-def scan_objects_file():
-    if not os.path.exists(PAGE_OBJECTS_FILE):
-        create_objects_file()
+def scan_objects_file(file_path=PAGE_OBJECTS_FILE):
+    if not os.path.exists(file_path):
+        create_objects_file(file_path=file_path)
 
     page_selectors = {}
-    with open(PAGE_OBJECTS_FILE, "r", encoding="utf-8") as f:
+    with open(file_path, "r", encoding="utf-8") as f:
         all_code = f.read()
 
     var_names = []
@@ -213,1208 +217,220 @@ def get_next_var_name(existing_names):
     raise Exception("Out of range! (Selector name generation)")
 
 
-def process_test_file(code_lines, selector_dict=None, object_dict=None, add_comments=False):
-
-    seleniumbase_lines = []
+def process_test_file(code_lines, selector_dict=None, object_dict=None, add_comments=False, parsed_code=None):
+    """ Finds the selectors in calls of SeleniumBase methods that take one.
+        (See rewrite_engine.SELECTOR_METHODS) If selector_dict is set, they
+        get replaced with page objects. If object_dict is set, page objects
+        get replaced with selectors. (The code is only tokenized once.)
+        Returns (seleniumbase_lines, page_selectors, changed) """
+    if not parsed_code:
+        parsed_code = rewrite_engine.ParsedCode("\n".join(code_lines))
     page_selectors = []
     changed = []  # The classes of page_objects.py to add to the test import
+    edits = []
+    added_comments = collections.OrderedDict()  # Key: row, Value: selectors
+    removed_comments = set()  # Rows
 
-    for line in code_lines:
-        line = line.rstrip()
-
-        # Handle self.click(SELECTOR)
-        if not object_dict:
-            data = re.match(r"""^(\s*)self\.click""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""", line,)
-        else:
-            data = re.match(r"""^(\s*)self\.click""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line)
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(3)
-            command = """%sself.click(%s)%s""" % (whitespace, selector, comments)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.click(%s)%s""" % (whitespace, selector_object, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.click(%s)%s""" % (whitespace, selector_object, comments,)
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.js_click(SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.js_click""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(r"""^(\s*)self\.js_click""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line)
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(3)
-            command = """%sself.js_click(%s)%s""" % (whitespace, selector, comments)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.js_click(%s)%s""" % (whitespace, selector_object, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.js_click(%s)%s""" % (whitespace, selector_object, comments,)
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.slow_click(SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.slow_click""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(r"""^(\s*)self\.slow_click""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,)
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(3)
-            command = """%sself.slow_click(%s)%s""" % (whitespace, selector, comments)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.slow_click(%s)%s""" % (whitespace, selector_object, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.slow_click(%s)%s""" % (whitespace, selector_object, comments,)
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.assert_element(SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.assert_element""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(r"""^(\s*)self\.assert_element""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,)
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(3)
-            command = """%sself.assert_element(%s)%s""" % (whitespace, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.assert_element(%s)%s""" % (whitespace, selector_object, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.assert_element(%s)%s""" % (whitespace, selector_object, comments,)
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.assert_element_*(SELECTOR)  *= present/not_visible/absent
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.assert_element_(\S*)""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.assert_element_(\S*)""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            by_type = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sself.assert_element_%s(%s)%s""" % (whitespace, by_type, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.assert_element_%s(%s)%s""" % (
-                        whitespace,
-                        by_type,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.assert_element_%s(%s)%s""" % (
-                        whitespace,
-                        by_type,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
+    for call in parsed_code.find_method_calls(rewrite_engine.SELECTOR_METHODS):
+        argument = rewrite_engine.get_argument(call, *rewrite_engine.SELECTOR_METHODS[call.method])
+        if not argument:
             continue
-
-        # Handle self.find_element(SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.find_element""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(r"""^(\s*)self\.find_element""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,)
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(3)
-            command = """%sself.find_element(%s)%s""" % (whitespace, selector, comments)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.find_element(%s)%s""" % (whitespace, selector_object, comments,)
-            if object_dict:
+        if object_dict:
+            if not rewrite_engine.is_dotted_name(argument):
+                continue
+            object_name = parsed_code.get_text(argument)
+            page_selectors.append(object_name)
+            if object_name in object_dict.keys():
+                edits.append((argument.start, argument.end, object_dict[object_name]))
+                changed.append(object_name.split(".")[0])
                 if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.find_element(%s)%s""" % (whitespace, selector_object, comments,)
-            seleniumbase_lines.append(command)
+                    removed_comments.add(call.end_row)
             continue
-
-        # Handle self.get_element(SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.get_element""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(r"""^(\s*)self\.get_element""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,)
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(3)
-            command = """%sself.get_element(%s)%s""" % (whitespace, selector, comments)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.get_element(%s)%s""" % (whitespace, selector_object, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.get_element(%s)%s""" % (whitespace, selector_object, comments,)
-            seleniumbase_lines.append(command)
+        if not rewrite_engine.is_string_literal(argument):
             continue
-
-        # Handle self.wait_for_element(SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.wait_for_element""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(r"""^(\s*)self\.wait_for_element""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,)
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(3)
-            command = """%sself.wait_for_element(%s)%s""" % (whitespace, selector, comments,)
-            if selector_dict:
+        selector = remove_extra_slashes(parsed_code.get_text(argument))
+        page_selectors.append(selector)
+        if selector_dict:
+            optimized_selector = optimize_selector(selector)
+            if optimized_selector in selector_dict.keys():
+                selector_object = selector_dict[optimized_selector]
+                edits.append((argument.start, argument.end, selector_object))
+                changed.append(selector_object.split(".")[0])
                 if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.wait_for_element(%s)%s""" % (whitespace, selector_object, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.wait_for_element(%s)%s""" % (whitespace, selector_object, comments,)
-            seleniumbase_lines.append(command)
-            continue
+                    added_comments.setdefault(call.end_row, []).append(selector)
+
+    for row, selectors in added_comments.items():
+        comment = "# %s" % ", ".join(selectors)
+        if row in parsed_code.comments:
+            token = parsed_code.comments[row]
+            edits.append((token[2], token[3], comment))
+        elif not parsed_code.lines[row - 1].rstrip().endswith("\\"):
+            line_end = parsed_code.get_line_end(row)
+            edits.append((line_end, line_end, "  " + comment))
+    for row in removed_comments:
+        if row in parsed_code.comments:
+            token = parsed_code.comments[row]
+            edits.append((token[2], token[3], ""))
+
+    code = parsed_code.apply_edits(edits)
+    seleniumbase_lines = [line.rstrip() for line in code.split("\n")]
+    return seleniumbase_lines, page_selectors, changed
 
-        # Handle self.wait_for_element_*(SELECTOR)  * = present/visible
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.wait_for_element_(\S*)""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.wait_for_element_(\S*)""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            by_type = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sself.wait_for_element_%s(%s)%s""" % (whitespace, by_type, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.wait_for_element_%s(%s)%s""" % (
-                        whitespace,
-                        by_type,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.wait_for_element_%s(%s)%s""" % (
-                        whitespace,
-                        by_type,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
 
-        # Handle self.update_text(SELECTOR, TEXT)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.update_text""" r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.update_text""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(3)
-            comments = data.group(4)
-            command = """%sself.update_text(%s, %s)%s""" % (whitespace, selector, text, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.update_text(%s, %s)%s""" % (
-                        whitespace,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.update_text(%s, %s)%s""" % (
-                        whitespace,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
+def update_imports(seleniumbase_lines, shell_command, changed):
+    """ Adds (or removes) the imports of the page_objects.py classes that
+        were used (or removed) by process_test_file(). """
+    if shell_command == "inject-objects" or shell_command == "objectify":
+        added_classes = []
+        for item in changed:
+            if item not in added_classes:
+                added_classes.append(item)
+        for line in seleniumbase_lines:
+            if "from .page_objects import" in line:
+                token = line.split("from .page_objects import ")[1].strip()
+                if token in added_classes:
+                    # Don't import page_objects classes if already imported
+                    added_classes.remove(token)
+        if added_classes:
+            sb_lines = []
+            fit_in = False
+            for line in seleniumbase_lines:
+                if line.startswith("from") and "import" in line and not fit_in:
+                    fit_in = True
+                    for add_me in added_classes:
+                        import_line = "from .page_objects import %s" % add_me
+                        sb_lines.append(import_line)
+                sb_lines.append(line)
+            seleniumbase_lines = sb_lines
 
-        # Handle self.type(SELECTOR, TEXT)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.type""" r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.type""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(3)
-            comments = data.group(4)
-            command = """%sself.type(%s, %s)%s""" % (whitespace, selector, text, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.type(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.type(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            seleniumbase_lines.append(command)
-            continue
+    if shell_command == "revert-objects":
+        removed_classes = []
+        for item in changed:
+            if item not in removed_classes:
+                removed_classes.append(item)
+        if removed_classes:
+            sb_lines = []
+            for line in seleniumbase_lines:
+                if "from .page_objects import" in line:
+                    token = line.split("from .page_objects import ")[1].strip()
+                    if token in removed_classes:
+                        continue
+                sb_lines.append(line)
+            seleniumbase_lines = sb_lines
+    return seleniumbase_lines
 
-        # Handle self.input(SELECTOR, TEXT)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.input""" r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.input""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(3)
-            comments = data.group(4)
-            command = """%sself.input(%s, %s)%s""" % (whitespace, selector, text, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.input(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.input(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            seleniumbase_lines.append(command)
-            continue
 
-        # Handle self.write(SELECTOR, TEXT)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.write""" r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.write""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(3)
-            comments = data.group(4)
-            command = """%sself.write(%s, %s)%s""" % (whitespace, selector, text, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.write(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.write(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            seleniumbase_lines.append(command)
-            continue
+def read_test_file(file_path):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
 
-        # Handle self.add_text(SELECTOR, TEXT)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.add_text""" r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.add_text""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(3)
-            comments = data.group(4)
-            command = """%sself.add_text(%s, %s)%s""" % (whitespace, selector, text, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.add_text(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.add_text(%s, %s)%s""" % (whitespace, selector_object, text, comments,)
-            seleniumbase_lines.append(command)
-            continue
 
-        # Handle self.send_keys(SELECTOR, TEXT)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.send_keys""" r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.send_keys""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(3)
-            comments = data.group(4)
-            command = """%sself.send_keys(%s, %s)%s""" % (whitespace, selector, text, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.send_keys(%s, %s)%s""" % (
-                        whitespace,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.send_keys(%s, %s)%s""" % (
-                        whitespace,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
+def find_page_selectors(file_path):
+    """ Returns (file_path, page_selectors, error) for a test file.
+        (Runs in a worker process when processing a folder.) """
+    try:
+        parsed_code = rewrite_engine.ParsedCode(read_test_file(file_path))
+        page_selectors = process_test_file(None, parsed_code=parsed_code)[1]
+        return file_path, page_selectors, None
+    except Exception as e:
+        return file_path, [], "%s: %s" % (e.__class__.__name__, e)
 
-        # Handle self.set_value(SELECTOR, TEXT)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.set_value""" r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.set_value""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            selector = "%s" % data.group(2)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(3)
-            comments = data.group(4)
-            command = """%sself.set_value(%s, %s)%s""" % (whitespace, selector, text, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.set_value(%s, %s)%s""" % (
-                        whitespace,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.set_value(%s, %s)%s""" % (
-                        whitespace,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
 
-        # Handle self.assert_text(TEXT, SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.assert_text""" r"""\(([\S\s]+),\s?(r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.assert_text""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            text = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sself.assert_text(%s, %s)%s""" % (whitespace, text, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.assert_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.assert_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.assert_exact_text(TEXT, SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.assert_exact_text"""
-                r"""\(([\S\s]+),\s?(r?['"][\S\s]+['"])\)([\S\s]*)"""
-                r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.assert_exact_text""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        if data:
-            whitespace = data.group(1)
-            text = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sself.assert_exact_text(%s, %s)%s""" % (whitespace, text, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.assert_exact_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.assert_exact_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.find_text(TEXT, SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.find_text""" r"""\(([\S\s]+),\s?(r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.find_text""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            text = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sself.find_text(%s, %s)%s""" % (whitespace, text, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.find_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.find_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle if/elif self.is_text_*(TEXT, SELECTOR):  * = present/visible
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)(\S*)\sself\.is_text_(\S*)"""
-                r"""\(([\S\s]+),\s?(r?['"][\S\s]+['"])\):([\S\s]*)"""
-                r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)(\S*)\sself\.is_text_(\S*)""" r"""\(([\S\s]+),\s?([\S\s]+)\):([\S\s]*)""" r"""$""",
-                line,
-            )
-        if data:
-            whitespace = data.group(1)
-            if_type = data.group(2)
-            by_type = data.group(3)
-            text = data.group(4)
-            selector = "%s" % data.group(5)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(6)
-            command = """%s%s self.is_text_%s(%s, %s):%s""" % (
-                whitespace,
-                if_type,
-                by_type,
-                text,
-                selector,
-                comments,
-            )
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%s%s self.is_text_%s(%s, %s):%s""" % (
-                        whitespace,
-                        if_type,
-                        by_type,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%s%s self.is_text_%s(%s, %s):%s""" % (
-                        whitespace,
-                        if_type,
-                        by_type,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.wait_for_text(TEXT, SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.wait_for_text"""
-                r"""\(([\S\s]+),\s?(r?['"][\S\s]+['"])\)([\S\s]*)"""
-                r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.wait_for_text""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            text = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sself.wait_for_text(%s, %s)%s""" % (whitespace, text, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.wait_for_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.wait_for_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
+def rewrite_test_file(task):
+    """ Rewrites a test file with page objects (or selectors), and returns
+        (file_path, error). (Runs in a worker process for folders.)
+        task = (file_path, shell_command, add_comments, selector_dict, object_dict) """
+    file_path, shell_command, add_comments, selector_dict, object_dict = task
+    try:
+        parsed_code = rewrite_engine.ParsedCode(read_test_file(file_path))
+        seleniumbase_lines, page_selectors, changed = process_test_file(
+            None,
+            selector_dict=selector_dict,
+            object_dict=object_dict,
+            add_comments=add_comments,
+            parsed_code=parsed_code,
+        )
+        seleniumbase_lines = update_imports(seleniumbase_lines, shell_command, changed)
+        seleniumbase_code = "\n".join(seleniumbase_lines)
+        # print (seleniumbase_code)  # (For debugging)
+        out_file = codecs.open(file_path, "w+", "utf-8")
+        out_file.writelines(seleniumbase_code)
+        out_file.close()
+        return file_path, None
+    except Exception as e:
+        return file_path, "%s: %s" % (e.__class__.__name__, e)
+
+
+def get_test_files(folder):
+    """ Returns the SeleniumBase test files of a folder. (Not recursive,
+        since the tests import the page_objects.py file of their folder.) """
+    test_files = []
+    for file_name in sorted(os.listdir(folder)):
+        file_path = os.path.join(folder, file_name)
+        if not file_name.endswith(".py") or file_name == PAGE_OBJECTS_FILE:
             continue
-
-        # Handle self.wait_for_text_visible(TEXT, SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.wait_for_text_visible"""
-                r"""\(([\S\s]+),\s?(r?['"][\S\s]+['"])\)([\S\s]*)"""
-                r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)self\.wait_for_text_visible""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        if data:
-            whitespace = data.group(1)
-            text = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sself.wait_for_text(%s, %s)%s""" % (whitespace, text, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
+        if os.path.isfile(file_path) and "def test_" in read_test_file(file_path):
+            test_files.append(file_path)
+    return test_files
+
+
+def process_test_files(shell_command, test_files, add_comments=False, objects_file=PAGE_OBJECTS_FILE):
+    """ Runs a shell command on test files that share a page_objects.py file.
+        The files are tokenized in parallel, by a pool of processes. Then
+        page objects are given names in the order of the files (so names
+        stay the same between runs), and the files are rewritten in parallel.
+        Returns a list of (file_path, error) for the files that failed. """
+    failures = []
+    var_names, existing_selectors, selector_list_dict = scan_objects_file(objects_file)
+    if shell_command == "extract-objects" or shell_command == "objectify":
+        for file_path, page_selectors, error in rewrite_engine.run_in_parallel(
+            find_page_selectors, test_files
+        ):
+            if error:
+                failures.append((file_path, error))
+                continue
+            for selector in page_selectors:
                 selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.wait_for_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.wait_for_text(%s, %s)%s""" % (
-                        whitespace,
-                        text,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
+                if selector not in existing_selectors:
+                    var_name = get_next_var_name(var_names)
+                    var_names.append(var_name)
+                    selector_list_dict["Page"].append((var_name, selector))
+                    existing_selectors.append(selector)
+        create_objects_file(selector_list_dict, objects_file)
+    if shell_command == "extract-objects":
+        print("")
+        return failures
 
-        # Handle if/elif self.is_element_*(SELECTOR):  * = present/visible
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)(\S*)\sself\.is_element_(\S*)""" r"""\((r?['"][\S\s]+['"])\):([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)(\S*)\sself\.is_element_(\S*)""" r"""\(([\S\s]+)\):([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            if_type = data.group(2)
-            by_type = data.group(3)
-            selector = "%s" % data.group(4)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(5)
-            command = """%s%s self.is_element_%s(%s):%s""" % (
-                whitespace,
-                if_type,
-                by_type,
-                selector,
-                comments,
-            )
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%s%s self.is_element_%s(%s):%s""" % (
-                        whitespace,
-                        if_type,
-                        by_type,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%s%s self.is_element_%s(%s):%s""" % (
-                        whitespace,
-                        if_type,
-                        by_type,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
+    selector_dict = {}  # Key: selector, Value: object
+    object_dict = {}  # Key: object, Value: selector
+    for key in selector_list_dict.keys():
+        for pair in selector_list_dict[key]:
+            selector_dict[pair[1]] = "%s.%s" % (str(key), str(pair[0]))
+            object_name = "%s.%s" % (str(key), str(pair[0]))
+            object_dict[object_name] = pair[1]
 
-        # Handle VAR = self.get_attribute(SELECTOR, ATTRIBUTE)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)(\S*)\s?=\s?self\.get_attribute"""
-                r"""\((r?['"][\S\s]+['"]),\s?(['"][\S\s]+['"])\)([\S\s]*)"""
-                r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)(\S*)\s?=\s?self\.get_attribute"""
-                r"""\(([\S\s]+),\s?(['"][\S\s]+['"])\)([\S\s]*)"""
-                r"""$""",
-                line,
-            )
-        if data:
-            whitespace = data.group(1)
-            var_name = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            attribute = data.group(4)
-            comments = data.group(5)
-            command = """%s%s = self.get_attribute(%s, %s)%s""" % (
-                whitespace,
-                var_name,
-                selector,
-                attribute,
-                comments,
-            )
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%s%s = self.get_attribute(%s, %s)%s""" % (
-                        whitespace,
-                        var_name,
-                        selector_object,
-                        attribute,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%s%s = self.get_attribute(%s, %s)%s""" % (
-                        whitespace,
-                        var_name,
-                        selector_object,
-                        attribute,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
+    good_sel_dict = {}
+    aa, bb, cc = scan_objects_file(objects_file)
+    for s_key in selector_dict.keys():
+        if s_key in bb:
+            good_sel_dict[s_key] = selector_dict[s_key]
 
-        # Handle VAR = self.get_text(SELECTOR)
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)(\S*)\s?=\s?self\.get_text""" r"""\((r?['"][\S\s]+['"])\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        else:
-            data = re.match(
-                r"""^(\s*)(\S*)\s?=\s?self\.get_text""" r"""\(([\S\s]+)\)([\S\s]*)""" r"""$""", line,
-            )
-        if data:
-            whitespace = data.group(1)
-            var_name = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%s%s = self.get_text(%s)%s""" % (whitespace, var_name, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%s%s = self.get_text(%s)%s""" % (
-                        whitespace,
-                        var_name,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%s%s = self.get_text(%s)%s""" % (
-                        whitespace,
-                        var_name,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
+    tasks = []
+    failed_files = [failure[0] for failure in failures]
+    for file_path in test_files:
+        if file_path in failed_files:
             continue
-
-        # Handle if VAR [in|not in] self.get_text(SELECTOR):
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)if\s(\S*\s?\S*)\sin\s?self\.get_text"""
-                r"""\((r?['"][\S\s]+['"])\):([\S\s]*)"""
-                r"""$""",
-                line,
-            )
+        if shell_command == "revert-objects":
+            tasks.append((file_path, shell_command, add_comments, None, object_dict))
         else:
-            data = re.match(
-                r"""^(\s*)if\s(\S*\s?\S*)\sin\s?self\.get_text""" r"""\(([\S\s]+)\):([\S\s]*)""" r"""$""",
-                line,
-            )
-        if data:
-            whitespace = data.group(1)
-            var_prefix = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            comments = data.group(4)
-            command = """%sif %s in self.get_text(%s):%s""" % (whitespace, var_prefix, selector, comments,)
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sif %s in self.get_text(%s):%s""" % (
-                        whitespace,
-                        var_prefix,
-                        selector_object,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sif %s in self.get_text(%s):%s""" % (
-                        whitespace,
-                        var_prefix,
-                        selector_object,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
-
-        # Handle self.select_option_by_*(SELECTOR, TEXT)  * = index/value/text
-        if not object_dict:
-            data = re.match(
-                r"""^(\s*)self\.select_option_by_(\S*)"""
-                r"""\((r?['"][\S\s]+['"]),\s?([\S\s]+)\)([\S\s]*)"""
-                r"""$""",
-                line,
-            )
+            tasks.append((file_path, shell_command, add_comments, good_sel_dict, None))
+    for file_path, error in rewrite_engine.run_in_parallel(rewrite_test_file, tasks):
+        if error:
+            failures.append((file_path, error))
         else:
-            data = re.match(
-                r"""^(\s*)self\.select_option_by_(\S*)""" r"""\(([\S\s]+),\s?([\S\s]+)\)([\S\s]*)""" r"""$""",
-                line,
-            )
-        if data:
-            whitespace = data.group(1)
-            by_type = data.group(2)
-            selector = "%s" % data.group(3)
-            selector = remove_extra_slashes(selector)
-            page_selectors.append(selector)
-            text = data.group(4)
-            comments = data.group(5)
-            command = """%sself.select_option_by_%s(%s, %s)%s""" % (
-                whitespace,
-                by_type,
-                selector,
-                text,
-                comments,
-            )
-            if selector_dict:
-                if add_comments:
-                    comments = "  # %s" % selector
-                selector = optimize_selector(selector)
-                if selector in selector_dict.keys():
-                    selector_object = selector_dict[selector]
-                    changed.append(selector_object.split(".")[0])
-                    command = """%sself.select_option_by_%s(%s, %s)%s""" % (
-                        whitespace,
-                        by_type,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            if object_dict:
-                if not add_comments:
-                    comments = ""
-                object_name = selector
-                if object_name in object_dict.keys():
-                    selector_object = object_dict[object_name]
-                    changed.append(object_name.split(".")[0])
-                    command = """%sself.select_option_by_%s(%s, %s)%s""" % (
-                        whitespace,
-                        by_type,
-                        selector_object,
-                        text,
-                        comments,
-                    )
-            seleniumbase_lines.append(command)
-            continue
-
-        # seleniumbase_lines.append("### " + line)  # untouched lines (Debug)
-        seleniumbase_lines.append(line)
-        continue
-
-    return seleniumbase_lines, page_selectors, changed
+            print('\n>>> ["%s"] was updated!' % file_path)
+    print("")
+    return failures
 
 
 def extract_objects():
@@ -1434,7 +450,7 @@ def revert_objects():
 
 
 def main(shell_command):
-    expected_arg = "[A SeleniumBase Python file]"
+    expected_arg = "[A SeleniumBase Python file (or a folder of them)]"
     num_args = len(sys.argv)
     command_args = sys.argv[2:]
 
@@ -1469,114 +485,29 @@ def main(shell_command):
         invalid_run_command(shell_command)
 
     seleniumbase_file = command_args[0]
-    if not seleniumbase_file.endswith(".py"):
-        raise Exception(
-            "\n\n`%s` is not a Python file!\n\n" "Expecting: %s\n" % (seleniumbase_file, expected_arg)
-        )
-
-    with open(seleniumbase_file, "r", encoding="utf-8") as f:
-        all_code = f.read()
-    if "def test_" not in all_code:
-        raise Exception(
-            "\n\n`%s` is not a valid SeleniumBase unittest file!\n"
-            "\nExpecting: %s\n" % (seleniumbase_file, expected_arg)
-        )
-    code_lines = all_code.split("\n")
-    seleniumbase_lines, page_selectors, changed = process_test_file(code_lines)
-    var_names, existing_selectors, selector_list_dict = scan_objects_file()
-    new_page_selectors = []
-
-    for selector in page_selectors:
-        selector = optimize_selector(selector)
-        if selector not in existing_selectors:
-            new_page_selectors.append(selector)
-            var_name = get_next_var_name(var_names)
-            var_names.append(var_name)
-            selector_list_dict["Page"].append((var_name, selector))
-            existing_selectors.append(selector)
-
-    # print(new_page_selectors)  # (For debugging)
-    # print(selector_list_dict)  # (For debugging)
-
-    if shell_command == "extract-objects" or shell_command == "objectify":
-        create_objects_file(selector_list_dict)
-
-    if shell_command == "extract-objects":
-        print("")
-        return
-
-    selector_dict = {}  # Key: selector, Value: object
-    object_dict = {}  # Key: object, Value: selector
-    for key in selector_list_dict.keys():
-        for pair in selector_list_dict[key]:
-            selector_dict[pair[1]] = "%s.%s" % (str(key), str(pair[0]))
-            object_name = "%s.%s" % (str(key), str(pair[0]))
-            object_dict[object_name] = pair[1]
-
-    good_sel_dict = {}
-    aa, bb, cc = scan_objects_file()
-    for s_key in selector_dict.keys():
-        if s_key in bb:
-            good_sel_dict[s_key] = selector_dict[s_key]
-
-    if shell_command == "inject-objects" or shell_command == "objectify":
-        seleniumbase_lines, page_selectors, changed = process_test_file(
-            code_lines, selector_dict=good_sel_dict, add_comments=add_comments
-        )
-        added_classes = []
-        for item in changed:
-            if item not in added_classes:
-                added_classes.append(item)
-        for line in seleniumbase_lines:
-            if "from .page_objects import" in line:
-                token = line.split("from .page_objects import ")[1].strip()
-                if token in added_classes:
-                    # Don't import page_objects classes if already imported
-                    added_classes.remove(token)
-        if added_classes:
-            sb_lines = []
-            fit_in = False
-            for line in seleniumbase_lines:
-                if line.startswith("from") and "import" in line and not fit_in:
-                    fit_in = True
-                    for add_me in added_classes:
-                        import_line = "from .page_objects import %s" % add_me
-                        sb_lines.append(import_line)
-                sb_lines.append(line)
-            seleniumbase_lines = sb_lines
-
-    if shell_command == "revert-objects":
-        seleniumbase_lines, page_selectors, changed = process_test_file(
-            code_lines, object_dict=object_dict, add_comments=add_comments
-        )
-        removed_classes = []
-        for item in changed:
-            if item not in removed_classes:
-                removed_classes.append(item)
-        if removed_classes:
-            sb_lines = []
-            for line in seleniumbase_lines:
-                if "from .page_objects import" in line:
-                    token = line.split("from .page_objects import ")[1].strip()
-                    if token in removed_classes:
-                        continue
-                sb_lines.append(line)
-            seleniumbase_lines = sb_lines
-
-    seleniumbase_code = ""
-    for line in seleniumbase_lines:
-        seleniumbase_code += line
-        seleniumbase_code += "\n"
-    seleniumbase_code = seleniumbase_code[:-1]
-    # print (seleniumbase_code)  # (For debugging)
-
-    # Create SeleniumBase test file
-    base_file_name = seleniumbase_file.split(".py")[0]
-    converted_file_name = base_file_name + ".py"  # Change end to make a copy
-    out_file = codecs.open(converted_file_name, "w+")
-    out_file.writelines(seleniumbase_code)
-    out_file.close()
-    print('\n>>> ["%s"] was updated!\n' % converted_file_name)
+    objects_file = PAGE_OBJECTS_FILE
+    if os.path.isdir(seleniumbase_file):
+        objects_file = os.path.join(seleniumbase_file, PAGE_OBJECTS_FILE)
+        test_files = get_test_files(seleniumbase_file)
+        if not test_files:
+            raise Exception("\n\n`%s` has no SeleniumBase unittest files!\n" % seleniumbase_file)
+    else:
+        if not seleniumbase_file.endswith(".py"):
+            raise Exception(
+                "\n\n`%s` is not a Python file!\n\n" "Expecting: %s\n" % (seleniumbase_file, expected_arg)
+            )
+        if "def test_" not in read_test_file(seleniumbase_file):
+            raise Exception(
+                "\n\n`%s` is not a valid SeleniumBase unittest file!\n"
+                "\nExpecting: %s\n" % (seleniumbase_file, expected_arg)
+            )
+        test_files = [seleniumbase_file]
+
+    failures = process_test_files(shell_command, test_files, add_comments, objects_file)
+    for file_path, error in failures:
+        print('>>> ["%s"] was skipped! (%s)' % (file_path, error))
+    if failures and len(test_files) == 1:
+        raise Exception("\n\nUnable to process `%s`!\n%s\n" % failures[0])
 
 
 if __name__ == "__main__":
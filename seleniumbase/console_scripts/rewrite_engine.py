@@ -0,0 +1,213 @@
+"""
+A rewrite engine for the console scripts that edit SeleniumBase Python files.
+(Such as "objectify", "inject-objects", "extract-objects", "revert-objects")
+Each file is tokenized once with the "tokenize" module, and method calls of
+"self.<METHOD>(...)" are found from the tokens, including calls that span
+multiple lines. Their arguments are located by position or by keyword, and
+edits are applied to the original code, so the formatting stays unchanged.
+Files can be processed in parallel with a process pool: run_in_parallel()
+"""
+import collections
+import io
+import multiprocessing
+import tokenize
+
+SELECTOR_FIRST_METHODS = [
+    "click",
+    "js_click",
+    "slow_click",
+    "assert_element",
+    "assert_element_absent",
+    "assert_element_not_present",
+    "assert_element_not_visible",
+    "assert_element_present",
+    "assert_element_visible",
+    "find_element",
+    "get_element",
+    "wait_for_element",
+    "wait_for_element_absent",
+    "wait_for_element_not_present",
+    "wait_for_element_not_visible",
+    "wait_for_element_present",
+    "wait_for_element_visible",
+    "is_element_present",
+    "is_element_visible",
+    "update_text",
+    "type",
+    "input",
+    "write",
+    "add_text",
+    "send_keys",
+    "set_value",
+    "get_attribute",
+    "get_text",
+]
+TEXT_FIRST_METHODS = [
+    "assert_text",
+    "assert_text_visible",
+    "assert_text_not_visible",
+    "assert_exact_text",
+    "find_text",
+    "is_text_visible",
+    "wait_for_text",
+    "wait_for_text_visible",
+    "wait_for_text_not_visible",
+]
+DROPDOWN_METHODS = ["select_option_by_index", "select_option_by_text", "select_option_by_value"]
+
+# The methods that take a selector, with (position, keyword) of the selector
+SELECTOR_METHODS = {}
+SELECTOR_METHODS.update(dict.fromkeys(SELECTOR_FIRST_METHODS, (0, "selector")))
+SELECTOR_METHODS.update(dict.fromkeys(TEXT_FIRST_METHODS, (1, "selector")))
+SELECTOR_METHODS.update(dict.fromkeys(DROPDOWN_METHODS, (0, "dropdown_selector")))
+
+OPEN_BRACKETS = ("(", "[", "{")
+CLOSE_BRACKETS = (")", "]", "}")
+SKIPPED_TOKENS = (tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT)
+
+# An argument of a call: Its tokens, and the (row, col) of its start and end
+Argument = collections.namedtuple("Argument", ["tokens", "start", "end"])
+# A call of "self.<method>(...)". end_row is the row of the closing ")"
+MethodCall = collections.namedtuple("MethodCall", ["method", "args", "kwargs", "start", "end_row"])
+
+
+class ParsedCode(object):
+    """ The code of a Python file, tokenized once. """
+
+    def __init__(self, code):
+        self.code = code
+        self.tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+        self.lines = code.splitlines(True)
+        self.__line_offsets = [0]
+        for line in self.lines:
+            self.__line_offsets.append(self.__line_offsets[-1] + len(line))
+        self.comments = {}  # Key: row, Value: the comment token of the row
+        for token in self.tokens:
+            if token[0] == tokenize.COMMENT:
+                self.comments[token[2][0]] = token
+
+    def get_offset(self, position):
+        """ Converts a (row, col) position of a token to an offset. """
+        return self.__line_offsets[position[0] - 1] + position[1]
+
+    def get_line_end(self, row):
+        """ Returns the (row, col) position at the end of a line's code. """
+        return (row, len(self.lines[row - 1].rstrip("\r\n")))
+
+    def find_method_calls(self, methods=None):
+        """ Yields each MethodCall of "self.<method>(...)" in the code.
+            If methods is set, only calls of those methods are yielded. """
+        tokens = self.tokens
+        for i in range(len(tokens) - 3):
+            if (
+                tokens[i][0] == tokenize.NAME
+                and tokens[i][1] == "self"
+                and tokens[i + 1][1] == "."
+                and tokens[i + 2][0] == tokenize.NAME
+                and tokens[i + 3][1] == "("
+                and (i == 0 or tokens[i - 1][1] != ".")
+            ):
+                method = tokens[i + 2][1]
+                if methods is not None and method not in methods:
+                    continue
+                call = self.__get_call(method, i + 4, tokens[i][2])
+                if call:
+                    yield call
+
+    def __get_call(self, method, index, start):
+        """ Splits the arguments of a call, starting after its "(". """
+        args = []
+        kwargs = {}
+        arg_tokens = []
+        depth = 0
+        for j in range(index, len(self.tokens)):
+            token = self.tokens[j]
+            value = token[1]
+            if token[0] == tokenize.OP and depth == 0 and value in (",", ")"):
+                if arg_tokens:
+                    if len(arg_tokens) > 2 and arg_tokens[0][0] == tokenize.NAME and arg_tokens[1][1] == "=":
+                        kwargs[arg_tokens[0][1]] = _get_argument(arg_tokens[2:])
+                    else:
+                        args.append(_get_argument(arg_tokens))
+                arg_tokens = []
+                if value == ")":
+                    return MethodCall(method, args, kwargs, start, token[3][0])
+                continue
+            if token[0] == tokenize.ENDMARKER:
+                return None
+            if token[0] == tokenize.OP:
+                if value in OPEN_BRACKETS:
+                    depth += 1
+                elif value in CLOSE_BRACKETS:
+                    depth -= 1
+            if token[0] not in SKIPPED_TOKENS:
+                arg_tokens.append(token)
+        return None
+
+    def get_text(self, argument):
+        """ Returns the code of an argument, as written. """
+        return self.code[self.get_offset(argument.start) : self.get_offset(argument.end)]
+
+    def apply_edits(self, edits):
+        """ Returns the code with edits applied. Each edit is a tuple of
+            (start, end, new_text), where start and end are (row, col).
+            Edits must not overlap. """
+        code = self.code
+        for start, end, new_text in sorted(edits, key=lambda edit: edit[0], reverse=True):
+            code = code[: self.get_offset(start)] + new_text + code[self.get_offset(end) :]
+        return code
+
+
+def _get_argument(tokens):
+    return Argument(tokens, tokens[0][2], tokens[-1][3])
+
+
+def get_argument(call, position, keyword=None):
+    """ Returns an Argument of a MethodCall by position (or keyword),
+        or None if the call doesn't have it. """
+    if position < len(call.args):
+        return call.args[position]
+    if keyword:
+        return call.kwargs.get(keyword)
+    return None
+
+
+def is_string_literal(argument):
+    """ True if the argument is a single plain (or raw) string literal. """
+    if len(argument.tokens) != 1 or argument.tokens[0][0] != tokenize.STRING:
+        return False
+    prefix = argument.tokens[0][1].split(argument.tokens[0][1][-1])[0]
+    return prefix in ("", "r")
+
+
+def is_dotted_name(argument):
+    """ True if the argument is a name, such as "Page.css_1". """
+    for i, token in enumerate(argument.tokens):
+        if i % 2 == 0 and token[0] != tokenize.NAME:
+            return False
+        if i % 2 == 1 and token[1] != ".":
+            return False
+    return len(argument.tokens) % 2 == 1
+
+
+def get_processes():
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def run_in_parallel(function, items, processes=None):
+    """ Returns [function(item) for item in items], using a process pool
+        when there's more than one item. The function must be defined at
+        the top level of a module, so that it can be sent to processes. """
+    items = list(items)
+    processes = min(processes or get_processes(), len(items))
+    if processes <= 1:
+        return [function(item) for item in items]
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(function, items, chunksize=max(1, len(items) // (processes * 4)))
+    finally:
+        pool.close()
+        pool.join()
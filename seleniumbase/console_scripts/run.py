@@ -19,6 +19,8 @@ sbase decrypt
 sbase download server
 sbase grid-hub start
 sbase grid-node start --hub=127.0.0.1
+sbase crawl https://seleniumbase.io --depth=2
+sbase migrate-baselines
 """
 
 import colorama
@@ -77,6 +79,8 @@ def show_basic_usage():
     sc += "      download server (Selenium Server JAR file)\n"
     sc += "      grid-hub        [start|stop] [OPTIONS]\n"
     sc += "      grid-node       [start|stop] --hub=[HUB_IP] [OPTIONS]\n"
+    sc += "      crawl           [START_URL] [OPTIONS]\n"
+    sc += "      migrate-baselines [BASELINE_FOLDER] [OPTIONS]\n"
     sc += '  *  (EXAMPLE: "sbase install chromedriver latest")  *\n'
     sc += ""
     c1 = colorama.Fore.BLUE + colorama.Back.LIGHTCYAN_EX
@@ -174,6 +178,11 @@ def show_translate_usage():
     print("         plus the 2-letter language code of the new language.")
     print('         (Example: Translating "test_1.py" into Japanese with')
     print('          "-c" will create a new file called "test_1_ja.py".)')
+    print("  Recursive mode:")
+    print("         seleniumbase translate [FOLDER] [LANGUAGE] [ACTION] -r")
+    print("         -r / --recursive  (Translates all the files in a folder")
+    print("                            and its subfolders, in parallel, and")
+    print('                            prints a summary. Use with "-o" or "-c")')
     print("")
 
 
@@ -240,6 +249,10 @@ def show_revert_objects_usage():
     print("           seleniumbase Python file. Objects will get replaced by")
     print('           selectors stored in the "page_objects.py" file.')
     print("")
+    print("           (The object commands also accept a folder of test")
+    print('            files, which share the "page_objects.py" file of')
+    print("            the folder. The files get processed in parallel.)")
+    print("")
 
 
 def show_encrypt_usage():
@@ -320,6 +333,52 @@ def show_grid_node_usage():
     print("")
 
 
+def show_crawl_usage():
+    print("  ** crawl **")
+    print("")
+    print("  Usage:")
+    print("           seleniumbase crawl [START_URL] [OPTIONS]")
+    print("           OR:    sbase crawl [START_URL] [OPTIONS]")
+    print("  Options:")
+    print("           --depth=N  (How many links away from the start URL.)")
+    print("                      (Default: 1)")
+    print("           --concurrency=K  (Number of requests to make at once.)")
+    print("                            (Default: 10)")
+    print("           --rate=R  (Max requests per second to each host.)")
+    print("                     (Default: 10. Use 0 for no limit.)")
+    print("           --timeout=S  (The timeout for each request.)")
+    print("                        (Default: 10 seconds)")
+    print("           --output=FILE  (Save the output to a file.)")
+    print("  Example:")
+    print("           seleniumbase crawl https://seleniumbase.io --depth=2")
+    print("  Output:")
+    print("           Crawls a website breadth-first (without a browser),")
+    print("           and outputs the status of each unique link found as")
+    print("           JSON Lines: (url, status, latency, referrer, depth)")
+    print("           Only pages on the host of the start URL get crawled.")
+    print("           Exits with 1 if any link failed (or returned 4xx/5xx).")
+    print("")
+
+
+def show_migrate_baselines_usage():
+    print("  ** migrate-baselines **")
+    print("")
+    print("  Usage:")
+    print("           seleniumbase migrate-baselines [BASELINE_FOLDER]")
+    print("           OR:    sbase migrate-baselines [BASELINE_FOLDER]")
+    print('                  (Default BASELINE_FOLDER: "visual_baseline")')
+    print("  Options:")
+    print("           --keep  (Keep the old baseline folders.)")
+    print("  Example:")
+    print("           seleniumbase migrate-baselines")
+    print("  Output:")
+    print("           Converts check_window() baselines from the old format")
+    print("           (a folder of text files for each baseline) to the")
+    print("           compact format (a compressed file for each baseline),")
+    print("           and rebuilds the baseline index.")
+    print("")
+
+
 def get_version():
     import pkg_resources
 
@@ -353,6 +412,8 @@ def show_detailed_help():
     show_download_usage()
     show_grid_hub_usage()
     show_grid_node_usage()
+    show_crawl_usage()
+    show_migrate_baselines_usage()
     c3 = colorama.Fore.BLUE + colorama.Back.LIGHTYELLOW_EX
     cr = colorama.Style.RESET_ALL
     print('* (Use "' + c3 + "pytest" + cr + '" for running tests) *\n')
@@ -453,6 +514,18 @@ def main():
         else:
             show_basic_usage()
             show_grid_node_usage()
+    elif command == "crawl":
+        if len(command_args) >= 1:
+            from seleniumbase.console_scripts import sb_crawl
+
+            sb_crawl.main()
+        else:
+            show_basic_usage()
+            show_crawl_usage()
+    elif command == "migrate-baselines" or command == "migrate_baselines":
+        from seleniumbase.console_scripts import sb_migrate_baselines
+
+        sb_migrate_baselines.main()
     elif command == "version" or command == "--version":
         if len(command_args) == 0:
             show_version_info()
@@ -520,6 +593,14 @@ def main():
                 print("")
                 show_grid_node_usage()
                 return
+            elif command_args[0] == "crawl":
+                print("")
+                show_crawl_usage()
+                return
+            elif command_args[0] == "migrate-baselines":
+                print("")
+                show_migrate_baselines_usage()
+                return
         show_detailed_help()
     else:
         show_usage()
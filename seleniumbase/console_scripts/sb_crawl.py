@@ -0,0 +1,250 @@
+"""
+Crawls a website breadth-first from a start URL (without a browser), and
+outputs the status of every unique link found as JSON Lines:
+{"url": URL, "status": CODE, "latency": SECONDS, "referrer": URL, "depth": N}
+(Requests that fail have a null status and an "error" field instead.)
+Links are found the same way as get_unique_links() finds them in tests.
+Only pages on the host of the start URL get crawled for more links.
+Links to other hosts get checked, but they aren't crawled.
+
+Usage:
+seleniumbase crawl [START_URL] [OPTIONS]
+OR     sbase crawl [START_URL] [OPTIONS]
+Options:
+--depth=N  (How many links away from the start URL to go. Default: 1)
+--concurrency=K  (The number of requests to make at once. Default: 10)
+--rate=R  (The max requests per second to each host. Default: 10)
+          (Use --rate=0 for no limit.)
+--timeout=S  (The timeout for each request, in seconds. Default: 10)
+--output=FILE  (Save the JSON Lines to a file instead of printing them.)
+Output:
+The exit code is 1 if any link failed or returned a 4xx/5xx status code.
+"""
+import json
+import sys
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from seleniumbase.fixtures import page_utils
+
+try:
+    from urllib.parse import urldefrag, urlparse  # Python 3
+except ImportError:
+    from urlparse import urldefrag, urlparse  # Python 2
+
+
+def invalid_run_command(msg=None):
+    exp = "  ** crawl **\n\n"
+    exp += "  Usage:\n"
+    exp += "        seleniumbase crawl [START_URL] [OPTIONS]\n"
+    exp += "        OR     sbase crawl [START_URL] [OPTIONS]\n"
+    exp += "  Options:\n"
+    exp += "        --depth=N  (How many links away from the start URL to go.)\n"
+    exp += "        --concurrency=K  (The number of requests to make at once.)\n"
+    exp += "        --rate=R  (The max requests per second to each host.)\n"
+    exp += "        --timeout=S  (The timeout for each request, in seconds.)\n"
+    exp += "        --output=FILE  (Save the JSON Lines to a file.)\n"
+    exp += "  Example:\n"
+    exp += "        sbase crawl https://seleniumbase.io --depth=2\n"
+    exp += "  Output:\n"
+    exp += "        Crawls the site breadth-first, and outputs the status of\n"
+    exp += "        each unique link as JSON Lines: (url, status, latency,\n"
+    exp += "        referrer, depth). Exits with 1 if any link failed.\n"
+    if not msg:
+        raise Exception("INVALID RUN COMMAND!\n\n%s" % exp)
+    else:
+        raise Exception("INVALID RUN COMMAND!\n%s\n\n%s" % (msg, exp))
+
+
+class RateLimiter(object):
+    """ Spaces out requests so that there are at most "rate" per second. """
+
+    def __init__(self, rate):
+        self.interval = 0
+        if rate:
+            self.interval = 1.0 / rate
+        self.__next_time = 0
+        self.__lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.__lock:
+            now = time.time()
+            wait_time = self.__next_time - now
+            self.__next_time = max(now, self.__next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class Crawler(object):
+    def __init__(self, start_url, depth=1, concurrency=10, rate=10, timeout=10):
+        self.start_url = urldefrag(start_url)[0]
+        self.host = urlparse(self.start_url).netloc
+        self.depth = depth
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.__seen = set([self.start_url])
+        self.__sessions = {}
+        self.__rate_limiters = {}
+        self.__lock = threading.Lock()
+
+    def crawl(self):
+        """ Yields the result of each unique URL, one depth level at a time.
+            (Within a level, results are yielded as soon as they're ready.) """
+        from multiprocessing.dummy import Pool as ThreadPool
+
+        pool = ThreadPool(self.concurrency)
+        try:
+            level = [(self.start_url, None)]
+            for depth in range(self.depth + 1):
+
+                def visit(item):
+                    return self.__visit(item[0], item[1], depth)
+
+                next_level = []
+                for result, links in pool.imap_unordered(visit, level):
+                    yield result
+                    for link in links:
+                        if link not in self.__seen:
+                            self.__seen.add(link)
+                            next_level.append((link, result["url"]))
+                level = next_level
+                if not level:
+                    break
+        finally:
+            pool.terminate()
+
+    def __visit(self, url, referrer, depth):
+        session, rate_limiter = self.__get_host(urlparse(url).netloc)
+        result = {"url": url, "status": None, "latency": None, "referrer": referrer, "depth": depth}
+        links = []
+        crawl_page = depth < self.depth and urlparse(url).netloc == self.host
+        try:
+            rate_limiter.wait()
+            start_time = time.time()
+            if crawl_page:
+                response = session.get(url, timeout=self.timeout, stream=True)
+            else:
+                response = session.head(url, timeout=self.timeout, allow_redirects=True)
+                if response.status_code >= 400:
+                    # Some servers don't support HEAD requests. Try GET.
+                    response.close()
+                    rate_limiter.wait()
+                    start_time = time.time()
+                    response = session.get(url, timeout=self.timeout, stream=True)
+            result["status"] = response.status_code
+            result["latency"] = round(time.time() - start_time, 3)
+            if (
+                crawl_page
+                and response.status_code < 400
+                and urlparse(response.url).netloc == self.host
+                and "html" in response.headers.get("Content-Type", "")
+            ):
+                links = self.__get_links(response.url, response.text)
+            response.close()  # (Response bodies of other links aren't read)
+        except Exception as e:
+            result["error"] = "%s: %s" % (e.__class__.__name__, e)
+        return result, links
+
+    def __get_links(self, page_url, html):
+        soup = page_utils._get_beautiful_soup(html)
+        links = []
+        for link in page_utils._get_unique_links(page_url, soup):
+            link = urldefrag(link)[0]
+            if link.startswith("http://") or link.startswith("https://"):
+                if "javascript:" not in link and "mailto:" not in link:
+                    links.append(link)
+        return links
+
+    def __get_host(self, host):
+        with self.__lock:
+            if host not in self.__sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.__sessions[host] = session
+                self.__rate_limiters[host] = RateLimiter(self.rate)
+            return self.__sessions[host], self.__rate_limiters[host]
+
+
+def get_int_option(option, value):
+    try:
+        number = int(value)
+        if number < 0:
+            raise ValueError()
+        return number
+    except ValueError:
+        invalid_run_command('"%s" needs a number that is 0 or more! ("%s")' % (option, value))
+
+
+def main():
+    num_args = len(sys.argv)
+    if (
+        sys.argv[0].split("/")[-1] == "seleniumbase"
+        or (sys.argv[0].split("\\")[-1] == "seleniumbase")
+        or (sys.argv[0].split("/")[-1] == "sbase")
+        or (sys.argv[0].split("\\")[-1] == "sbase")
+    ):
+        if num_args < 3:
+            invalid_run_command()
+    else:
+        invalid_run_command()
+    start_url = sys.argv[2]
+    if not start_url.startswith("http://") and not start_url.startswith("https://"):
+        invalid_run_command('The start URL must begin with "http://" or "https://"!')
+
+    options = {"depth": 1, "concurrency": 10, "rate": 10, "timeout": 10, "output": None}
+    args = sys.argv[3:]
+    while args:
+        arg = args.pop(0)
+        if not arg.startswith("--") or arg[2:].split("=")[0] not in options:
+            invalid_run_command('Unknown option: "%s"' % arg)
+        if "=" in arg:
+            option, value = arg[2:].split("=", 1)
+        elif args:
+            option, value = arg[2:], args.pop(0)  # Such as: "--depth 2"
+        else:
+            invalid_run_command('Missing a value for "%s"' % arg)
+        if option == "output":
+            options[option] = value
+        else:
+            options[option] = get_int_option(arg.split("=")[0], value)
+    if options["concurrency"] < 1:
+        invalid_run_command('"--concurrency" must be at least 1!')
+
+    crawler = Crawler(
+        start_url,
+        depth=options["depth"],
+        concurrency=options["concurrency"],
+        rate=options["rate"],
+        timeout=options["timeout"] or None,
+    )
+    output = sys.stdout
+    if options["output"]:
+        output = open(options["output"], "w")
+    num_urls = 0
+    num_errors = 0
+    start_time = time.time()
+    try:
+        for result in crawler.crawl():
+            num_urls += 1
+            if not result["status"] or result["status"] >= 400:
+                num_errors += 1
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    finally:
+        if options["output"]:
+            output.close()
+    sys.stderr.write(
+        "Crawled %s URLs in %.2f seconds. (%s failed)\n" % (num_urls, time.time() - start_time, num_errors)
+    )
+    if num_errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
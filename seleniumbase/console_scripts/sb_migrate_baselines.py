@@ -0,0 +1,70 @@
+"""
+Converts check_window() baselines from the "folders" format (a folder of
+text files for each baseline) to the compact format (a single compressed
+file for each baseline, plus its screenshot), and rebuilds the index.
+
+Usage:
+seleniumbase migrate-baselines [BASELINE_FOLDER] [OPTIONS]
+OR     sbase migrate-baselines [BASELINE_FOLDER] [OPTIONS]
+(The default BASELINE_FOLDER is "visual_baseline" in the current folder.)
+Options:
+--keep  (Keep the old baseline folders after converting them.)
+"""
+import os
+import sys
+from seleniumbase.core import visual_helper
+
+
+def invalid_run_command(msg=None):
+    exp = "  ** migrate-baselines **\n\n"
+    exp += "  Usage:\n"
+    exp += "        seleniumbase migrate-baselines [BASELINE_FOLDER] [OPTIONS]\n"
+    exp += "        OR     sbase migrate-baselines [BASELINE_FOLDER] [OPTIONS]\n"
+    exp += "  Options:\n"
+    exp += "        --keep  (Keep the old baseline folders.)\n"
+    exp += "  Example:\n"
+    exp += "        sbase migrate-baselines visual_baseline\n"
+    exp += "  Output:\n"
+    exp += "        Converts check_window() baselines from the old folder\n"
+    exp += "        format to the compact format, and rebuilds the index.\n"
+    if not msg:
+        raise Exception("INVALID RUN COMMAND!\n\n%s" % exp)
+    else:
+        raise Exception("INVALID RUN COMMAND!\n%s\n\n%s" % (msg, exp))
+
+
+def main():
+    if not (
+        sys.argv[0].split("/")[-1] == "seleniumbase"
+        or (sys.argv[0].split("\\")[-1] == "seleniumbase")
+        or (sys.argv[0].split("/")[-1] == "sbase")
+        or (sys.argv[0].split("\\")[-1] == "sbase")
+    ):
+        invalid_run_command()
+    baseline_dir = visual_helper.VISUAL_BASELINE_DIR
+    keep = False
+    folder_set = False
+    for arg in sys.argv[2:]:
+        if arg == "--keep":
+            keep = True
+        elif arg.startswith("-") or folder_set:
+            invalid_run_command('Unknown option: "%s"' % arg)
+        else:
+            baseline_dir = arg
+            folder_set = True
+    if not os.path.isdir(baseline_dir):
+        invalid_run_command('Baseline folder "%s" was not found!' % baseline_dir)
+
+    migrated = visual_helper.migrate_baselines(baseline_dir, keep=keep)
+    for test_id, name in migrated:
+        print("Converted: %s/%s" % (test_id, name))
+    visual_helper.rebuild_index(baseline_dir)
+    num_baselines = len(visual_helper.list_baselines(baseline_dir))
+    print(
+        "Converted %s baseline(s). (%s baseline(s) in the compact format in %s)"
+        % (len(migrated), num_baselines, os.path.abspath(baseline_dir))
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Writes log files (screenshots, page sources, and test failure data) from
+background threads, so that slow disks don't slow down the tests.
+The data gets captured from the browser first (on the test thread), and
+then only the disk I/O happens in the background. If the queue is full,
+new writes wait for a spot in the queue.
+Pending writes are flushed when the test run ends. (And at exit.)
+Set WRITE_LOG_FILES_IN_BACKGROUND = False in settings.py to write inline.
+"""
+import atexit
+import threading
+from seleniumbase.config import settings
+
+try:
+    import queue  # Python 3
+except ImportError:
+    import Queue as queue  # Python 2
+
+QUEUE_SIZE = 64
+NUM_THREADS = 2
+
+
+class ArtifactWriter(object):
+    def __init__(self, num_threads=NUM_THREADS, queue_size=QUEUE_SIZE):
+        self.errors = []
+        self.__queue = queue.Queue(maxsize=queue_size)
+        for x in range(num_threads):
+            thread = threading.Thread(target=self.__process_queue)
+            thread.daemon = True
+            thread.start()
+
+    def write(self, file_path, data):
+        """ Adds a file write to the queue. (Blocks if the queue is full.) """
+        self.__queue.put((file_path, data))
+
+    def flush(self):
+        """ Waits for all queued writes to finish. """
+        self.__queue.join()
+        errors = self.errors
+        self.errors = []
+        for file_path, error in errors:
+            print("WARNING: Unable to write log file {%s}! (%s)" % (file_path, error))
+
+    def __process_queue(self):
+        while True:
+            file_path, data = self.__queue.get()
+            try:
+                _write(file_path, data)
+            except Exception as e:
+                self.errors.append((file_path, e))
+            finally:
+                self.__queue.task_done()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _write(file_path, data):
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if not _writer:
+            _writer = ArtifactWriter()
+        return _writer
+
+
+def write_file(file_path, data):
+    """ Writes data (bytes or text) to a file. Text is saved as UTF-8.
+        Happens in the background if WRITE_LOG_FILES_IN_BACKGROUND is True. """
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    if settings.WRITE_LOG_FILES_IN_BACKGROUND:
+        get_writer().write(file_path, data)
+    else:
+        _write(file_path, data)
+
+
+def flush():
+    """ Waits for all background writes to finish. """
+    if _writer:
+        _writer.flush()
+
+
+atexit.register(flush)
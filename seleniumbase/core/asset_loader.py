@@ -0,0 +1,80 @@
+"""
+This module maps the CDN links of the Javascript & CSS libraries used by
+SeleniumBase to the copies bundled in the "seleniumbase/resources" folder.
+Bundled files are read once per process and cached in memory, so that
+js_utils can inject them inline instead of loading them from the network.
+(Libraries without a bundled copy are still loaded from the CDN.)
+"""
+import codecs
+import os
+import re
+import threading
+from seleniumbase.fixtures import constants
+
+try:
+    from urllib.parse import urljoin  # Python 3
+except ImportError:
+    from urlparse import urljoin  # Python 2
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "resources")
+
+BUNDLED_ASSETS = {
+    constants.Messenger.MIN_CSS: "messenger/messenger.min.css",
+    constants.Messenger.MIN_JS: "messenger/messenger.min.js",
+    constants.Messenger.THEME_FLAT_JS: "messenger/messenger-theme-flat.js",
+    constants.Messenger.THEME_FUTURE_JS: "messenger/messenger-theme-future.js",
+    constants.Messenger.THEME_FLAT_CSS: "messenger/messenger-theme-flat.min.css",
+    constants.Messenger.THEME_FUTURE_CSS: "messenger/messenger-theme-future.min.css",
+    constants.Messenger.THEME_BLOCK_CSS: "messenger/messenger-theme-block.min.css",
+    constants.Messenger.THEME_AIR_CSS: "messenger/messenger-theme-air.min.css",
+    constants.Messenger.THEME_ICE_CSS: "messenger/messenger-theme-ice.min.css",
+    constants.Messenger.SPINNER_CSS: "messenger/messenger-spinner.min.css",
+    constants.Underscore.MIN_JS: "shepherd/underscore-min.js",
+    constants.Backbone.MIN_JS: "shepherd/backbone-min.js",
+    constants.HtmlInspector.MIN_JS: "html_inspector/html-inspector.min.js",
+    constants.BootstrapTour.MIN_CSS: "bootstrap_tour/bootstrap-tour-standalone.min.css",
+    constants.BootstrapTour.MIN_JS: "bootstrap_tour/bootstrap-tour-standalone.min.js",
+    constants.Hopscotch.MIN_CSS: "hopscotch/hopscotch.min.css",
+    constants.Hopscotch.MIN_JS: "hopscotch/hopscotch.min.js",
+    constants.IntroJS.MIN_CSS: "introjs/introjs.min.css",
+    constants.IntroJS.MIN_JS: "introjs/intro.min.js",
+    constants.JqueryConfirm.MIN_CSS: "jquery_confirm/jquery-confirm.min.css",
+    constants.JqueryConfirm.MIN_JS: "jquery_confirm/jquery-confirm.min.js",
+    constants.Shepherd.MIN_JS: "shepherd/shepherd.min.js",
+    constants.Shepherd.THEME_ARROWS_CSS: "shepherd/shepherd-theme-arrows.css",
+    constants.Shepherd.THEME_ARR_FIX_CSS: "shepherd/shepherd-theme-arrows-fix.css",
+    constants.Shepherd.THEME_DEFAULT_CSS: "shepherd/shepherd-theme-default.css",
+    constants.Shepherd.THEME_DARK_CSS: "shepherd/shepherd-theme-dark.css",
+    constants.Shepherd.THEME_SQ_CSS: "shepherd/shepherd-theme-square.css",
+    constants.Shepherd.THEME_SQ_DK_CSS: "shepherd/shepherd-theme-square-dark.css",
+    constants.Tether.MIN_JS: "shepherd/tether.min.js",
+}
+
+# Relative "url(...)" references in CSS files (not "data:" or absolute URLs)
+CSS_RELATIVE_URL = re.compile(r"""url\(\s*(['"]?)(?!data:|https?:|//)([^'")]+)\1\s*\)""")
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def get_bundled_asset(link):
+    """ Returns the text of the bundled copy of a CDN link, or None if there
+        isn't one. Relative URLs in CSS files are pointed back at the CDN,
+        since inline styles resolve them against the page being tested. """
+    if link not in BUNDLED_ASSETS:
+        return None
+    with _lock:
+        if link not in _cache:
+            _cache[link] = _read_asset(link)
+        return _cache[link]
+
+
+def _read_asset(link):
+    file_path = os.path.join(RESOURCES_DIR, BUNDLED_ASSETS[link])
+    if not os.path.exists(file_path):
+        return None
+    with codecs.open(file_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if file_path.endswith(".css"):
+        text = CSS_RELATIVE_URL.sub(lambda m: 'url("%s")' % urljoin(link, m.group(2)), text)
+    return text
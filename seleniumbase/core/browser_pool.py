@@ -0,0 +1,224 @@
+"""
+A pool of pre-launched web browsers for the tests of one process.
+(With pytest-xdist, each worker process gets its own pool.)
+Browsers are launched in background threads, leased to tests during
+setUp(), and returned to the pool during tearDown(), after their
+cookies, storage, and extra windows have been cleared.
+(See page_actions.reset_browser_state() for details.)
+Browsers get replaced after BROWSER_POOL_MAX_USES tests, or when their
+memory grows by more than BROWSER_POOL_MAX_MEMORY_GROWTH megabytes.
+(Memory checks require the "psutil" package, and are skipped without it.)
+The pool is started when pytest starts, so that the browsers launch while
+the tests are being collected, and the first test doesn't wait for one.
+Usage: "pytest --browser-pool=SIZE"
+"""
+import threading
+import time
+from seleniumbase.config import settings
+from seleniumbase.core import browser_launcher
+from seleniumbase.fixtures import constants
+from seleniumbase.fixtures import page_actions
+
+
+def get_browser_memory(driver):
+    """ Returns the memory (in MB) used by the processes of a local browser,
+        or None if that can't be measured. """
+    try:
+        import psutil
+
+        process = psutil.Process(driver.service.process.pid)
+        rss = 0
+        for child in process.children(recursive=True):
+            rss += child.memory_info().rss
+        return rss / (1024.0 * 1024.0)
+    except Exception:
+        return None
+
+
+def parse_device_metrics(metrics_string):
+    """ Returns (width, height, pixel_ratio) from a "--metrics" string,
+        such as "411,731,3". Returns None if the string isn't valid. """
+    metrics_list = metrics_string.replace(" ", "").split(",")
+    try:
+        width, height, pixel_ratio = [int(value) for value in metrics_list]
+        return width, height, pixel_ratio
+    except ValueError:
+        return None
+
+
+def get_driver_kwargs(options, device_metrics=None):
+    """ Returns the browser_launcher.get_driver() arguments for the browsers
+        of the pool, from the options of the test run.
+        options - sb_config, or a test, with the values of the options
+        device_metrics - (width, height, pixel_ratio) for mobile emulation """
+    device_width, device_height, device_pixel_ratio = device_metrics or (None, None, None)
+    mobile_emulator = options.mobile_emulator or bool(device_metrics)
+    user_agent = options.user_agent
+    if mobile_emulator and not user_agent:
+        user_agent = constants.Mobile.DEFAULT_USER_AGENT
+    return {
+        "browser_name": options.browser,
+        "headless": options.headless,
+        "use_grid": options.servername != "localhost",
+        "servername": options.servername,
+        "port": options.port,
+        "proxy_string": options.proxy_string,
+        "user_agent": user_agent,
+        "cap_file": options.cap_file,
+        "cap_string": options.cap_string,
+        "disable_csp": options.disable_csp,
+        "enable_sync": options.enable_sync,
+        "use_auto_ext": options.use_auto_ext,
+        "no_sandbox": options.no_sandbox,
+        "disable_gpu": options.disable_gpu,
+        "incognito": options.incognito,
+        "guest_mode": options.guest_mode,
+        "devtools": options.devtools,
+        "user_data_dir": options.user_data_dir,
+        "extension_zip": options.extension_zip,
+        "extension_dir": options.extension_dir,
+        "mobile_emulator": mobile_emulator,
+        "device_width": device_width,
+        "device_height": device_height,
+        "device_pixel_ratio": device_pixel_ratio,
+    }
+
+
+def start_pool(options, size, device_metrics=None):
+    """ Creates a BrowserPool for the options of the test run (see above),
+        and starts launching its browsers in the background. """
+    pool = BrowserPool(get_driver_kwargs(options, device_metrics), size=size, maximize=options.maximize_option)
+    pool.start()
+    return pool
+
+
+class BrowserPool(object):
+    def __init__(self, driver_kwargs, size=2, maximize=False):
+        """ driver_kwargs - the arguments for browser_launcher.get_driver()
+            size - the number of browsers to keep ready in the pool
+            maximize - the option to maximize new browser windows """
+        self.driver_kwargs = driver_kwargs
+        self.size = size
+        self.maximize = maximize
+        self.max_uses = settings.BROWSER_POOL_MAX_USES
+        self.max_memory_growth = settings.BROWSER_POOL_MAX_MEMORY_GROWTH
+        self.__idle = []
+        self.__uses = {}
+        self.__memory = {}
+        self.__errors = []
+        self.__launching = 0
+        self.__closed = False
+        self.__condition = threading.Condition()
+
+    def start(self):
+        """ Launches the browsers of the pool in background threads. """
+        for x in range(self.size):
+            self.__launch_in_background()
+
+    def lease(self, timeout=settings.EXTREME_TIMEOUT * 2):
+        """ Returns a browser from the pool. If none are ready, waits for the
+            next one to finish launching. Browser launch failures from the
+            background threads are raised here. """
+        stop_time = time.time() + timeout
+        with self.__condition:
+            while not self.__idle:
+                if self.__errors:
+                    raise self.__errors.pop(0)
+                if not self.__launching:
+                    self.__launch_in_background()
+                remaining = stop_time - time.time()
+                if remaining <= 0:
+                    raise Exception("No browser was ready in the pool after %s seconds!" % timeout)
+                self.__condition.wait(remaining)
+            return self.__idle.pop(0)
+
+    def release(self, driver):
+        """ Resets the browser and puts it back in the pool. If the browser
+            is due for recycling (or can't be reset), it gets replaced. """
+        key = driver.session_id
+        self.__uses[key] = self.__uses.get(key, 0) + 1
+        recycle = self.__closed or self.__uses[key] >= self.max_uses
+        if not recycle:
+            try:
+                page_actions.reset_browser_state(driver)
+            except Exception:
+                recycle = True
+        if not recycle and self.max_memory_growth and self.__memory.get(key):
+            memory = get_browser_memory(driver)
+            if memory and memory - self.__memory[key] > self.max_memory_growth:
+                recycle = True
+        if recycle:
+            self.__uses.pop(key, None)
+            self.__memory.pop(key, None)
+            self.__launch_in_background(replacing=driver)
+            return
+        with self.__condition:
+            self.__idle.append(driver)
+            self.__condition.notify_all()
+
+    def close(self):
+        """ Quits all browsers in the pool. (Leased browsers are quit when
+            they get released.) """
+        with self.__condition:
+            self.__closed = True
+            idle = self.__idle
+            self.__idle = []
+        for driver in idle:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __launch_in_background(self, replacing=None):
+        with self.__condition:
+            if self.__closed:
+                replacement_needed = False
+            else:
+                replacement_needed = True
+                self.__launching += 1
+        thread = threading.Thread(target=self.__launch, args=(replacing, replacement_needed))
+        thread.daemon = True
+        thread.start()
+
+    def __launch(self, replacing, replacement_needed):
+        if replacing:
+            try:
+                replacing.quit()
+            except Exception:
+                pass
+        if not replacement_needed:
+            return
+        driver = None
+        memory = None
+        error = None
+        try:
+            driver = browser_launcher.get_driver(**self.driver_kwargs)
+            self.__set_window_size(driver)
+            memory = get_browser_memory(driver)
+        except Exception as e:
+            error = e
+        with self.__condition:
+            self.__launching -= 1
+            if driver and self.__closed:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            elif driver:
+                self.__uses[driver.session_id] = 0
+                self.__memory[driver.session_id] = memory
+                self.__idle.append(driver)
+            else:
+                self.__errors.append(error)
+            self.__condition.notify_all()
+
+    def __set_window_size(self, driver):
+        try:
+            if self.driver_kwargs.get("headless"):
+                driver.set_window_size(settings.HEADLESS_START_WIDTH, settings.HEADLESS_START_HEIGHT)
+            elif self.maximize:
+                driver.maximize_window()
+            elif self.driver_kwargs.get("browser_name") in ("chrome", "edge"):
+                driver.set_window_size(settings.CHROME_START_WIDTH, settings.CHROME_START_HEIGHT)
+        except Exception:
+            pass  # Keep the existing browser resolution
@@ -1,6 +1,11 @@
 import re
 import ast
+import copy
 import json
+from seleniumbase.fixtures import shared_utils
+
+# Parsed capabilities files, by (path, mtime, size). (Reparsed if changed)
+_cache = shared_utils.LRUCache(max_size=16)
 
 
 def _analyze_ast(contents):
@@ -190,6 +195,20 @@ def _parse_json_file(cap_file):
 
 
 def get_desired_capabilities(cap_file):
+    """ Returns the desired capabilities from a Python or JSON file.
+        Parsed files are cached until they change. Each call gets its own
+        copy, since the capabilities get modified for each browser. """
+    if not (cap_file.endswith(".py") or cap_file.endswith(".json")):
+        raise Exception("\n\n`%s` is not a Python or JSON file!\n" % cap_file)
+    key = shared_utils.get_file_cache_key(cap_file)
+    capabilities = _cache.get(key)
+    if capabilities is None:
+        capabilities = _parse_cap_file(cap_file)
+        _cache.set(key, capabilities)
+    return copy.deepcopy(capabilities)
+
+
+def _parse_cap_file(cap_file):
     if cap_file.endswith(".py"):
         capabilities = _parse_py_file(cap_file)
     elif cap_file.endswith(".json"):
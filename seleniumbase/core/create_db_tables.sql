@@ -16,7 +16,10 @@ CREATE TABLE `test_run_data` (
   `retry_count` int(11) DEFAULT '0',
   `exception_map_guid` varchar(64) DEFAULT NULL,
   `log_url` text,
-  PRIMARY KEY (`guid`)
+  PRIMARY KEY (`guid`),
+  KEY `idx_execution_guid` (`execution_guid`),
+  KEY `idx_test_address` (`test_address`),
+  KEY `idx_start_time` (`start_time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
 # test_execution table
@@ -0,0 +1,104 @@
+"""
+Writes test results to the database (with --with-db_reporting) in batches,
+from a background thread, so that tests don't wait for the database.
+Consecutive queued writes of the same query are sent together with
+executemany(). (Such as the INSERTs of tests that start at the same time.)
+Queries are never reordered, so rows are always inserted before they get
+updated, and updates of a row happen in order.
+The queue is flushed every DB_REPORTING_FLUSH_INTERVAL seconds, when it
+reaches BATCH_SIZE writes, and when the test run ends. (And at exit.)
+Set DB_REPORTING_IN_BACKGROUND = False in settings.py to write each
+result inline instead.
+"""
+import atexit
+import threading
+from seleniumbase.config import settings
+from seleniumbase.core import results_store
+
+BATCH_SIZE = 100
+
+
+class DatabaseWriter(object):
+    def __init__(self, database_env, flush_interval=None, batch_size=BATCH_SIZE):
+        self.database_env = database_env
+        self.flush_interval = flush_interval
+        if self.flush_interval is None:
+            self.flush_interval = settings.DB_REPORTING_FLUSH_INTERVAL
+        self.batch_size = batch_size
+        self.errors = []
+        self.__pending = []  # A list of (query, params)
+        self.__condition = threading.Condition()
+        self.__write_lock = threading.Lock()  # (Keeps batches in order)
+        thread = threading.Thread(target=self.__process_queue)
+        thread.daemon = True
+        thread.start()
+
+    def write(self, query, params):
+        """ Adds a query to the queue. """
+        with self.__condition:
+            self.__pending.append((query, params))
+            if len(self.__pending) >= self.batch_size:
+                self.__condition.notify()
+
+    def flush(self):
+        """ Writes all queued queries to the database. """
+        self.__write_pending()
+        errors = self.errors
+        self.errors = []
+        for num_rows, error in errors:
+            print("WARNING: Unable to write %s row(s) to the database! (%s)" % (num_rows, error))
+
+    def __process_queue(self):
+        while True:
+            with self.__condition:
+                if len(self.__pending) < self.batch_size:
+                    self.__condition.wait(self.flush_interval)
+            self.__write_pending()
+
+    def __write_pending(self):
+        with self.__write_lock:
+            with self.__condition:
+                pending = self.__pending
+                self.__pending = []
+            batches = []  # A list of (query, [params]), in the queued order
+            for query, params in pending:
+                if batches and batches[-1][0] == query:
+                    batches[-1][1].append(params)
+                else:
+                    batches.append((query, [params]))
+            for query, params_list in batches:
+                try:
+                    results_store.get_database_manager(self.database_env).execute_many(query, params_list)
+                except Exception as e:
+                    self.errors.append((len(params_list), e))
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(database_env):
+    with _writers_lock:
+        if database_env not in _writers:
+            _writers[database_env] = DatabaseWriter(database_env)
+        return _writers[database_env]
+
+
+def execute_query(database_env, query, params):
+    """ Runs a query that writes to the database. Happens in the background
+        (in batches) if DB_REPORTING_IN_BACKGROUND is True. """
+    if settings.DB_REPORTING_IN_BACKGROUND:
+        get_writer(database_env).write(query, params)
+    else:
+        results_store.get_database_manager(database_env).execute_query(query, params)
+
+
+def flush():
+    """ Writes all queued queries to the database. """
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+atexit.register(flush)
@@ -0,0 +1,71 @@
+"""
+Saves how long each test takes, and orders tests by their durations, so
+that parallel test runs (pytest-xdist) finish sooner. ("--duration_order")
+Tests are ordered longest-first. (Longest Processing Time first: workers
+take tests in order, so slow tests start early, and fast tests fill the gaps
+at the end, instead of one slow test running last while other workers wait.)
+Tests without a saved duration are estimated at the average duration, and
+tests with the same duration keep their file order. (So without any saved
+durations, the order doesn't change.)
+Durations (in seconds) are saved in the TEST_DURATIONS_FILE, as a moving
+average of recent runs, so that one slow run doesn't move a test too far.
+"""
+import json
+from seleniumbase import config as sb_config
+from seleniumbase.config import settings
+from seleniumbase.core import settings_parser
+from seleniumbase.fixtures import shared_utils
+
+SMOOTHING = 0.5  # The weight of the newest duration in the moving average
+
+
+def get_durations_file():
+    file_path = settings.TEST_DURATIONS_FILE
+    if hasattr(sb_config, "settings_file") and sb_config.settings_file:
+        override = settings_parser.set_settings(sb_config.settings_file)
+        if "TEST_DURATIONS_FILE" in override.keys():
+            file_path = override["TEST_DURATIONS_FILE"]
+    return file_path
+
+
+def load_durations(file_path=None):
+    """ Returns the saved durations: {test_id: seconds}.
+        (An empty dict if the file is missing or can't be read.) """
+    file_path = file_path or get_durations_file()
+    try:
+        with open(file_path, "r") as f:
+            durations = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(durations, dict):
+        return {}
+    return durations
+
+
+def save_durations(new_durations, file_path=None):
+    """ Adds new durations ({test_id: seconds}) to the saved durations.
+        Tests that didn't run keep their saved durations. """
+    if not new_durations:
+        return
+    file_path = file_path or get_durations_file()
+    durations = load_durations(file_path)
+    for test_id, duration in new_durations.items():
+        if test_id in durations:
+            duration = SMOOTHING * duration + (1 - SMOOTHING) * durations[test_id]
+        durations[test_id] = round(duration, 3)
+    data = json.dumps(durations, indent=0, sort_keys=True)
+    shared_utils.write_file_atomically(file_path, data)
+
+
+def order_by_duration(tests, durations, get_test_id):
+    """ Returns the tests ordered longest-first. (See above.)
+        get_test_id(test) returns the test_id of a test in durations. """
+    known = [durations[get_test_id(test)] for test in tests if get_test_id(test) in durations]
+    if not known:
+        return list(tests)
+    average = sum(known) / float(len(known))
+
+    def get_duration(test):
+        return durations.get(get_test_id(test), average)
+
+    return sorted(tests, key=get_duration, reverse=True)  # (A stable sort)
@@ -0,0 +1,210 @@
+"""
+This module contains methods for processing screenshots.
+Image processing uses Pillow if it's installed. ("pip install Pillow")
+Without Pillow, the methods here return None and images stay unchanged.
+"""
+import io
+import math
+import os
+from seleniumbase.config import settings
+from seleniumbase.fixtures.constants import ScreenshotFormat
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+COARSE_BLOCK_SIZE = 8  # (At most 15, so that 1 pixel changes a block's mean)
+ORIGINAL_SIZE_TAG = 0x010E  # The EXIF "ImageDescription" tag
+ORIGINAL_SIZE_PREFIX = "Original size: "
+
+
+def get_pil_image_module():
+    """ Returns the PIL.Image module, or None if Pillow isn't installed. """
+    try:
+        from PIL import Image
+
+        return Image
+    except ImportError:
+        return None
+
+
+def make_thumbnail(png, max_width):
+    """ Returns a PNG thumbnail (as bytes) of a PNG screenshot, scaled down to
+        max_width (keeping the aspect ratio), or None if Pillow is missing. """
+    Image = get_pil_image_module()
+    if not Image:
+        return None
+    image = Image.open(io.BytesIO(png))
+    width, height = image.size
+    if width > max_width:
+        new_height = int(height * max_width / float(width))
+        image = image.resize((max_width, max(new_height, 1)), Image.LANCZOS)
+    output = io.BytesIO()
+    image.save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+def get_screenshot_format():
+    """ Returns the SCREENSHOT_FORMAT setting. Falls back to "png" if the
+        format isn't valid, or if Pillow (or its WebP support) is missing. """
+    image_format = str(settings.SCREENSHOT_FORMAT).lower()
+    if image_format == "jpg":
+        image_format = ScreenshotFormat.JPEG
+    if image_format not in ScreenshotFormat.valid_formats:
+        return ScreenshotFormat.PNG
+    if image_format != ScreenshotFormat.PNG:
+        if not get_pil_image_module():
+            return ScreenshotFormat.PNG
+        if image_format == ScreenshotFormat.WEBP:
+            from PIL import features
+
+            if not features.check("webp"):
+                return ScreenshotFormat.PNG
+    return image_format
+
+
+def get_screenshot_file_name(name):
+    """ Returns the file name with the extension of the screenshot format.
+        (An existing image extension, such as ".png", gets replaced.) """
+    extension = ScreenshotFormat.extensions[get_screenshot_format()]
+    base, old_extension = os.path.splitext(name)
+    if old_extension.lower() in IMAGE_EXTENSIONS:
+        name = base
+    return "%s.%s" % (name, extension)
+
+
+def encode_screenshot(png):
+    """ Re-encodes a PNG screenshot using the SCREENSHOT_FORMAT,
+        SCREENSHOT_QUALITY, and SCREENSHOT_MAX_SIZE settings.
+        The original dimensions are saved in the EXIF metadata.
+        Returns (image_bytes, file_extension). With the default settings,
+        or without Pillow, the PNG is returned unchanged. """
+    image_format = get_screenshot_format()
+    max_size = settings.SCREENSHOT_MAX_SIZE
+    if image_format == ScreenshotFormat.PNG and not max_size:
+        return png, ScreenshotFormat.extensions[ScreenshotFormat.PNG]
+    Image = get_pil_image_module()
+    if not Image:
+        return png, ScreenshotFormat.extensions[ScreenshotFormat.PNG]
+    image = Image.open(io.BytesIO(png))
+    width, height = image.size
+    if max_size and max(width, height) > int(max_size):
+        image.thumbnail((int(max_size), int(max_size)), Image.LANCZOS)
+    if image_format == ScreenshotFormat.JPEG and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")  # JPEG has no alpha channel
+    save_options = {}
+    if image_format == ScreenshotFormat.PNG:
+        save_options["optimize"] = True
+    else:
+        save_options["quality"] = int(settings.SCREENSHOT_QUALITY)
+    if hasattr(Image, "Exif"):  # Pillow 6.0+
+        exif = Image.Exif()
+        exif[ORIGINAL_SIZE_TAG] = "%s%sx%s" % (ORIGINAL_SIZE_PREFIX, width, height)
+        save_options["exif"] = exif.tobytes()
+    output = io.BytesIO()
+    image.save(output, format=image_format.upper(), **save_options)
+    return output.getvalue(), ScreenshotFormat.extensions[image_format]
+
+
+def get_original_size(image_data):
+    """ Returns the (width, height) of a screenshot before it was scaled
+        down by encode_screenshot(), or its current size if it wasn't.
+        Returns None if Pillow is missing. """
+    Image = get_pil_image_module()
+    if not Image:
+        return None
+    image = Image.open(io.BytesIO(image_data))
+    try:
+        description = image.getexif().get(ORIGINAL_SIZE_TAG, "")
+        if description.startswith(ORIGINAL_SIZE_PREFIX):
+            width, height = description[len(ORIGINAL_SIZE_PREFIX) :].split("x")
+            return int(width), int(height)
+    except Exception:
+        pass  # No metadata (or Pillow < 6.0)
+    return image.size
+
+
+def scale_masks(masks, image_data, pixel_ratio=1):
+    """ Converts masks from page coordinates to image pixels.
+        Masks are (x, y, width, height) rectangles in CSS pixels of the
+        visible page. (Such as from getBoundingClientRect()) Screenshots
+        have pixel_ratio (window.devicePixelRatio) image pixels per CSS
+        pixel, and may have been scaled down by encode_screenshot().
+        The scaled rectangles are rounded outwards. Requires Pillow. """
+    if not masks:
+        return masks
+    Image = get_pil_image_module()
+    width = Image.open(io.BytesIO(image_data)).size[0]
+    original_width = get_original_size(image_data)[0]
+    scale = float(pixel_ratio or 1) * width / original_width
+    scaled_masks = []
+    for x, y, mask_width, mask_height in masks:
+        left = int(math.floor(x * scale))
+        top = int(math.floor(y * scale))
+        right = int(math.ceil((x + mask_width) * scale))
+        bottom = int(math.ceil((y + mask_height) * scale))
+        scaled_masks.append((left, top, right - left, bottom - top))
+    return scaled_masks
+
+
+def compare_images(baseline_data, image_data, tolerance=0, max_ratio=0.0, masks=None):
+    """ Compares two screenshots (image file data) pixel by pixel, with
+        Pillow's C image operations. Requires Pillow.
+        tolerance - How much (0-255) a color channel of a pixel can differ
+                    before the pixel counts as different.
+        max_ratio - The max ratio (0.0-1.0) of pixels that can be different.
+        masks - A list of (x, y, width, height) rectangles to ignore, in
+                image pixels. (See scale_masks() for page coordinates.)
+        Identical images are detected first, with a single bounding-box
+        check of their difference. Otherwise, a coarse check counts the
+        blocks (COARSE_BLOCK_SIZE pixels wide) with differences, which is
+        an upper bound of the different pixels. Only when that's too many
+        are the different pixels counted at full resolution.
+        Returns a dict with:
+        "matches" -> True if the images match (within the limits)
+        "ratio" -> The ratio of different pixels (an upper bound if the
+                   coarse check passed)
+        "size" / "baseline_size" -> The (width, height) of the images
+        "diff_png" -> If the images don't match, a PNG of the screenshot
+                      with the different pixels in red. (Else None) """
+    Image = get_pil_image_module()
+    from PIL import ImageChops, ImageDraw
+
+    baseline = Image.open(io.BytesIO(baseline_data)).convert("RGB")
+    image = Image.open(io.BytesIO(image_data)).convert("RGB")
+    result = {
+        "matches": False,
+        "ratio": 1.0,
+        "size": image.size,
+        "baseline_size": baseline.size,
+        "diff_png": None,
+    }
+    if image.size != baseline.size:
+        return result
+    for x, y, width, height in masks or []:
+        for img in (baseline, image):
+            ImageDraw.Draw(img).rectangle((x, y, x + width - 1, y + height - 1), fill=(0, 0, 0))
+    difference = ImageChops.difference(baseline, image)
+    if not difference.getbbox():
+        result["matches"] = True
+        result["ratio"] = 0.0
+        return result
+    red, green, blue = difference.split()
+    difference = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+    different = difference.point(lambda value: 255 if value > tolerance else 0)
+    width, height = image.size
+    total = float(width * height)
+    ratio = None
+    if hasattr(different, "reduce"):  # Pillow 7.0+
+        coarse = different.reduce(COARSE_BLOCK_SIZE)
+        blocks = coarse.size[0] * coarse.size[1] - coarse.histogram()[0]
+        upper_bound = min(blocks * COARSE_BLOCK_SIZE ** 2 / total, 1.0)
+        if upper_bound <= max_ratio:
+            ratio = upper_bound
+    if ratio is None:
+        ratio = different.histogram()[255] / total
+    result["ratio"] = ratio
+    result["matches"] = ratio <= max_ratio
+    if not result["matches"]:
+        diff_image = Image.composite(Image.new("RGB", image.size, (255, 0, 0)), image, different)
+        output = io.BytesIO()
+        diff_image.save(output, format="PNG")
+        result["diff_png"] = output.getvalue()
+    return result
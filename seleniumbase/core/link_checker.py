@@ -0,0 +1,122 @@
+"""
+Checks the status codes of page links, for assert_no_404_errors() and
+print_unique_links_with_status_codes().
+* Each host gets its own requests.Session, so connections are kept alive
+  and reused. At most LINK_CHECK_MAX_PER_HOST requests go to a host at once.
+* A HEAD request is made first, so that response bodies aren't downloaded.
+  If that fails (some servers don't support HEAD), a GET request is made,
+  and its response is closed without downloading the body.
+* Status codes are cached for LINK_CHECK_CACHE_TTL seconds, and shared by
+  all tests of a process. (With pytest-xdist, that's one cache per worker.)
+  Failed requests (such as timeouts and connection errors) aren't cached,
+  so that a temporary network error doesn't fail the next checks too.
+  Since the same links (Eg: nav bars) appear on most pages of a site,
+  most link checks after the first page are cache hits.
+"""
+import collections
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from seleniumbase.config import settings
+from seleniumbase.fixtures import shared_utils
+
+try:
+    from urllib.parse import urlparse  # Python 3
+except ImportError:
+    from urlparse import urlparse  # Python 2
+
+CACHE_SIZE = 10000
+
+
+class LinkChecker(object):
+    def __init__(self, num_threads=None, max_per_host=None, cache_ttl=None):
+        """ The defaults come from the LINK_CHECK_* values in settings.py """
+        self.num_threads = num_threads or settings.LINK_CHECK_THREADS
+        self.max_per_host = max_per_host or settings.LINK_CHECK_MAX_PER_HOST
+        if cache_ttl is None:
+            cache_ttl = settings.LINK_CHECK_CACHE_TTL
+        self.cache = shared_utils.LRUCache(max_size=CACHE_SIZE, ttl=cache_ttl)
+        self.__sessions = {}
+        self.__host_limits = {}
+        self.__pool = None
+        self.__lock = threading.Lock()
+
+    def get_status_code(self, link, allow_redirects=False, timeout=5):
+        """ Returns the status code of a link. (404 if the request fails.) """
+        key = (link, allow_redirects)
+        status_code = self.cache.get(key)
+        if status_code is None:
+            status_code, request_failed = self.__request_status_code(link, allow_redirects, timeout)
+            if not request_failed:
+                self.cache.set(key, status_code)
+        return status_code
+
+    def get_status_codes(self, links, allow_redirects=False, timeout=5):
+        """ Returns the status codes of a list of links (in the same order).
+            Links that aren't in the cache are checked concurrently. """
+        unique_links = list(collections.OrderedDict.fromkeys(links))
+
+        def get_status_code(link):
+            return self.get_status_code(link, allow_redirects, timeout)
+
+        status_codes = dict(zip(unique_links, self.__get_pool().map(get_status_code, unique_links)))
+        return [status_codes[link] for link in links]
+
+    def __request_status_code(self, link, allow_redirects, timeout):
+        """ Returns (status_code, request_failed). If the request failed
+            without a response, the status code is 404. """
+        session, host_limit = self.__get_session(urlparse(link).netloc)
+        with host_limit:
+            try:
+                response = session.head(link, allow_redirects=allow_redirects, timeout=timeout)
+                response.close()
+                if response.status_code < 400:
+                    return response.status_code, False
+            except Exception:
+                pass  # Try again with a GET request
+            try:
+                response = session.get(link, allow_redirects=allow_redirects, timeout=timeout, stream=True)
+                response.close()  # Without downloading the response body
+                return response.status_code, False
+            except Exception:
+                return 404, True
+
+    def __get_session(self, host):
+        with self.__lock:
+            if host not in self.__sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.__sessions[host] = session
+                self.__host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.__sessions[host], self.__host_limits[host]
+
+    def __get_pool(self):
+        with self.__lock:
+            if not self.__pool:
+                from multiprocessing.dummy import Pool as ThreadPool
+
+                self.__pool = ThreadPool(self.num_threads)
+            return self.__pool
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def get_link_checker():
+    """ Returns the LinkChecker shared by all tests of this process. """
+    global _checker
+    with _checker_lock:
+        if not _checker:
+            _checker = LinkChecker()
+        return _checker
+
+
+def get_status_code(link, allow_redirects=False, timeout=5):
+    return get_link_checker().get_status_code(link, allow_redirects=allow_redirects, timeout=timeout)
+
+
+def get_status_codes(links, allow_redirects=False, timeout=5):
+    return get_link_checker().get_status_codes(links, allow_redirects=allow_redirects, timeout=timeout)
@@ -1,34 +1,46 @@
-import codecs
 import os
 import shutil
 import sys
 import time
 import traceback
 from seleniumbase.config import settings
+from seleniumbase.core import artifact_writer
+from seleniumbase.core import image_helper
 
 
 def log_screenshot(test_logpath, driver, screenshot=None, get=False):
-    screenshot_name = settings.SCREENSHOT_NAME
-    screenshot_path = "%s/%s" % (test_logpath, screenshot_name)
+    """ Saves a PNG screenshot in the format of the SCREENSHOT_FORMAT setting.
+        (See image_helper.encode_screenshot() for details.) """
     try:
         if not screenshot:
             element = driver.find_element_by_tag_name("body")
-            screenshot = element.screenshot_as_base64
-        with open(screenshot_path, "wb") as file:
-            file.write(screenshot)
+            screenshot = element.screenshot_as_png
+        _write_screenshot(test_logpath, screenshot)
         if get:
             return screenshot
     except Exception:
         try:
-            driver.get_screenshot_as_file(screenshot_path)
+            screenshot = driver.get_screenshot_as_png()
+            _write_screenshot(test_logpath, screenshot)
         except Exception:
             print("WARNING: Unable to get screenshot for failure logs!")
 
 
+def get_screenshot_path(test_logpath):
+    """ Returns the path of the log screenshot for the screenshot format. """
+    screenshot_name = image_helper.get_screenshot_file_name(settings.SCREENSHOT_NAME)
+    return "%s/%s" % (test_logpath, screenshot_name)
+
+
+def _write_screenshot(test_logpath, png):
+    # (The same path as get_screenshot_path(), which the reports link to)
+    image_data = image_helper.encode_screenshot(png)[0]
+    artifact_writer.write_file(get_screenshot_path(test_logpath), image_data)
+
+
 def log_test_failure_data(test, test_logpath, driver, browser, url=None):
     basic_info_name = settings.BASIC_INFO_NAME
     basic_file_path = "%s/%s" % (test_logpath, basic_info_name)
-    log_file = codecs.open(basic_file_path, "w+", "utf-8")
     if url:
         last_page = url
     else:
@@ -54,8 +66,7 @@ def log_test_failure_data(test, test_logpath, driver, browser, url=None):
             "Traceback: "
             + "".join(traceback.format_exception(sys.exc_info()[0], sys.exc_info()[1], sys.exc_info()[2]))
         )
-    log_file.writelines("\r\n".join(data_to_save))
-    log_file.close()
+    artifact_writer.write_file(basic_file_path, "\r\n".join(data_to_save))
 
 
 def log_page_source(test_logpath, driver, source=None):
@@ -69,10 +80,8 @@ def log_page_source(test_logpath, driver, source=None):
             # Since we can't get the page source from here, skip saving it
             return
     html_file_path = "%s/%s" % (test_logpath, html_file_name)
-    html_file = codecs.open(html_file_path, "w+", "utf-8")
     rendered_source = get_html_source_with_base_href(driver, page_source)
-    html_file.write(rendered_source)
-    html_file.close()
+    artifact_writer.write_file(html_file_path, rendered_source)
 
 
 def get_last_page(driver):
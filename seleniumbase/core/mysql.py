@@ -1,12 +1,98 @@
 """
 Wrapper for MySQL DB functions to make life easier.
+Connections are pooled per process: A DatabaseManager borrows a connection
+from the pool, and gives it back when its query is done, so that tests don't
+have to connect to the database for every query. (Max idle: POOL_SIZE)
 """
 
+import contextlib
+import os
+import threading
 import time
 from seleniumbase import config as sb_config
 from seleniumbase.config import settings
 from seleniumbase.core import settings_parser
 
+POOL_SIZE = 4  # The max number of idle connections kept open per process
+
+
+class ConnectionPool(object):
+    """ Keeps idle connections open for reuse, by connection parameters. """
+
+    def __init__(self, max_idle=POOL_SIZE):
+        self.max_idle = max_idle
+        self.__idle = {}  # Key: connection parameters, Value: connections
+        self.__lock = threading.Lock()
+        self.__pid = os.getpid()
+
+    def get_connection(self, params):
+        """ Returns an idle connection (if it's still alive), or a new one.
+            params = (host, port, user, passwd, db) """
+        import pymysql
+
+        while True:
+            with self.__lock:
+                self.__check_pid()
+                idle = self.__idle.get(params)
+                if not idle:
+                    break
+                conn = idle.pop()
+            try:
+                conn.ping(reconnect=False)
+                return conn
+            except Exception:
+                self.__close(conn)  # (Closed by the server. Try the next one)
+        retry_count = 3
+        backoff = 1.2  # Time to wait (in seconds) between retries.
+        count = 0
+        while count < retry_count:
+            try:
+                host, port, user, passwd, db = params
+                conn = pymysql.connect(host=host, port=port, user=user, passwd=passwd, db=db)
+                conn.autocommit(True)
+                return conn
+            except Exception:
+                time.sleep(backoff)
+                count = count + 1
+        raise Exception("Unable to connect to Database after 3 retries.")
+
+    def release(self, params, conn, reusable=True):
+        """ Gives a connection back to the pool (or closes it). """
+        with self.__lock:
+            self.__check_pid()
+            idle = self.__idle.setdefault(params, [])
+            if reusable and len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        self.__close(conn)
+
+    def close_all(self):
+        with self.__lock:
+            idle_lists = list(self.__idle.values())
+            self.__idle = {}
+        for idle in idle_lists:
+            for conn in idle:
+                self.__close(conn)
+
+    def __check_pid(self):
+        # Connections can't be shared with a forked process
+        if self.__pid != os.getpid():
+            self.__idle = {}
+            self.__pid = os.getpid()
+
+    def __close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool = ConnectionPool()
+
+
+def get_connection_pool():
+    return _pool
+
 
 class DatabaseManager:
     """
@@ -15,10 +101,8 @@ class DatabaseManager:
 
     def __init__(self, database_env="test", conf_creds=None):
         """
-        Create a connection to the MySQL DB.
+        Get a connection to the MySQL DB. (From the connection pool)
         """
-        import pymysql
-
         db_server = settings.DB_HOST
         db_port = settings.DB_PORT
         db_user = settings.DB_USERNAME
@@ -36,49 +120,55 @@ class DatabaseManager:
                 db_pass = override["DB_PASSWORD"]
             if "DB_SCHEMA" in override.keys():
                 db_schema = override["DB_SCHEMA"]
-        retry_count = 3
-        backoff = 1.2  # Time to wait (in seconds) between retries.
-        count = 0
-        while count < retry_count:
-            try:
-                self.conn = pymysql.connect(
-                    host=db_server, port=db_port, user=db_user, passwd=db_pass, db=db_schema,
-                )
-                self.conn.autocommit(True)
-                self.cursor = self.conn.cursor()
-                return
-            except Exception:
-                time.sleep(backoff)
-                count = count + 1
-        if retry_count == 3:
-            raise Exception("Unable to connect to Database after 3 retries.")
+        self.__params = (db_server, db_port, db_user, db_pass, db_schema)
+        self.conn = _pool.get_connection(self.__params)
+        self.cursor = self.conn.cursor()
 
     def query_fetch_all(self, query, values):
         """
-        Executes a db query, gets all the values, and closes the connection.
+        Executes a db query, gets all the values, and releases the connection.
         """
-        self.cursor.execute(query, values)
-        retval = self.cursor.fetchall()
-        self.__close_db()
-        return retval
+        with self.__query():
+            self.cursor.execute(query, values)
+            return self.cursor.fetchall()
 
     def query_fetch_one(self, query, values):
         """
-        Executes a db query, gets the first value, and closes the connection.
+        Executes a db query, gets the first value, and releases the connection.
         """
-        self.cursor.execute(query, values)
-        retval = self.cursor.fetchone()
-        self.__close_db()
-        return retval
+        with self.__query():
+            self.cursor.execute(query, values)
+            return self.cursor.fetchone()
 
     def execute_query(self, query, values):
         """
-        Executes a query to the test_db and closes the connection afterwards.
+        Executes a query to the test_db and releases the connection afterwards.
+        """
+        with self.__query():
+            return self.cursor.execute(query, values)
+
+    def execute_many(self, query, values_list):
         """
-        retval = self.cursor.execute(query, values)
-        self.__close_db()
-        return retval
+        Executes a query once for each set of values, and releases the
+        connection afterwards. (INSERTs become one multi-row INSERT.)
+        """
+        with self.__query():
+            return self.cursor.executemany(query, values_list)
+
+    @contextlib.contextmanager
+    def __query(self):
+        """ Closes the cursor afterwards, and gives the connection back to
+            the pool. (Connections that had an error get closed instead.) """
+        reusable = False
+        try:
+            yield
+            reusable = True
+        finally:
+            self.__close_db(reusable)
 
-    def __close_db(self):
-        self.cursor.close()
-        self.conn.close()
+    def __close_db(self, reusable=True):
+        try:
+            self.cursor.close()
+        except Exception:
+            reusable = False
+        _pool.release(self.__params, self.conn, reusable)
@@ -0,0 +1,36 @@
+"""
+Selects the database that --with-db_reporting saves test results to:
+"mysql" -> A MySQL server. (core/mysql.py) (The default)
+"sqlite" -> A local SQLite file, without a server. (core/sqlite_db.py)
+Set it with "--db_backend=BACKEND", or with DB_BACKEND in settings.py.
+Both DatabaseManager classes have the same methods and use the same tables.
+"""
+from seleniumbase import config as sb_config
+from seleniumbase.config import settings
+from seleniumbase.core import settings_parser
+from seleniumbase.fixtures.constants import DatabaseBackend
+
+
+def get_backend():
+    backend = getattr(sb_config, "db_backend", None)
+    if not backend:
+        backend = settings.DB_BACKEND
+        if hasattr(sb_config, "settings_file") and sb_config.settings_file:
+            override = settings_parser.set_settings(sb_config.settings_file)
+            if "DB_BACKEND" in override.keys():
+                backend = override["DB_BACKEND"]
+    backend = str(backend).lower()
+    if backend not in DatabaseBackend.valid_backends:
+        raise Exception(
+            'Invalid DB_BACKEND: "%s"! Valid options: %s' % (backend, DatabaseBackend.valid_backends)
+        )
+    return backend
+
+
+def get_database_manager(database_env="test"):
+    """ Returns a DatabaseManager for the selected database backend. """
+    if get_backend() == DatabaseBackend.SQLITE:
+        from seleniumbase.core.sqlite_db import DatabaseManager
+    else:
+        from seleniumbase.core.mysql import DatabaseManager
+    return DatabaseManager(database_env)
@@ -1,11 +1,44 @@
+"""
+Parses a settings file (--settings_file=FILE) to override settings.py values.
+Parsed files are cached by (path, mtime, size), since set_settings() gets
+called for every test (and for every database connection). A file is only
+parsed again (and the settings overridden again) when it changes.
+"""
 import re
+import threading
 from seleniumbase.config import settings
+from seleniumbase.fixtures import shared_utils
+
+DOUBLE_QUOTED_REGEX = re.compile(r'^\s*([\S]+)\s*=\s*"([\S\s]+)"\s*$')  # KEY = "VALUE"
+SINGLE_QUOTED_REGEX = re.compile(r"^\s*([\S]+)\s*=\s*'([\S\s]+)'\s*$")  # KEY = 'VALUE'
+UNQUOTED_REGEX = re.compile(r"^\s*([\S]+)\s*=\s*([\S]+)\s*$")  # KEY = VALUE
+
+_cache = shared_utils.LRUCache(max_size=16)
+_applied_key = None  # The cache key of the settings file that was applied
+_lock = threading.Lock()
 
 
 def set_settings(settings_file):
+    """ Overrides settings.py values with those from a settings file, and
+        returns a dict of the override values. (Parsed files are cached.) """
+    global _applied_key
     if not settings_file.endswith(".py"):
         raise Exception("\n\n`%s` is not a Python file!\n\n" % settings_file)
 
+    with _lock:
+        key = shared_utils.get_file_cache_key(settings_file)
+        parsed_file = _cache.get(key)
+        if parsed_file is None:
+            parsed_file = _parse_settings_file(settings_file)
+            _cache.set(key, parsed_file)
+        override_settings, valid_settings = parsed_file
+        if key != _applied_key:
+            _apply_settings(valid_settings)
+            _applied_key = key
+    return dict(override_settings)
+
+
+def _parse_settings_file(settings_file):
     f = open(settings_file, "r")
     all_code = f.read()
     f.close()
@@ -17,7 +50,7 @@ def set_settings(settings_file):
     for line in code_lines:
 
         # KEY = "VALUE"
-        data = re.match(r'^\s*([\S]+)\s*=\s*"([\S\s]+)"\s*$', line)
+        data = DOUBLE_QUOTED_REGEX.match(line)
         if data:
             key = data.group(1)
             value = '"' + data.group(2) + '"'
@@ -26,7 +59,7 @@ def set_settings(settings_file):
             continue
 
         # KEY = 'VALUE'
-        data = re.match(r"^\s*([\S]+)\s*=\s*'([\S\s]+)'\s*$", line)
+        data = SINGLE_QUOTED_REGEX.match(line)
         if data:
             key = data.group(1)
             value = "'" + data.group(2) + "'"
@@ -35,7 +68,7 @@ def set_settings(settings_file):
             continue
 
         # KEY = VALUE
-        data = re.match(r"^\s*([\S]+)\s*=\s*([\S]+)\s*$", line)
+        data = UNQUOTED_REGEX.match(line)
         if data:
             key = data.group(1)
             value = data.group(2)
@@ -43,6 +76,7 @@ def set_settings(settings_file):
             num_settings += 1
             continue
 
+    valid_settings = {}  # The values that get applied to settings.py
     for key in override_settings.keys():
         value = override_settings[key]
         if value.replace(".", "1").isdigit():
@@ -62,7 +96,16 @@ def set_settings(settings_file):
             override_settings[key] = value[1:-1]
         else:
             continue
+        valid_settings[key] = override_settings[key]
+
+    if num_settings == 0:
+        raise Exception("Unable to parse the settings file!")
 
+    return override_settings, valid_settings
+
+
+def _apply_settings(override_settings):
+    for key in override_settings.keys():
         if key == "MINI_TIMEOUT":
             settings.MINI_TIMEOUT = override_settings[key]
         elif key == "SMALL_TIMEOUT":
@@ -77,6 +120,12 @@ def set_settings(settings_file):
             settings.ARCHIVE_EXISTING_DOWNLOADS = override_settings[key]
         elif key == "SCREENSHOT_NAME":
             settings.SCREENSHOT_NAME = override_settings[key]
+        elif key == "SCREENSHOT_FORMAT":
+            settings.SCREENSHOT_FORMAT = override_settings[key]
+        elif key == "SCREENSHOT_QUALITY":
+            settings.SCREENSHOT_QUALITY = override_settings[key]
+        elif key == "SCREENSHOT_MAX_SIZE":
+            settings.SCREENSHOT_MAX_SIZE = override_settings[key]
         elif key == "BASIC_INFO_NAME":
             settings.BASIC_INFO_NAME = override_settings[key]
         elif key == "PAGE_SOURCE_NAME":
@@ -87,6 +136,8 @@ def set_settings(settings_file):
             settings.REPORT_ARCHIVE_DIR = override_settings[key]
         elif key == "HTML_REPORT":
             settings.HTML_REPORT = override_settings[key]
+        elif key == "REPORT_THUMBNAIL_WIDTH":
+            settings.REPORT_THUMBNAIL_WIDTH = override_settings[key]
         elif key == "RESULTS_TABLE":
             settings.RESULTS_TABLE = override_settings[key]
         elif key == "WAIT_FOR_RSC_ON_PAGE_LOADS":
@@ -95,6 +146,36 @@ def set_settings(settings_file):
             settings.WAIT_FOR_RSC_ON_CLICKS = override_settings[key]
         elif key == "WAIT_FOR_ANGULARJS":
             settings.WAIT_FOR_ANGULARJS = override_settings[key]
+        elif key == "WAIT_STRATEGY":
+            settings.WAIT_STRATEGY = override_settings[key]
+        elif key == "NETWORK_IDLE_TIME":
+            settings.NETWORK_IDLE_TIME = override_settings[key]
+        elif key == "WAIT_FOR_ELEMENTS_WITH_OBSERVER":
+            settings.WAIT_FOR_ELEMENTS_WITH_OBSERVER = override_settings[key]
+        elif key == "PROBE_ELEMENTS_WITH_JS":
+            settings.PROBE_ELEMENTS_WITH_JS = override_settings[key]
+        elif key == "CACHE_ELEMENT_LOOKUPS":
+            settings.CACHE_ELEMENT_LOOKUPS = override_settings[key]
+        elif key == "HTML_PARSER":
+            settings.HTML_PARSER = override_settings[key]
+        elif key == "CACHE_PARSED_PAGES":
+            settings.CACHE_PARSED_PAGES = override_settings[key]
+        elif key == "CHECK_WINDOW_WITH_JS":
+            settings.CHECK_WINDOW_WITH_JS = override_settings[key]
+        elif key == "PIXEL_DIFF_TOLERANCE":
+            settings.PIXEL_DIFF_TOLERANCE = override_settings[key]
+        elif key == "PIXEL_DIFF_MAX_RATIO":
+            settings.PIXEL_DIFF_MAX_RATIO = override_settings[key]
+        elif key == "VISUAL_BASELINE_FORMAT":
+            settings.VISUAL_BASELINE_FORMAT = override_settings[key]
+        elif key == "GET_LINKS_WITH_JS":
+            settings.GET_LINKS_WITH_JS = override_settings[key]
+        elif key == "LINK_CHECK_THREADS":
+            settings.LINK_CHECK_THREADS = override_settings[key]
+        elif key == "LINK_CHECK_MAX_PER_HOST":
+            settings.LINK_CHECK_MAX_PER_HOST = override_settings[key]
+        elif key == "LINK_CHECK_CACHE_TTL":
+            settings.LINK_CHECK_CACHE_TTL = override_settings[key]
         elif key == "DEFAULT_DEMO_MODE_TIMEOUT":
             settings.DEFAULT_DEMO_MODE_TIMEOUT = override_settings[key]
         elif key == "HIGHLIGHTS":
@@ -107,6 +188,16 @@ def set_settings(settings_file):
             settings.DISABLE_CSP_ON_CHROME = override_settings[key]
         elif key == "RAISE_INVALID_PROXY_STRING_EXCEPTION":
             settings.RAISE_INVALID_PROXY_STRING_EXCEPTION = override_settings[key]
+        elif key == "USE_BUNDLED_ASSETS":
+            settings.USE_BUNDLED_ASSETS = override_settings[key]
+        elif key == "WRITE_LOG_FILES_IN_BACKGROUND":
+            settings.WRITE_LOG_FILES_IN_BACKGROUND = override_settings[key]
+        elif key == "TEST_DURATIONS_FILE":
+            settings.TEST_DURATIONS_FILE = override_settings[key]
+        elif key == "BROWSER_POOL_MAX_USES":
+            settings.BROWSER_POOL_MAX_USES = override_settings[key]
+        elif key == "BROWSER_POOL_MAX_MEMORY_GROWTH":
+            settings.BROWSER_POOL_MAX_MEMORY_GROWTH = override_settings[key]
         elif key == "MASTERQA_DEFAULT_VALIDATION_MESSAGE":
             settings.MASTERQA_DEFAULT_VALIDATION_MESSAGE = override_settings[key]
         elif key == "MASTERQA_WAIT_TIME_BEFORE_VERIFY":
@@ -117,6 +208,10 @@ def set_settings(settings_file):
             settings.MASTERQA_MAX_IDLE_TIME_BEFORE_QUIT = override_settings[key]
         elif key == "TOTP_KEY":
             settings.TOTP_KEY = override_settings[key]
+        elif key == "DB_BACKEND":
+            settings.DB_BACKEND = override_settings[key]
+        elif key == "SQLITE_DB_PATH":
+            settings.SQLITE_DB_PATH = override_settings[key]
         elif key == "DB_HOST":
             settings.DB_HOST = override_settings[key]
         elif key == "DB_PORT":
@@ -127,6 +222,10 @@ def set_settings(settings_file):
             settings.DB_PASSWORD = override_settings[key]
         elif key == "DB_SCHEMA":
             settings.DB_SCHEMA = override_settings[key]
+        elif key == "DB_REPORTING_IN_BACKGROUND":
+            settings.DB_REPORTING_IN_BACKGROUND = override_settings[key]
+        elif key == "DB_REPORTING_FLUSH_INTERVAL":
+            settings.DB_REPORTING_FLUSH_INTERVAL = override_settings[key]
         elif key == "S3_LOG_BUCKET":
             settings.S3_LOG_BUCKET = override_settings[key]
         elif key == "S3_BUCKET_URL":
@@ -143,8 +242,3 @@ def set_settings(settings_file):
             settings.OBFUSCATION_END_TOKEN = override_settings[key]
         else:
             continue
-
-    if num_settings == 0:
-        raise Exception("Unable to parse the settings file!")
-
-    return override_settings
@@ -0,0 +1,148 @@
+"""
+A SQLite version of the MySQL DatabaseManager, for using --with-db_reporting
+without a database server. ("--db_backend=sqlite" or DB_BACKEND = "sqlite")
+Results are saved to the SQLITE_DB_PATH file, with the same tables as
+create_db_tables.sql, which get created on first use.
+The database uses WAL mode, so tests can keep reading it while other
+processes write to it, and writers wait (up to SQLITE_TIMEOUT seconds) for
+each other, so that parallel pytest-xdist workers can share the database.
+Connections are kept open per process and thread. (SQLite connections can't
+be shared between threads, or with forked processes.)
+"""
+
+import os
+import re
+import threading
+from seleniumbase import config as sb_config
+from seleniumbase.config import settings
+from seleniumbase.core import settings_parser
+
+SQLITE_TIMEOUT = 30  # Seconds to wait for other writers before failing
+PARAM_REGEX = re.compile(r"%\((\w+)\)s")  # MySQL-style params: "%(name)s"
+
+CREATE_TABLES = """
+CREATE TABLE IF NOT EXISTS test_run_data (
+  guid varchar(64) NOT NULL DEFAULT '',
+  test_address varchar(255) DEFAULT NULL,
+  env varchar(64) DEFAULT NULL,
+  start_time varchar(64) DEFAULT NULL,
+  execution_guid varchar(64) DEFAULT NULL,
+  runtime int(11),
+  state varchar(64) DEFAULT NULL,
+  browser varchar(64) DEFAULT NULL,
+  message text,
+  stack_trace text,
+  retry_count int(11) DEFAULT '0',
+  exception_map_guid varchar(64) DEFAULT NULL,
+  log_url text,
+  PRIMARY KEY (guid)
+);
+CREATE INDEX IF NOT EXISTS idx_test_run_data_execution_guid
+  ON test_run_data (execution_guid);
+CREATE INDEX IF NOT EXISTS idx_test_run_data_test_address
+  ON test_run_data (test_address);
+CREATE INDEX IF NOT EXISTS idx_test_run_data_start_time
+  ON test_run_data (start_time);
+
+CREATE TABLE IF NOT EXISTS test_execution (
+  guid varchar(64) NOT NULL DEFAULT '',
+  total_execution_time int(11),
+  username varchar(255) DEFAULT NULL,
+  execution_start bigint(20) DEFAULT '0',
+  PRIMARY KEY (guid)
+);
+"""
+
+_local = threading.local()  # Connections: Key: database path, Value: conn
+_converted_queries = {}
+
+
+def get_database_path():
+    db_path = settings.SQLITE_DB_PATH
+    if hasattr(sb_config, "settings_file") and sb_config.settings_file:
+        override = settings_parser.set_settings(sb_config.settings_file)
+        if "SQLITE_DB_PATH" in override.keys():
+            db_path = override["SQLITE_DB_PATH"]
+    return os.path.abspath(db_path)
+
+
+def convert_query(query):
+    """ Converts the params of a MySQL query ("%(name)s") to the params
+        of a SQLite query (":name"). """
+    if query not in _converted_queries:
+        _converted_queries[query] = PARAM_REGEX.sub(r":\1", query)
+    return _converted_queries[query]
+
+
+def _connect(db_path):
+    import sqlite3
+
+    db_folder = os.path.dirname(db_path)
+    if not os.path.exists(db_folder):
+        try:
+            os.makedirs(db_folder)
+        except Exception:
+            pass  # (Another process created it first)
+    # isolation_level=None -> Autocommit. (Like the MySQL DatabaseManager)
+    conn = sqlite3.connect(db_path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # (Safe with WAL mode)
+    conn.executescript(CREATE_TABLES)
+    return conn
+
+
+def _get_connection(db_path):
+    if getattr(_local, "pid", None) != os.getpid():
+        _local.connections = {}
+        _local.pid = os.getpid()
+    if db_path not in _local.connections:
+        _local.connections[db_path] = _connect(db_path)
+    return _local.connections[db_path]
+
+
+class DatabaseManager:
+    """
+    This class wraps SQLite database methods for easy use.
+    It has the same methods as the MySQL DatabaseManager.
+    """
+
+    def __init__(self, database_env="test", conf_creds=None):
+        """
+        Get a connection to the SQLite DB. (Created if it doesn't exist)
+        """
+        self.db_path = get_database_path()
+        self.conn = _get_connection(self.db_path)
+
+    def query_fetch_all(self, query, values):
+        """
+        Executes a db query and gets all the values.
+        """
+        return self.conn.execute(convert_query(query), values).fetchall()
+
+    def query_fetch_one(self, query, values):
+        """
+        Executes a db query and gets the first value.
+        """
+        return self.conn.execute(convert_query(query), values).fetchone()
+
+    def execute_query(self, query, values):
+        """
+        Executes a query to the test_db. Returns the number of changed rows.
+        """
+        return self.conn.execute(convert_query(query), values).rowcount
+
+    def execute_many(self, query, values_list):
+        """
+        Executes a query once for each set of values, in a single
+        transaction. Returns the number of changed rows.
+        """
+        # "BEGIN IMMEDIATE" waits for other writers now, instead of failing
+        # later if another process started writing first.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row_count = self.conn.executemany(convert_query(query), values_list).rowcount
+            self.conn.execute("COMMIT")
+            return row_count
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
@@ -1,7 +1,13 @@
-from seleniumbase.core.mysql import DatabaseManager
+from seleniumbase.core import db_writer
+from seleniumbase.core import results_store
 
 
 class TestcaseManager:
+    """ Reports test results to the database. (MySQL or SQLite, from the
+        DB_BACKEND setting. See results_store.) Writes are queued and sent in
+        batches by db_writer. (Unless DB_REPORTING_IN_BACKGROUND is False)
+        Call db_writer.flush() to wait for them. """
+
     def __init__(self, database_env):
         self.database_env = database_env
 
@@ -15,7 +21,7 @@ class TestcaseManager:
                    (guid, execution_start, total_execution_time, username)
                    VALUES (%(guid)s,%(execution_start_time)s,
                            %(total_execution_time)s,%(username)s)"""
-        DatabaseManager(self.database_env).execute_query(query, execution_query_payload.get_params())
+        db_writer.execute_query(self.database_env, query, execution_query_payload.get_params())
         return execution_query_payload.guid
 
     def update_execution_data(self, execution_guid, execution_time):
@@ -23,8 +29,8 @@ class TestcaseManager:
         query = """UPDATE test_execution
                    SET total_execution_time=%(execution_time)s
                    WHERE guid=%(execution_guid)s """
-        DatabaseManager(self.database_env).execute_query(
-            query, {"execution_guid": execution_guid, "execution_time": execution_time}
+        db_writer.execute_query(
+            self.database_env, query, {"execution_guid": execution_guid, "execution_time": execution_time}
         )
 
     def insert_testcase_data(self, testcase_run_payload):
@@ -44,7 +50,7 @@ class TestcaseManager:
                               %(retry_count)s,
                               %(message)s,
                               %(stack_trace)s) """
-        DatabaseManager(self.database_env).execute_query(query, testcase_run_payload.get_params())
+        db_writer.execute_query(self.database_env, query, testcase_run_payload.get_params())
 
     def update_testcase_data(self, testcase_payload):
         """ Updates an existing test run in the database. """
@@ -55,13 +61,27 @@ class TestcaseManager:
                             stack_trace=%(stack_trace)s,
                             message=%(message)s
                             WHERE guid=%(guid)s """
-        DatabaseManager(self.database_env).execute_query(query, testcase_payload.get_params())
+        db_writer.execute_query(self.database_env, query, testcase_payload.get_params())
 
     def update_testcase_log_url(self, testcase_payload):
         query = """UPDATE test_run_data
                    SET log_url=%(log_url)s
                    WHERE guid=%(guid)s """
-        DatabaseManager(self.database_env).execute_query(query, testcase_payload.get_params())
+        db_writer.execute_query(self.database_env, query, testcase_payload.get_params())
+
+    def get_testcase_history(self, test_address, limit=20):
+        """ Returns the most recent runs of a test, newest first, as a list of
+            (start_time, runtime, state, execution_guid) tuples.
+            "runtime" is the duration of the test, in milliseconds. """
+        db_writer.flush()  # Include results that are still in the queue
+        query = """SELECT start_time, runtime, state, execution_guid
+                   FROM test_run_data
+                   WHERE test_address=%(test_address)s
+                   ORDER BY start_time DESC
+                   LIMIT %(limit)s """
+        return results_store.get_database_manager(self.database_env).query_fetch_all(
+            query, {"test_address": test_address, "limit": int(limit)}
+        )
 
 
 class ExecutionQueryPayload:
@@ -1,7 +1,32 @@
+"""
+Saves and loads the visual baselines of check_window().
+With VISUAL_BASELINE_FORMAT = "compact" (the default), each baseline is a
+single gzip-compressed JSON file: "<test_id>/<name>.json.gz", which holds
+the page URL, the tag lists of all 3 levels, the DOM fingerprint, and the
+file name of the baseline screenshot (saved next to it as "<name>.png").
+Files are written to a temp file first and then renamed, so a baseline is
+never left half-written. (Such as when parallel tests share a baseline.)
+Each saved baseline also gets a line in "index.jsonl", for fast listing.
+With "folders", each baseline is a folder of text files (the old format).
+Baselines in the old format can be loaded with either setting, and can be
+converted to the compact format with "sbase migrate-baselines".
+"""
+import codecs
+import gzip
+import io
+import json
 import os
+import shutil
+import time
+from seleniumbase.config import settings
+from seleniumbase.core import image_helper
 from seleniumbase.fixtures import constants
+from seleniumbase.fixtures import shared_utils
 
 VISUAL_BASELINE_DIR = constants.VisualBaseline.STORAGE_FOLDER
+BASELINE_EXTENSION = ".json.gz"
+INDEX_FILE = "index.jsonl"
+FORMAT_VERSION = 1
 abs_path = os.path.abspath(".")
 visual_baseline_path = os.path.join(abs_path, VISUAL_BASELINE_DIR)
 
@@ -17,3 +42,290 @@ def visual_baseline_folder_setup():
             os.makedirs(visual_baseline_path)
         except Exception:
             pass  # Should only be reachable during multi-threaded runs
+
+
+def get_level_data(fingerprint, subtrees=None):
+    """ Returns the (level_1, level_2, level_3) tag lists from the details
+        of a DOM fingerprint, for the given subtree indexes (or for all). """
+    levels = ([], [], [])
+    for index, details in enumerate(fingerprint["details"]):
+        if details and (subtrees is None or index in subtrees):
+            for k in range(3):
+                levels[k].extend(details[k])
+    return levels
+
+
+def get_changed_subtrees(fingerprint, baseline_fingerprint, level):
+    """ Returns the indexes of the subtrees (children of the <body>) whose
+        hashes for the level don't match the baseline. Returns None if the
+        subtrees can't be matched up. (A different number of subtrees) """
+    if len(fingerprint["subtrees"]) != len(baseline_fingerprint["subtrees"]):
+        return None
+    changed = []
+    for index, hashes in enumerate(fingerprint["subtrees"]):
+        if hashes[level - 1] != baseline_fingerprint["subtrees"][index][level - 1]:
+            changed.append(index)
+    return changed
+
+
+def get_subtree_data(level_data, baseline_fingerprint, subtrees):
+    """ Returns the entries of baseline level data (a full tag list) that
+        belong to the given subtrees. (Subtrees are contiguous in the list,
+        since the elements are listed in document order.) """
+    subtree_data = []
+    start = 0
+    for index, size in enumerate(baseline_fingerprint["sizes"]):
+        if index in subtrees:
+            subtree_data.extend(level_data[start : start + size])
+        start += size
+    return subtree_data
+
+
+def _makedirs(folder):
+    if not os.path.exists(folder):
+        try:
+            os.makedirs(folder)
+        except Exception:
+            pass  # Only reachable during multi-threaded test runs
+
+
+def get_baseline_file(test_id, name, baseline_dir=VISUAL_BASELINE_DIR):
+    """ Returns the path of a baseline in the compact format. """
+    return os.path.join(baseline_dir, test_id, name + BASELINE_EXTENSION)
+
+
+def get_legacy_baseline_folder(test_id, name, baseline_dir=VISUAL_BASELINE_DIR):
+    """ Returns the path of a baseline in the "folders" format. """
+    return os.path.join(baseline_dir, test_id, name)
+
+
+def load_baseline(test_id, name, baseline_dir=VISUAL_BASELINE_DIR):
+    """ Returns a baseline as a dict with "page_url", "levels" (the 3 tag
+        lists), "fingerprint" (None if there isn't one), and "screenshot"
+        (the path of the screenshot file, or None if it's missing), from the
+        compact format or the "folders" format. Returns None if there isn't
+        a baseline. Raises an exception if the baseline file is corrupt,
+        so that it doesn't get replaced without a comparison. """
+    baseline_file = get_baseline_file(test_id, name, baseline_dir)
+    if os.path.exists(baseline_file):
+        try:
+            with gzip.open(baseline_file, "rb") as f:
+                data = json.loads(f.read().decode("utf-8"))
+            levels = data["levels"]
+        except Exception as e:
+            raise Exception(
+                "\nUnable to read the visual baseline: %s (%s)\n"
+                "Run with --visual_baseline to reset the baseline!" % (baseline_file, e)
+            )
+        screenshot_file = None
+        if data.get("screenshot"):
+            screenshot_file = os.path.join(os.path.dirname(baseline_file), data["screenshot"])
+            if not os.path.exists(screenshot_file):
+                screenshot_file = None
+        return {
+            "page_url": data["page_url"],
+            "levels": levels,
+            "fingerprint": data.get("fingerprint"),
+            "screenshot": screenshot_file,
+        }
+    return _load_legacy_baseline(get_legacy_baseline_folder(test_id, name, baseline_dir))
+
+
+def _find_legacy_screenshot(folder):
+    """ Returns the path of the screenshot of a baseline in the "folders"
+        format, in any image format, or None if there isn't one. (Prefers
+        the current SCREENSHOT_FORMAT, if there are several.) """
+    if not os.path.isdir(folder):
+        return None
+    screenshot_files = sorted(
+        os.path.join(folder, file_name)
+        for file_name in os.listdir(folder)
+        if file_name.startswith("screenshot.")
+        and os.path.splitext(file_name)[1].lower() in image_helper.IMAGE_EXTENSIONS
+    )
+    if not screenshot_files:
+        return None
+    current_file = os.path.join(folder, image_helper.get_screenshot_file_name("screenshot.png"))
+    if current_file in screenshot_files:
+        return current_file
+    return screenshot_files[0]
+
+
+def _load_legacy_baseline(folder):
+    file_names = ["page_url.txt", "tags_level_1.txt", "tags_level_2.txt", "tags_level_3.txt"]
+    file_paths = [os.path.join(folder, file_name) for file_name in file_names]
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            return None
+    contents = []
+    for file_path in file_paths:
+        with codecs.open(file_path, "r", encoding="utf-8") as f:
+            contents.append(f.read())
+    fingerprint = None
+    fingerprint_file = os.path.join(folder, "fingerprint.txt")
+    if os.path.exists(fingerprint_file):
+        with open(fingerprint_file, "r") as f:
+            fingerprint = json.loads(f.read())
+    return {
+        "page_url": contents[0].strip(),
+        "levels": [json.loads(content) for content in contents[1:]],
+        "fingerprint": fingerprint,
+        "screenshot": _find_legacy_screenshot(folder),
+    }
+
+
+def save_baseline(test_id, name, page_url, levels, fingerprint, png, baseline_dir=VISUAL_BASELINE_DIR):
+    """ Saves a baseline in the VISUAL_BASELINE_FORMAT. levels are the
+        (level_1, level_2, level_3) tag lists. fingerprint can be None.
+        png is a screenshot, which gets saved with the screenshot settings.
+        Returns the path of the baseline file (or folder). """
+    image_data, extension = image_helper.encode_screenshot(png)
+    if fingerprint:
+        fingerprint = dict((key, value) for key, value in fingerprint.items() if key != "details")
+    if str(settings.VISUAL_BASELINE_FORMAT).lower() == "folders":
+        folder = get_legacy_baseline_folder(test_id, name, baseline_dir)
+        _makedirs(folder)
+        shared_utils.write_file_atomically(os.path.join(folder, "screenshot.%s" % extension), image_data)
+        shared_utils.write_file_atomically(os.path.join(folder, "page_url.txt"), page_url)
+        for index, level_data in enumerate(levels):
+            level_file = os.path.join(folder, "tags_level_%s.txt" % (index + 1))
+            shared_utils.write_file_atomically(level_file, json.dumps(level_data))
+        fingerprint_file = os.path.join(folder, "fingerprint.txt")
+        if fingerprint:
+            shared_utils.write_file_atomically(fingerprint_file, json.dumps(fingerprint))
+        elif os.path.exists(fingerprint_file):
+            os.remove(fingerprint_file)
+        return folder
+    baseline_file = get_baseline_file(test_id, name, baseline_dir)
+    _makedirs(os.path.dirname(baseline_file))
+    screenshot_name = "%s.%s" % (name, extension)
+    screenshot_file = os.path.join(os.path.dirname(baseline_file), screenshot_name)
+    shared_utils.write_file_atomically(screenshot_file, image_data)
+    _write_baseline_file(baseline_file, test_id, name, page_url, levels, fingerprint, screenshot_name)
+    return baseline_file
+
+
+def _write_baseline_file(baseline_file, test_id, name, page_url, levels, fingerprint, screenshot_name):
+    data = {
+        "version": FORMAT_VERSION,
+        "test_id": test_id,
+        "name": name,
+        "page_url": page_url,
+        "screenshot": screenshot_name,
+        "levels": list(levels),
+        "fingerprint": fingerprint,
+    }
+    content = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    # (A fixed mtime in the gzip header keeps identical baselines identical)
+    output = io.BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=output, mtime=0) as f:
+        f.write(content)
+    shared_utils.write_file_atomically(baseline_file, output.getvalue())
+    baseline_dir = os.path.dirname(os.path.dirname(baseline_file))
+    _add_to_index(baseline_dir, _get_index_entry(baseline_dir, baseline_file, test_id, name, page_url))
+
+
+def _get_index_entry(baseline_dir, baseline_file, test_id, name, page_url):
+    return {
+        "test_id": test_id,
+        "name": name,
+        "file": os.path.relpath(baseline_file, baseline_dir).replace(os.sep, "/"),
+        "page_url": page_url,
+        "time": int(time.time()),
+    }
+
+
+def _add_to_index(baseline_dir, entry):
+    """ Appends an entry to the index. (Small appends are atomic, so
+        parallel test processes don't overwrite each other's entries.) """
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    index_path = os.path.join(baseline_dir, INDEX_FILE)
+    fd = os.open(index_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def list_baselines(baseline_dir=VISUAL_BASELINE_DIR):
+    """ Returns the index entries of the compact baselines (dicts with
+        "test_id", "name", "file", "page_url", and "time"), sorted by
+        test_id and name. The index gets rebuilt if it's missing. """
+    index_path = os.path.join(baseline_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        rebuild_index(baseline_dir)
+    entries = {}
+    with codecs.open(index_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # (A line from a process that was interrupted)
+            entries[(entry["test_id"], entry["name"])] = entry  # Latest wins
+    return [
+        entries[key]
+        for key in sorted(entries)
+        if os.path.exists(os.path.join(baseline_dir, entries[key]["file"]))
+    ]
+
+
+def rebuild_index(baseline_dir=VISUAL_BASELINE_DIR):
+    """ Rebuilds the index from the compact baseline files on disk. """
+    _makedirs(baseline_dir)
+    lines = []
+    for test_id in sorted(os.listdir(baseline_dir)):
+        test_folder = os.path.join(baseline_dir, test_id)
+        if not os.path.isdir(test_folder):
+            continue
+        for file_name in sorted(os.listdir(test_folder)):
+            if not file_name.endswith(BASELINE_EXTENSION):
+                continue
+            baseline_file = os.path.join(test_folder, file_name)
+            try:
+                with gzip.open(baseline_file, "rb") as f:
+                    data = json.loads(f.read().decode("utf-8"))
+            except Exception:
+                continue
+            entry = _get_index_entry(baseline_dir, baseline_file, test_id, data["name"], data["page_url"])
+            entry["time"] = int(os.path.getmtime(baseline_file))
+            lines.append(json.dumps(entry) + "\n")
+    shared_utils.write_file_atomically(os.path.join(baseline_dir, INDEX_FILE), "".join(lines))
+
+
+def migrate_baselines(baseline_dir=VISUAL_BASELINE_DIR, keep=False):
+    """ Converts the baselines in the "folders" format to the compact format.
+        The old folders get removed, unless keep is True.
+        Returns a list of the (test_id, name) of the converted baselines. """
+    migrated = []
+    if not os.path.isdir(baseline_dir):
+        return migrated
+    for test_id in sorted(os.listdir(baseline_dir)):
+        test_folder = os.path.join(baseline_dir, test_id)
+        if not os.path.isdir(test_folder):
+            continue
+        for name in sorted(os.listdir(test_folder)):
+            folder = os.path.join(test_folder, name)
+            if not os.path.isdir(folder):
+                continue
+            baseline = _load_legacy_baseline(folder)
+            if not baseline:
+                continue
+            screenshot_name = None
+            if baseline["screenshot"]:
+                extension = os.path.splitext(baseline["screenshot"])[1]
+                screenshot_name = name + extension
+                with open(baseline["screenshot"], "rb") as f:
+                    shared_utils.write_file_atomically(os.path.join(test_folder, screenshot_name), f.read())
+            _write_baseline_file(
+                get_baseline_file(test_id, name, baseline_dir),
+                test_id,
+                name,
+                baseline["page_url"],
+                baseline["levels"],
+                baseline["fingerprint"],
+                screenshot_name,
+            )
+            if not keep:
+                shutil.rmtree(folder)
+            migrated.append((test_id, name))
+    return migrated
@@ -22,6 +22,7 @@ Page elements are given enough time to load before WebDriver acts on them.
 Code becomes greatly simplified and easier to maintain.
 """
 
+import base64
 import codecs
 import json
 import logging
@@ -48,12 +49,15 @@ from seleniumbase.common import decorators
 from seleniumbase.config import settings
 from seleniumbase.core.testcase_manager import TestcaseDataPayload
 from seleniumbase.core.testcase_manager import TestcaseManager
+from seleniumbase.core import artifact_writer
 from seleniumbase.core import download_helper
+from seleniumbase.core import image_helper
 from seleniumbase.core import log_helper
 from seleniumbase.core import settings_parser
 from seleniumbase.core import tour_helper
 from seleniumbase.core import visual_helper
 from seleniumbase.fixtures import constants
+from seleniumbase.fixtures import element_cache
 from seleniumbase.fixtures import js_utils
 from seleniumbase.fixtures import page_actions
 from seleniumbase.fixtures import page_utils
@@ -83,6 +87,8 @@ class BaseCase(unittest.TestCase):
         self.__last_page_load_url = "data:,"
         self.__last_page_screenshot = None
         self.__last_page_screenshot_png = None
+        self.__screenshot_log_path = None
+        self.__soup_cache = shared_utils.LRUCache(max_size=4)
         self.__last_page_url = None
         self.__last_page_source = None
         self.__added_pytest_html_extra = None
@@ -91,19 +97,26 @@ class BaseCase(unittest.TestCase):
         self.__device_width = None
         self.__device_height = None
         self.__device_pixel_ratio = None
+        self.__window_key = None
+        self.__frame_path = ()
+        self.__document_count = 0
+        self.__pooled_driver = None
         # Requires self._* instead of self.__* for external class use
         self._html_report_extra = []  # (Used by pytest_plugin.py)
         self._default_driver = None
         self._drivers_list = []
         self._tour_steps = {}
+        self._element_cache = element_cache.ElementCache()
 
     def open(self, url):
         """ Navigates the current browser window to the specified page. """
         self.__last_page_load_url = None
+        self.__document_count += 1
         if url.startswith("://"):
             # Convert URLs such as "://google.com" into "https://google.com"
             url = "https" + url
         self.driver.get(url)
+        page_actions.add_visited_origin(self.driver, url)
         if settings.WAIT_FOR_RSC_ON_PAGE_LOADS:
             self.wait_for_ready_state_complete()
         self.__demo_mode_pause_if_active()
@@ -136,7 +149,7 @@ class BaseCase(unittest.TestCase):
                 # Handle a special case of partial links hidden in dropdowns
                 self.click_partial_link_text(selector, timeout=timeout)
                 return
-        element = page_actions.wait_for_element_visible(self.driver, selector, by, timeout=timeout)
+        element = self.__wait_for_element_visible(selector, by, timeout)
         self.__demo_mode_highlight_if_active(selector, by)
         if not self.demo_mode:
             self.__scroll_to_element(element, selector, by)
@@ -156,9 +169,10 @@ class BaseCase(unittest.TestCase):
                 # Normal click
                 element.click()
         except (StaleElementReferenceException, ENI_Exception):
+            self.__forget_element(selector, by)
             self.wait_for_ready_state_complete()
             time.sleep(0.05)
-            element = page_actions.wait_for_element_visible(self.driver, selector, by, timeout=timeout)
+            element = self.__wait_for_element_visible(selector, by, timeout)
             if self.browser == "safari":
                 if by == By.LINK_TEXT:
                     self.__jquery_click(selector, by=by)
@@ -167,6 +181,7 @@ class BaseCase(unittest.TestCase):
             else:
                 element.click()
         except (WebDriverException, MoveTargetOutOfBoundsException):
+            self.__forget_element(selector, by)
             self.wait_for_ready_state_complete()
             try:
                 self.__js_click(selector, by=by)
@@ -180,7 +195,7 @@ class BaseCase(unittest.TestCase):
                     )
                     element.click()
         if settings.WAIT_FOR_RSC_ON_CLICKS:
-            self.wait_for_ready_state_complete()
+            self.__wait_for_ready_state_after_click(pre_action_url)
         if self.demo_mode:
             if self.driver.current_url != pre_action_url:
                 self.__demo_mode_pause_if_active()
@@ -230,7 +245,7 @@ class BaseCase(unittest.TestCase):
             actions = ActionChains(self.driver)
             actions.double_click(element).perform()
         if settings.WAIT_FOR_RSC_ON_CLICKS:
-            self.wait_for_ready_state_complete()
+            self.__wait_for_ready_state_after_click(pre_action_url)
         if self.demo_mode:
             if self.driver.current_url != pre_action_url:
                 self.__demo_mode_pause_if_active()
@@ -271,16 +286,17 @@ class BaseCase(unittest.TestCase):
         if self.timeout_multiplier and timeout == settings.LARGE_TIMEOUT:
             timeout = self.__get_new_timeout(timeout)
         selector, by = self.__recalculate_selector(selector, by)
-        element = self.wait_for_element_visible(selector, by=by, timeout=timeout)
+        element = self.__wait_for_element_visible(selector, by, timeout)
         self.__demo_mode_highlight_if_active(selector, by)
         if not self.demo_mode:
             self.__scroll_to_element(element, selector, by)
         try:
             element.clear()
         except (StaleElementReferenceException, ENI_Exception):
+            self.__forget_element(selector, by)
             self.wait_for_ready_state_complete()
             time.sleep(0.06)
-            element = self.wait_for_element_visible(selector, by=by, timeout=timeout)
+            element = self.__wait_for_element_visible(selector, by, timeout)
             try:
                 element.clear()
             except Exception:
@@ -303,9 +319,10 @@ class BaseCase(unittest.TestCase):
                 if settings.WAIT_FOR_RSC_ON_PAGE_LOADS:
                     self.wait_for_ready_state_complete()
         except (StaleElementReferenceException, ENI_Exception):
+            self.__forget_element(selector, by)
             self.wait_for_ready_state_complete()
             time.sleep(0.06)
-            element = self.wait_for_element_visible(selector, by=by, timeout=timeout)
+            element = self.__wait_for_element_visible(selector, by, timeout)
             element.clear()
             if not new_value.endswith("\n"):
                 element.send_keys(new_value)
@@ -337,7 +354,7 @@ class BaseCase(unittest.TestCase):
         if self.timeout_multiplier and timeout == settings.LARGE_TIMEOUT:
             timeout = self.__get_new_timeout(timeout)
         selector, by = self.__recalculate_selector(selector, by)
-        element = self.wait_for_element_visible(selector, by=by, timeout=timeout)
+        element = self.__wait_for_element_visible(selector, by, timeout)
         self.__demo_mode_highlight_if_active(selector, by)
         if not self.demo_mode:
             self.__scroll_to_element(element, selector, by)
@@ -352,9 +369,10 @@ class BaseCase(unittest.TestCase):
                 if settings.WAIT_FOR_RSC_ON_PAGE_LOADS:
                     self.wait_for_ready_state_complete()
         except (StaleElementReferenceException, ENI_Exception):
+            self.__forget_element(selector, by)
             self.wait_for_ready_state_complete()
             time.sleep(0.06)
-            element = self.wait_for_element_visible(selector, by=by, timeout=timeout)
+            element = self.__wait_for_element_visible(selector, by, timeout)
             if not text.endswith("\n"):
                 element.send_keys(text)
             else:
@@ -383,6 +401,7 @@ class BaseCase(unittest.TestCase):
 
     def refresh_page(self):
         self.__last_page_load_url = None
+        self.__document_count += 1
         self.driver.refresh()
         self.wait_for_ready_state_complete()
 
@@ -417,6 +436,7 @@ class BaseCase(unittest.TestCase):
 
     def go_back(self):
         self.__last_page_load_url = None
+        self.__document_count += 1
         self.driver.back()
         if self.browser == "safari":
             self.driver.refresh()
@@ -425,6 +445,7 @@ class BaseCase(unittest.TestCase):
 
     def go_forward(self):
         self.__last_page_load_url = None
+        self.__document_count += 1
         self.driver.forward()
         if self.browser == "safari":
             self.driver.refresh()
@@ -459,7 +480,7 @@ class BaseCase(unittest.TestCase):
         """ Returns True if the link text appears in the HTML of the page.
             The element doesn't need to be visible,
             such as elements hidden inside a dropdown selection. """
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         html_links = soup.find_all("a")
         for html_link in html_links:
             if html_link.text.strip() == link_text.strip():
@@ -470,7 +491,7 @@ class BaseCase(unittest.TestCase):
         """ Returns True if the partial link appears in the HTML of the page.
             The element doesn't need to be visible,
             such as elements hidden inside a dropdown selection. """
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         html_links = soup.find_all("a")
         for html_link in html_links:
             if link_text.strip() in html_link.text.strip():
@@ -481,7 +502,7 @@ class BaseCase(unittest.TestCase):
         """ Finds a link by link text and then returns the attribute's value.
             If the link text or attribute cannot be found, an exception will
             get raised if hard_fail is True (otherwise None is returned). """
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         html_links = soup.find_all("a")
         for html_link in html_links:
             if html_link.text.strip() == link_text.strip():
@@ -511,7 +532,7 @@ class BaseCase(unittest.TestCase):
             value. If the partial link text or attribute cannot be found, an
             exception will get raised if hard_fail is True (otherwise None
             is returned). """
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         html_links = soup.find_all("a")
         for html_link in html_links:
             if link_text.strip() in html_link.text.strip():
@@ -600,7 +621,7 @@ class BaseCase(unittest.TestCase):
                 element.click()
 
         if settings.WAIT_FOR_RSC_ON_CLICKS:
-            self.wait_for_ready_state_complete()
+            self.__wait_for_ready_state_after_click(pre_action_url)
         if self.demo_mode:
             if self.driver.current_url != pre_action_url:
                 self.__demo_mode_pause_if_active()
@@ -621,7 +642,7 @@ class BaseCase(unittest.TestCase):
                 element = self.wait_for_partial_link_text(partial_link_text)
                 element.click()
                 return
-            soup = self.get_beautiful_soup()
+            soup = self.__get_parsed_page()
             html_links = soup.fetch("a")
             for html_link in html_links:
                 if partial_link_text in html_link.text:
@@ -693,7 +714,7 @@ class BaseCase(unittest.TestCase):
                 element.click()
 
         if settings.WAIT_FOR_RSC_ON_CLICKS:
-            self.wait_for_ready_state_complete()
+            self.__wait_for_ready_state_after_click(pre_action_url)
         if self.demo_mode:
             if self.driver.current_url != pre_action_url:
                 self.__demo_mode_pause_if_active()
@@ -1057,7 +1078,7 @@ class BaseCase(unittest.TestCase):
         selector, by = self.__recalculate_selector(selector, by)
         if self.is_element_present(selector, by=by):
             return False
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         iframe_list = soup.select("iframe")
         for iframe in iframe_list:
             iframe_identifier = None
@@ -1085,7 +1106,7 @@ class BaseCase(unittest.TestCase):
         selector, by = self.__recalculate_selector(selector, by)
         if self.is_element_present(selector, by=by):
             return None
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         iframe_list = soup.select("iframe")
         for iframe in iframe_list:
             iframe_identifier = None
@@ -1257,7 +1278,7 @@ class BaseCase(unittest.TestCase):
             else:
                 Select(element).select_by_visible_text(option)
         if settings.WAIT_FOR_RSC_ON_CLICKS:
-            self.wait_for_ready_state_complete()
+            self.__wait_for_ready_state_after_click(pre_action_url)
         if self.demo_mode:
             if self.driver.current_url != pre_action_url:
                 self.__demo_mode_pause_if_active()
@@ -1310,11 +1331,12 @@ class BaseCase(unittest.TestCase):
             If new_page==True, the page will switch to: "data:text/html,"
             If new_page==False, will load HTML into the current page. """
 
-        soup = self.get_beautiful_soup(html_string)
+        soup = self.get_beautiful_soup(html_string, parser="html.parser")
         scripts = soup.findAll("script")
         for script in scripts:
             html_string = html_string.replace(str(script), "")
-        soup = self.get_beautiful_soup(html_string)
+        # (Other parsers, such as lxml, add <head> and <body> tags if missing)
+        soup = self.get_beautiful_soup(html_string, parser="html.parser")
 
         found_head = False
         found_body = False
@@ -1438,6 +1460,7 @@ class BaseCase(unittest.TestCase):
         if self.timeout_multiplier and timeout == settings.SMALL_TIMEOUT:
             timeout = self.__get_new_timeout(timeout)
         page_actions.switch_to_frame(self.driver, frame, timeout)
+        self.__frame_path += (str(frame),)
 
     def switch_to_default_content(self):
         """ Brings driver control outside the current iframe.
@@ -1445,6 +1468,7 @@ class BaseCase(unittest.TestCase):
             will be set to one level above the current frame. If the driver
             control is not currenly in an iframe, nothing will happen.) """
         self.driver.switch_to.default_content()
+        self.__frame_path = ()
 
     def open_new_window(self, switch_to=True):
         """ Opens a new browser tab/window and switches to it by default. """
@@ -1459,6 +1483,8 @@ class BaseCase(unittest.TestCase):
         if self.timeout_multiplier and timeout == settings.SMALL_TIMEOUT:
             timeout = self.__get_new_timeout(timeout)
         page_actions.switch_to_window(self.driver, window, timeout)
+        self.__window_key = window
+        self.__frame_path = ()
 
     def switch_to_default_window(self):
         self.switch_to_window(0)
@@ -1694,7 +1720,9 @@ class BaseCase(unittest.TestCase):
         self.driver = self._default_driver
 
     def save_screenshot(self, name, folder=None):
-        """ The screenshot will be in PNG format. """
+        """ The screenshot will be in PNG format, unless the screenshot
+            format was changed. (Eg: "--screenshot-format=jpeg")
+            Returns the path of the saved screenshot. """
         return page_actions.save_screenshot(self.driver, name, folder)
 
     def save_page_source(self, name, folder=None):
@@ -1756,6 +1784,19 @@ class BaseCase(unittest.TestCase):
             Does NOT delete the saved cookies file. """
         self.driver.delete_all_cookies()
 
+    def reset_browser_state(self):
+        """ Returns the browser to a clean state without relaunching it.
+            Closes all extra windows, deletes all cookies, clears all
+            storage (localStorage, sessionStorage, IndexedDB, Cache Storage,
+            and service workers), and then opens a blank page.
+            On Chromium browsers, this uses CDP to clear the data of every
+            origin that was opened with self.open() in this browser. """
+        page_actions.reset_browser_state(self.driver)
+        self.__last_page_load_url = "data:,"
+        self.__window_key = None
+        self.__frame_path = ()
+        self.__document_count += 1
+
     def delete_saved_cookies(self, name="cookies.txt"):
         """ Deletes the cookies file from the "saved_cookies" folder.
             Does NOT delete the cookies from the web browser. """
@@ -1787,8 +1828,15 @@ class BaseCase(unittest.TestCase):
             timeout = settings.EXTREME_TIMEOUT
         if self.timeout_multiplier and timeout == settings.EXTREME_TIMEOUT:
             timeout = self.__get_new_timeout(timeout)
-        is_ready = js_utils.wait_for_ready_state_complete(self.driver, timeout)
-        self.wait_for_angularjs(timeout=settings.MINI_TIMEOUT)
+        is_ready = False
+        if self.wait_strategy == constants.WaitStrategy.NETWORK_IDLE:
+            # Covers AJAX calls from AngularJS apps too
+            is_ready = js_utils.wait_for_network_idle(
+                self.driver, settings.NETWORK_IDLE_TIME, min(timeout, settings.SMALL_TIMEOUT)
+            )
+        if not is_ready:
+            is_ready = js_utils.wait_for_ready_state_complete(self.driver, timeout)
+            self.wait_for_angularjs(timeout=settings.MINI_TIMEOUT)
         if self.js_checking_on:
             self.assert_no_js_errors()
         if self.ad_block_on:
@@ -1804,6 +1852,23 @@ class BaseCase(unittest.TestCase):
                 self.__last_page_load_url = current_url
         return is_ready
 
+    def __wait_for_ready_state_after_click(self, pre_action_url):
+        """ With the "ready_state" wait strategy, skips the readyState check
+            if the click didn't change the URL. (No new page was loaded.) """
+        if self.wait_strategy != constants.WaitStrategy.READY_STATE:
+            self.wait_for_ready_state_complete()
+            return
+        try:
+            url_changed = self.driver.current_url != pre_action_url
+        except Exception:
+            url_changed = True  # Such as an alert being open
+        if url_changed:
+            self.wait_for_ready_state_complete()
+            return
+        self.wait_for_angularjs(timeout=settings.MINI_TIMEOUT)
+        if self.js_checking_on:
+            self.assert_no_js_errors()
+
     def wait_for_angularjs(self, timeout=None, **kwargs):
         if not timeout:
             timeout = settings.LARGE_TIMEOUT
@@ -2205,23 +2270,39 @@ class BaseCase(unittest.TestCase):
     def get_domain_url(self, url):
         return page_utils.get_domain_url(url)
 
-    def get_beautiful_soup(self, source=None):
+    def get_beautiful_soup(self, source=None, parser=None):
         """ BeautifulSoup is a toolkit for dissecting an HTML document
-            and extracting what you need. It's great for screen-scraping! """
-        from bs4 import BeautifulSoup
+            and extracting what you need. It's great for screen-scraping!
+            The parser is settings.HTML_PARSER unless one is given.
+            (Returns a new tree each time, which can be modified.) """
+        if not source:
+            self.wait_for_ready_state_complete()
+            source = self.get_page_source()
+        return page_utils._get_beautiful_soup(source, parser=parser)
 
+    def __get_parsed_page(self, source=None):
+        """ Returns the parsed page source, for methods that only read it.
+            If CACHE_PARSED_PAGES is True, parsing the same page source again
+            returns the tree from before. (The tree is shared, so don't
+            modify it, and don't return it from public methods.) """
         if not source:
             self.wait_for_ready_state_complete()
             source = self.get_page_source()
-        soup = BeautifulSoup(source, "html.parser")
-        return soup
+        soup_cache = None
+        if settings.CACHE_PARSED_PAGES:
+            soup_cache = self.__soup_cache
+        return page_utils._get_beautiful_soup(source, cache=soup_cache)
 
     def get_unique_links(self):
         """ Get all unique links in the html of the page source.
             Page links include those obtained from:
             "a"->"href", "img"->"src", "link"->"href", and "script"->"src". """
         page_url = self.get_current_url()
-        soup = self.get_beautiful_soup(self.get_page_source())
+        if settings.GET_LINKS_WITH_JS:
+            if not page_url.startswith("http://") and (not page_url.startswith("https://")):
+                return []
+            return js_utils.get_unique_links(self.driver)
+        soup = self.__get_parsed_page(self.get_page_source())
         links = page_utils._get_unique_links(page_url, soup)
         return links
 
@@ -2240,19 +2321,19 @@ class BaseCase(unittest.TestCase):
 
     def assert_no_404_errors(self, multithreaded=True):
         """ Assert no 404 errors from page links obtained from:
-            "a"->"href", "img"->"src", "link"->"href", and "script"->"src". """
+            "a"->"href", "img"->"src", "link"->"href", and "script"->"src".
+            Links are checked concurrently, with connections reused per host.
+            Status codes are cached between tests. (See LINK_CHECK_CACHE_TTL) """
         all_links = self.get_unique_links()
         links = []
         for link in all_links:
             if "javascript:" not in link and "mailto:" not in link:
                 links.append(link)
         if multithreaded:
-            from multiprocessing.dummy import Pool as ThreadPool
-
-            pool = ThreadPool(10)
-            pool.map(self.assert_link_status_code_is_not_404, links)
-            pool.close()
-            pool.join()
+            status_codes = page_utils._get_link_status_codes(links)
+            for link, status_code in zip(links, status_codes):
+                bad_link_str = 'Error: "%s" returned a 404!' % link
+                self.assertNotEqual(str(status_code), "404", bad_link_str)
         else:
             for link in links:
                 self.assert_link_status_code_is_not_404(link)
@@ -2266,9 +2347,8 @@ class BaseCase(unittest.TestCase):
             Format:  ["link"  ->  "status_code"]  (per line)
             Page links include those obtained from:
             "a"->"href", "img"->"src", "link"->"href", and "script"->"src". """
-        page_url = self.get_current_url()
-        soup = self.get_beautiful_soup(self.get_page_source())
-        page_utils._print_unique_links_with_status_codes(page_url, soup)
+        links = self.get_unique_links()
+        page_utils._print_links_with_status_codes(links)
 
     def __fix_unicode_conversion(self, text):
         """ Fixing Chinese characters when converting from PDF to HTML. """
@@ -3682,6 +3762,31 @@ class BaseCase(unittest.TestCase):
         self.assert_element(selector, by=by, timeout=timeout)
         return True
 
+    def wait_for_any_element_visible(self, selectors, by=By.CSS_SELECTOR, timeout=None):
+        """ Waits for any of the selectors in the list to be visible.
+            All of them are checked together with one WebDriver call per poll.
+            Useful for waiting on one of several possible outcomes, such as a
+            success banner, an error message, or a redirect to a new page.
+            Returns the first selector from the list that's visible. """
+        if not timeout:
+            timeout = settings.LARGE_TIMEOUT
+        if self.timeout_multiplier and timeout == settings.LARGE_TIMEOUT:
+            timeout = self.__get_new_timeout(timeout)
+        locators = [self.__recalculate_selector(selector, by) for selector in selectors]
+        index = page_actions.wait_for_any_element_visible(self.driver, locators, timeout)
+        return selectors[index]
+
+    def wait_for_all_elements_visible(self, selectors, by=By.CSS_SELECTOR, timeout=None):
+        """ Waits for all of the selectors in the list to be visible.
+            All of them are checked together with one WebDriver call per poll.
+            Returns the list of elements (in the same order as selectors). """
+        if not timeout:
+            timeout = settings.LARGE_TIMEOUT
+        if self.timeout_multiplier and timeout == settings.LARGE_TIMEOUT:
+            timeout = self.__get_new_timeout(timeout)
+        locators = [self.__recalculate_selector(selector, by) for selector in selectors]
+        return page_actions.wait_for_all_elements_visible(self.driver, locators, timeout)
+
     ############
 
     def wait_for_text_visible(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
@@ -3690,6 +3795,14 @@ class BaseCase(unittest.TestCase):
         if self.timeout_multiplier and timeout == settings.LARGE_TIMEOUT:
             timeout = self.__get_new_timeout(timeout)
         selector, by = self.__recalculate_selector(selector, by)
+        if settings.CACHE_ELEMENT_LOOKUPS:
+            key = self.__get_element_cache_key(selector, by)
+            element = self._element_cache.get_visible_element(key)
+            try:
+                if element and text in element.text:
+                    return element
+            except Exception:
+                self._element_cache.remove(key)
         return page_actions.wait_for_text_visible(self.driver, text, selector, by, timeout)
 
     def wait_for_exact_text_visible(self, text, selector="html", by=By.CSS_SELECTOR, timeout=None):
@@ -3988,7 +4101,7 @@ class BaseCase(unittest.TestCase):
         if minified_exception:
             raise Exception(minified_exception)
 
-    def check_window(self, name="default", level=0, baseline=False):
+    def check_window(self, name="default", level=0, baseline=False, masks=None):
         """ ***  Automated Visual Testing with SeleniumBase  ***
 
             The first time a test calls self.check_window() for a unique "name"
@@ -3999,6 +4112,8 @@ class BaseCase(unittest.TestCase):
             tags_level1.txt  ->  HTML tags from the window
             tags_level2.txt  ->  HTML tags + attributes from the window
             tags_level3.txt  ->  HTML tags + attributes/values from the window
+            (Plus fingerprint.txt, which has hashes of the DOM, so that
+             unchanged pages are detected by comparing a single hash.)
 
             Baseline folders are named based on the test name and the name
             parameter passed to self.check_window(). The same test can store
@@ -4022,7 +4137,20 @@ class BaseCase(unittest.TestCase):
                 HTML tags are compared to tags_level1.txt and
                 HTML tags + attributes are compared to tags_level2.txt and
                 HTML tags + attributes/values are compared to tags_level3.txt
-            As shown, Level-3 is the most strict, Level-1 is the least strict.
+            * level=4 ->
+                Level-3 comparisons, plus the screenshot is compared to the
+                baseline screenshot, pixel by pixel. (Requires Pillow)
+                A pixel is different if a color channel differs by more than
+                PIXEL_DIFF_TOLERANCE, and the test fails if the ratio of
+                different pixels is above PIXEL_DIFF_MAX_RATIO. (settings.py)
+                Use "masks" to ignore rectangles with dynamic content:
+                masks=[(x, y, width, height), ...] (In page coordinates:
+                CSS pixels of the visible page, as from getBoundingClientRect.
+                They're scaled to the screenshot for devicePixelRatio and
+                SCREENSHOT_MAX_SIZE.)
+                If the screenshots don't match, an image with the different
+                pixels in red is saved to the logs.
+            As shown, Level-4 is the most strict, Level-1 is the least strict.
             If the comparisons from the latest window to the existing baseline
             don't match, the current test will fail, except for Level-0 tests.
 
@@ -4064,8 +4192,10 @@ class BaseCase(unittest.TestCase):
             level = 2
         if level == "3":
             level = 3
-        if level != 0 and level != 1 and level != 2 and level != 3:
-            raise Exception('Parameter "level" must be set to 0, 1, 2, or 3!')
+        if level == "4":
+            level = 4
+        if level != 0 and level != 1 and level != 2 and level != 3 and level != 4:
+            raise Exception('Parameter "level" must be set to 0, 1, 2, 3, or 4!')
 
         if self.demo_mode:
             raise Exception(
@@ -4083,72 +4213,41 @@ class BaseCase(unittest.TestCase):
             name = "default"
         name = str(name)
         visual_helper.visual_baseline_folder_setup()
-        baseline_dir = constants.VisualBaseline.STORAGE_FOLDER
-        visual_baseline_path = baseline_dir + "/" + test_id + "/" + name
-        page_url_file = visual_baseline_path + "/page_url.txt"
-        screenshot_file = visual_baseline_path + "/screenshot.png"
-        level_1_file = visual_baseline_path + "/tags_level_1.txt"
-        level_2_file = visual_baseline_path + "/tags_level_2.txt"
-        level_3_file = visual_baseline_path + "/tags_level_3.txt"
-
-        set_baseline = False
-        if baseline or self.visual_baseline:
-            set_baseline = True
-        if not os.path.exists(visual_baseline_path):
-            set_baseline = True
-            try:
-                os.makedirs(visual_baseline_path)
-            except Exception:
-                pass  # Only reachable during multi-threaded test runs
-        if not os.path.exists(page_url_file):
-            set_baseline = True
-        if not os.path.exists(screenshot_file):
-            set_baseline = True
-        if not os.path.exists(level_1_file):
-            set_baseline = True
-        if not os.path.exists(level_2_file):
-            set_baseline = True
-        if not os.path.exists(level_3_file):
-            set_baseline = True
+        baseline_data = None
+        if not (baseline or self.visual_baseline):
+            baseline_data = visual_helper.load_baseline(test_id, name)
+        set_baseline = not baseline_data
+
+        # Baselines are checked the way that they were saved: With a DOM
+        # fingerprint, or with BeautifulSoup. (For older baselines, or with
+        # CHECK_WINDOW_WITH_JS = False.) The tag lists have different formats.
+        use_fingerprint = settings.CHECK_WINDOW_WITH_JS
+        if not set_baseline:
+            use_fingerprint = bool(baseline_data["fingerprint"])
+        fingerprint = None
+        if use_fingerprint:
+            details = None
+            if set_baseline:
+                details = True
+            fingerprint = js_utils.get_dom_fingerprint(self.driver, details)
 
         page_url = self.get_current_url()
-        soup = self.get_beautiful_soup()
-        html_tags = soup.body.find_all()
-        level_1 = [[tag.name] for tag in html_tags]
-        level_1 = json.loads(json.dumps(level_1))  # Tuples become lists
-        level_2 = [[tag.name, sorted(tag.attrs.keys())] for tag in html_tags]
-        level_2 = json.loads(json.dumps(level_2))  # Tuples become lists
-        level_3 = [[tag.name, sorted(tag.attrs.items())] for tag in html_tags]
-        level_3 = json.loads(json.dumps(level_3))  # Tuples become lists
-
         if set_baseline:
-            self.save_screenshot("screenshot.png", visual_baseline_path)
-            out_file = codecs.open(page_url_file, "w+")
-            out_file.writelines(page_url)
-            out_file.close()
-            out_file = codecs.open(level_1_file, "w+")
-            out_file.writelines(json.dumps(level_1))
-            out_file.close()
-            out_file = codecs.open(level_2_file, "w+")
-            out_file.writelines(json.dumps(level_2))
-            out_file.close()
-            out_file = codecs.open(level_3_file, "w+")
-            out_file.writelines(json.dumps(level_3))
-            out_file.close()
+            if fingerprint:
+                level_1, level_2, level_3 = visual_helper.get_level_data(fingerprint)
+            else:
+                level_1, level_2, level_3 = self.__get_window_level_data()
+            visual_helper.save_baseline(
+                test_id,
+                name,
+                page_url,
+                (level_1, level_2, level_3),
+                fingerprint,
+                page_actions.get_screenshot_png(self.driver),
+            )
 
         if not set_baseline:
-            f = open(page_url_file, "r")
-            page_url_data = f.read().strip()
-            f.close()
-            f = open(level_1_file, "r")
-            level_1_data = json.loads(f.read())
-            f.close()
-            f = open(level_2_file, "r")
-            level_2_data = json.loads(f.read())
-            f.close()
-            f = open(level_3_file, "r")
-            level_3_data = json.loads(f.read())
-            f.close()
+            page_url_data = baseline_data["page_url"]
 
             domain_fail = (
                 "\nPage Domain Mismatch Failure: "
@@ -4174,7 +4273,42 @@ class BaseCase(unittest.TestCase):
             if level != 0:
                 self.assertEqual(page_data_domain, page_domain, domain_fail)
             unittest.TestCase.maxDiff = None
-            if level == 3:
+            if level == 4:
+                self.__check_window_screenshot(name, baseline_data["screenshot"], masks)
+
+            # Level 0 (the dry run) and Level 4 compare the same data as Level 3
+            compare_level = level or 3
+            if level == 4:
+                compare_level = 3
+            changed_subtrees = None
+            if fingerprint:
+                baseline_fingerprint = baseline_data["fingerprint"]
+                index = compare_level - 1
+                if fingerprint["hashes"][index] == baseline_fingerprint["hashes"][index]:
+                    if level != 0 or page_domain == page_data_domain:
+                        return  # The page matches the baseline (Same DOM hash)
+                changed_subtrees = visual_helper.get_changed_subtrees(
+                    fingerprint, baseline_fingerprint, compare_level
+                )
+                # Only get the tag lists of subtrees that don't match
+                details = changed_subtrees
+                if changed_subtrees is None:
+                    details = True
+                fingerprint = js_utils.get_dom_fingerprint(self.driver, details)
+                level_1, level_2, level_3 = visual_helper.get_level_data(fingerprint)
+            else:
+                # (If the fingerprint failed, match the fingerprint's format)
+                level_1, level_2, level_3 = self.__get_window_level_data(
+                    join_values=bool(baseline_data["fingerprint"])
+                )
+
+            level_1_data, level_2_data, level_3_data = baseline_data["levels"]
+            if changed_subtrees is not None:
+                level_1_data = visual_helper.get_subtree_data(level_1_data, baseline_fingerprint, changed_subtrees)
+                level_2_data = visual_helper.get_subtree_data(level_2_data, baseline_fingerprint, changed_subtrees)
+                level_3_data = visual_helper.get_subtree_data(level_3_data, baseline_fingerprint, changed_subtrees)
+
+            if level == 3 or level == 4:
                 self.__assert_eq(level_3_data, level_3, level_3_failure)
             if level == 2:
                 self.__assert_eq(level_2_data, level_2, level_2_failure)
@@ -4191,6 +4325,72 @@ class BaseCase(unittest.TestCase):
                 except Exception as e:
                     print(e)  # Level-0 Dry Run (Only print the differences)
 
+    def __check_window_screenshot(self, name, screenshot_file, masks):
+        """ Level 4 of check_window(): Compares a new screenshot of the page
+            to the baseline screenshot, pixel by pixel. """
+        if not image_helper.get_pil_image_module():
+            raise Exception('check_window() with level=4 requires Pillow! ("pip install Pillow")')
+        if not screenshot_file:
+            raise Exception(
+                "\n*\n*** Exception: <Level 4> Visual Diff Failure:\n"
+                "* The baseline doesn't have a screenshot! "
+                "Run with --visual_baseline to reset the baseline!"
+            )
+        with open(screenshot_file, "rb") as f:
+            baseline_data = f.read()
+        # Use the same format and size as the baseline screenshot
+        image_data = image_helper.encode_screenshot(page_actions.get_screenshot_png(self.driver))[0]
+        if masks:
+            pixel_ratio = self.execute_script("return window.devicePixelRatio;")
+            masks = image_helper.scale_masks(masks, image_data, pixel_ratio)
+        result = image_helper.compare_images(
+            baseline_data,
+            image_data,
+            tolerance=settings.PIXEL_DIFF_TOLERANCE,
+            max_ratio=settings.PIXEL_DIFF_MAX_RATIO,
+            masks=masks,
+        )
+        if result["matches"]:
+            return
+        level_4_failure = "\n*\n*** Exception: <Level 4> Visual Diff Failure:\n"
+        if result["size"] != result["baseline_size"]:
+            level_4_failure += "* The screenshot size (%sx%s) doesn't match the baseline (%sx%s)!" % (
+                result["size"] + result["baseline_size"]
+            )
+            raise Exception(level_4_failure)
+        test_logpath = self.log_path + "/" + self.__get_test_id()
+        self.__create_log_path_as_needed(test_logpath)
+        diff_file = os.path.abspath("%s/%s_diff.png" % (test_logpath, name))
+        with open(diff_file, "wb") as f:
+            f.write(result["diff_png"])
+        level_4_failure += "* %.2f%% of the screenshot pixels don't match the baseline! (Max: %s%%)\n" % (
+            result["ratio"] * 100,
+            settings.PIXEL_DIFF_MAX_RATIO * 100,
+        )
+        level_4_failure += "* Diff image: %s" % diff_file
+        raise Exception(level_4_failure)
+
+    def __get_window_level_data(self, join_values=False):
+        """ Returns the (level_1, level_2, level_3) tag lists of the page
+            for check_window(), from the parsed page source.
+            BeautifulSoup splits multi-valued attributes (such as "class")
+            into lists. With join_values, they're joined into one string,
+            like in the tag lists of DOM fingerprints. """
+        soup = self.__get_parsed_page()
+        html_tags = soup.body.find_all()
+        level_1 = [[tag.name] for tag in html_tags]
+        level_1 = json.loads(json.dumps(level_1))  # Tuples become lists
+        level_2 = [[tag.name, sorted(tag.attrs.keys())] for tag in html_tags]
+        level_2 = json.loads(json.dumps(level_2))  # Tuples become lists
+        level_3 = []
+        for tag in html_tags:
+            attrs = tag.attrs.items()
+            if join_values:
+                attrs = [(key, " ".join(value) if isinstance(value, list) else value) for key, value in attrs]
+            level_3.append([tag.name, sorted(attrs)])
+        level_3 = json.loads(json.dumps(level_3))  # Tuples become lists
+        return level_1, level_2, level_3
+
     ############
 
     def __get_new_timeout(self, timeout):
@@ -4396,7 +4596,7 @@ class BaseCase(unittest.TestCase):
 
     def __click_dropdown_link_text(self, link_text, link_css):
         """ When a link may be hidden under a dropdown menu, use this. """
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         drop_down_list = []
         for item in soup.select("li[class]"):
             drop_down_list.append(item)
@@ -4449,7 +4649,7 @@ class BaseCase(unittest.TestCase):
 
     def __click_dropdown_partial_link_text(self, link_text, link_css):
         """ When a partial link may be hidden under a dropdown, use this. """
-        soup = self.get_beautiful_soup()
+        soup = self.__get_parsed_page()
         drop_down_list = []
         for item in soup.select("li[class]"):
             drop_down_list.append(item)
@@ -4486,20 +4686,36 @@ class BaseCase(unittest.TestCase):
         return False
 
     def __recalculate_selector(self, selector, by):
-        # Try to determine the type of selector automatically
-        if page_utils.is_xpath_selector(selector):
-            by = By.XPATH
-        if page_utils.is_link_text_selector(selector):
-            selector = page_utils.get_link_text_from_selector(selector)
-            by = By.LINK_TEXT
-        if page_utils.is_partial_link_text_selector(selector):
-            selector = page_utils.get_partial_link_text_from_selector(selector)
-            by = By.PARTIAL_LINK_TEXT
-        if page_utils.is_name_selector(selector):
-            name = page_utils.get_name_from_selector(selector)
-            selector = '[name="%s"]' % name
-            by = By.CSS_SELECTOR
-        return (selector, by)
+        # Try to determine the type of selector automatically (cached)
+        return page_utils.recalculate_selector(selector, by)
+
+    def __get_element_cache_key(self, selector, by):
+        return (
+            self.driver.session_id,
+            self.__window_key,
+            self.__frame_path,
+            self.__document_count,
+            selector,
+            by,
+        )
+
+    def __wait_for_element_visible(self, selector, by, timeout):
+        """ Same as page_actions.wait_for_element_visible(), but reuses the
+            element from an earlier action on the same selector if the
+            element cache is on. (settings.CACHE_ELEMENT_LOOKUPS) """
+        if not settings.CACHE_ELEMENT_LOOKUPS:
+            return page_actions.wait_for_element_visible(self.driver, selector, by, timeout=timeout)
+        key = self.__get_element_cache_key(selector, by)
+        element = self._element_cache.get_visible_element(key)
+        if not element:
+            element = page_actions.wait_for_element_visible(self.driver, selector, by, timeout=timeout)
+            self._element_cache.add(key, element)
+        return element
+
+    def __forget_element(self, selector, by):
+        """ Removes a (likely stale) element from the element cache. """
+        if settings.CACHE_ELEMENT_LOOKUPS:
+            self._element_cache.remove(self.__get_element_cache_key(selector, by))
 
     def __looks_like_a_page_url(self, url):
         """ Returns True if the url parameter looks like a URL. This method
@@ -4735,9 +4951,14 @@ class BaseCase(unittest.TestCase):
             self.maximize_option = sb_config.maximize_option
             self._reuse_session = sb_config.reuse_session
             self._crumbs = sb_config.crumbs
+            self._browser_pool_size = sb_config.browser_pool_size
             self.save_screenshot_after_test = sb_config.save_screenshot
             self.visual_baseline = sb_config.visual_baseline
             self.timeout_multiplier = sb_config.timeout_multiplier
+            self.wait_strategy = sb_config.wait_strategy
+            self.screenshot_format = sb_config.screenshot_format
+            self.screenshot_quality = sb_config.screenshot_quality
+            self.screenshot_max_size = sb_config.screenshot_max_size
             self.pytest_html_report = sb_config.pytest_html_report
             self.report_on = False
             if self.pytest_html_report:
@@ -4818,6 +5039,14 @@ class BaseCase(unittest.TestCase):
         # Parse the settings file
         if self.settings_file:
             settings_parser.set_settings(self.settings_file)
+        if not self.wait_strategy:
+            self.wait_strategy = settings.WAIT_STRATEGY
+        if self.screenshot_format:
+            settings.SCREENSHOT_FORMAT = self.screenshot_format
+        if self.screenshot_quality:
+            settings.SCREENSHOT_QUALITY = self.screenshot_quality
+        if self.screenshot_max_size:
+            settings.SCREENSHOT_MAX_SIZE = self.screenshot_max_size
 
         # Mobile Emulator device metrics: CSS Width, CSS Height, & Pixel-Ratio
         if self.device_metrics:
@@ -4842,11 +5071,7 @@ class BaseCase(unittest.TestCase):
         if self.mobile_emulator:
             if not self.user_agent:
                 # Use the Pixel 3 user agent by default if not specified
-                self.user_agent = (
-                    "Mozilla/5.0 (Linux; Android 9; Pixel 3 XL) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/76.0.3809.132 Mobile Safari/537.36"
-                )
+                self.user_agent = constants.Mobile.DEFAULT_USER_AGENT
 
         has_url = False
         if self._reuse_session:
@@ -4861,7 +5086,7 @@ class BaseCase(unittest.TestCase):
                     if len(url) > 3:
                         has_url = True
                     if self._crumbs:
-                        self.driver.delete_all_cookies()
+                        self.reset_browser_state()
                 except Exception:
                     pass
         if self._reuse_session and sb_config.shared_driver and has_url:
@@ -4875,6 +5100,8 @@ class BaseCase(unittest.TestCase):
             else:
                 if self.get_current_url() != "data:,":
                     self.open("data:,")
+        elif self._browser_pool_size:
+            self.__lease_driver_from_pool()
         else:
             # Launch WebDriver for both Pytest and Nosetests
             self.driver = self.get_new_driver(
@@ -4909,27 +5136,20 @@ class BaseCase(unittest.TestCase):
 
     def __set_last_page_screenshot(self):
         """ self.__last_page_screenshot is only for pytest html report logs
-            self.__last_page_screenshot_png is for all screenshot log files """
+            self.__last_page_screenshot_png is for all screenshot log files
+            (Both come from the same capture. The base64 version is encoded
+            from the PNG bytes instead of taking a second screenshot.) """
         if not self.__last_page_screenshot and (not self.__last_page_screenshot_png):
             try:
                 element = self.driver.find_element(by=By.TAG_NAME, value="body")
-                if self.is_pytest and self.report_on:
-                    self.__last_page_screenshot_png = self.driver.get_screenshot_as_png()
-                    self.__last_page_screenshot = element.screenshot_as_base64
-                else:
-                    self.__last_page_screenshot_png = element.screenshot_as_png
+                self.__last_page_screenshot_png = element.screenshot_as_png
             except Exception:
-                if not self.__last_page_screenshot:
-                    if self.is_pytest and self.report_on:
-                        try:
-                            self.__last_page_screenshot = self.driver.get_screenshot_as_base64()
-                        except Exception:
-                            pass
-                if not self.__last_page_screenshot_png:
-                    try:
-                        self.__last_page_screenshot_png = self.driver.get_screenshot_as_png()
-                    except Exception:
-                        pass
+                try:
+                    self.__last_page_screenshot_png = self.driver.get_screenshot_as_png()
+                except Exception:
+                    pass
+            if self.__last_page_screenshot_png and self.is_pytest and self.report_on:
+                self.__last_page_screenshot = base64.b64encode(self.__last_page_screenshot_png).decode("ascii")
 
     def __set_last_page_url(self):
         if not self.__last_page_url:
@@ -4988,12 +5208,82 @@ class BaseCase(unittest.TestCase):
                         extra_image["content"] = self.__last_page_screenshot
                         extra_image["mime_type"] = "image/png"
                         extra_image["extension"] = "png"
+                        extra_link = self.__get_html_report_thumbnail(extra_image)
                         self.__added_pytest_html_extra = True
                         self._html_report_extra.append(extra_url)
                         self._html_report_extra.append(extra_image)
+                        if extra_link:
+                            self._html_report_extra.append(extra_link)
             except Exception:
                 pass
 
+    def __get_html_report_thumbnail(self, extra_image):
+        """ If REPORT_THUMBNAIL_WIDTH is set, the report gets a scaled-down
+            screenshot, and the full one is saved in the logs folder instead.
+            Returns the report extra that links to the full screenshot. """
+        if not settings.REPORT_THUMBNAIL_WIDTH or not self.__last_page_screenshot_png:
+            return None
+        try:
+            thumbnail = image_helper.make_thumbnail(
+                self.__last_page_screenshot_png, settings.REPORT_THUMBNAIL_WIDTH
+            )
+        except Exception:
+            thumbnail = None
+        if not thumbnail:
+            return None  # Pillow isn't installed (Keep the full screenshot)
+        test_logpath = self.log_path + "/" + self.__get_test_id()
+        self.__create_log_path_as_needed(test_logpath)
+        self.__log_screenshot(test_logpath)
+        screenshot_path = os.path.abspath(log_helper.get_screenshot_path(test_logpath))
+        extra_image["name"] = "Screenshot (Thumbnail)"
+        extra_image["content"] = base64.b64encode(thumbnail).decode("ascii")
+        extra_link = {}
+        extra_link["name"] = "Full Screenshot"
+        extra_link["format"] = "url"
+        extra_link["content"] = self.__get_file_url(screenshot_path)
+        extra_link["mime_type"] = None
+        extra_link["extension"] = None
+        return extra_link
+
+    def __log_screenshot(self, test_logpath):
+        """ Saves the last page screenshot to the logs of the test.
+            (Only once, even if several kinds of logs need it.) """
+        if self.__screenshot_log_path != test_logpath:
+            log_helper.log_screenshot(test_logpath, self.driver, self.__last_page_screenshot_png)
+            self.__screenshot_log_path = test_logpath
+
+    def __get_file_url(self, file_path):
+        """ Returns the "file:" URL of a file path. (Also on Windows) """
+        try:
+            from urllib.parse import urljoin  # Python 3
+            from urllib.request import pathname2url
+        except ImportError:
+            from urlparse import urljoin  # Python 2
+            from urllib import pathname2url
+        return urljoin("file:", pathname2url(os.path.abspath(file_path)))
+
+    def __lease_driver_from_pool(self):
+        """ Gets a browser from the pool of pre-launched browsers.
+            (The pool is started by pytest_configure(), or else here.) """
+        from seleniumbase.core import browser_pool
+
+        if not sb_config.browser_pool:
+            device_metrics = None
+            if self.__device_width:
+                device_metrics = (self.__device_width, self.__device_height, self.__device_pixel_ratio)
+            sb_config.browser_pool = browser_pool.start_pool(self, self._browser_pool_size, device_metrics)
+        self.driver = sb_config.browser_pool.lease()
+        self.__pooled_driver = self.driver
+        self._default_driver = self.driver
+        self._drivers_list.append(self.driver)
+        if self.start_page and len(self.start_page) >= 4:
+            if page_utils.is_valid_url(self.start_page):
+                self.open(self.start_page)
+            else:
+                new_start_page = "http://" + self.start_page
+                if page_utils.is_valid_url(new_start_page):
+                    self.open(new_start_page)
+
     def __quit_all_drivers(self):
         if self._reuse_session and sb_config.shared_driver:
             if len(self._drivers_list) > 0:
@@ -5005,6 +5295,14 @@ class BaseCase(unittest.TestCase):
             else:
                 self._drivers_list = []
 
+        if self.__pooled_driver:
+            # Return the browser to the pool instead of quitting it
+            if self.__pooled_driver in self._drivers_list:
+                self._drivers_list.remove(self.__pooled_driver)
+            if sb_config.browser_pool:
+                sb_config.browser_pool.release(self.__pooled_driver)
+            self.__pooled_driver = None
+
         # Close all open browser windows
         self._drivers_list.reverse()  # Last In, First Out
         for driver in self._drivers_list:
@@ -5118,7 +5416,7 @@ class BaseCase(unittest.TestCase):
                         self.__set_last_page_screenshot()
                         self.__set_last_page_url()
                         self.__set_last_page_source()
-                    log_helper.log_screenshot(test_logpath, self.driver, self.__last_page_screenshot_png)
+                    self.__log_screenshot(test_logpath)
                     self.__add_pytest_html_extra()
                 if self.with_testing_base and has_exception:
                     test_logpath = self.log_path + "/" + test_id
@@ -5133,7 +5431,7 @@ class BaseCase(unittest.TestCase):
                             self.__set_last_page_screenshot()
                             self.__set_last_page_url()
                             self.__set_last_page_source()
-                        log_helper.log_screenshot(test_logpath, self.driver, self.__last_page_screenshot_png)
+                        self.__log_screenshot(test_logpath)
                         log_helper.log_test_failure_data(
                             self, test_logpath, self.driver, self.browser, self.__last_page_url,
                         )
@@ -5144,9 +5442,7 @@ class BaseCase(unittest.TestCase):
                                 self.__set_last_page_screenshot()
                                 self.__set_last_page_url()
                                 self.__set_last_page_source()
-                            log_helper.log_screenshot(
-                                test_logpath, self.driver, self.__last_page_screenshot_png,
-                            )
+                            self.__log_screenshot(test_logpath)
                         if self.with_basic_test_info:
                             log_helper.log_test_failure_data(
                                 self, test_logpath, self.driver, self.browser, self.__last_page_url,
@@ -5175,6 +5471,7 @@ class BaseCase(unittest.TestCase):
                 """ If enabled, upload logs to S3 during test exceptions. """
                 from seleniumbase.core.s3_manager import S3LoggingBucket
 
+                artifact_writer.flush()  # Finish writing the log files first
                 s3_bucket = S3LoggingBucket()
                 guid = str(uuid.uuid4().hex)
                 path = "%s/%s" % (self.log_path, test_id)
@@ -5207,7 +5504,7 @@ class BaseCase(unittest.TestCase):
                         self.__set_last_page_screenshot()
                         self.__set_last_page_url()
                         self.__set_last_page_source()
-                    log_helper.log_screenshot(test_logpath, self.driver, self.__last_page_screenshot_png)
+                    self.__log_screenshot(test_logpath)
                     log_helper.log_page_source(test_logpath, self.driver, self.__last_page_source)
             elif self.save_screenshot_after_test:
                 test_id = self.__get_test_id()
@@ -5217,7 +5514,7 @@ class BaseCase(unittest.TestCase):
                     self.__set_last_page_screenshot()
                     self.__set_last_page_url()
                     self.__set_last_page_source()
-                log_helper.log_screenshot(test_logpath, self.driver, self.__last_page_screenshot_png)
+                self.__log_screenshot(test_logpath)
             if self.report_on:
                 self._last_page_screenshot = self.__last_page_screenshot_png
                 try:
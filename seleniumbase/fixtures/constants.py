@@ -135,6 +135,15 @@ class Tether:
     MIN_JS = "https://cdnjs.cloudflare.com/ajax/libs/" "tether/%s/js/tether.min.js" % VER
 
 
+class Mobile:
+    # The user agent of Mobile Mode when none is given (Pixel 3 XL)
+    DEFAULT_USER_AGENT = (
+        "Mozilla/5.0 (Linux; Android 9; Pixel 3 XL) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/76.0.3809.132 Mobile Safari/537.36"
+    )
+
+
 class ValidBrowsers:
     valid_browsers = [
         "chrome",
@@ -201,3 +210,26 @@ class State:
     SKIP = "Skip"
     BLOCKED = "Blocked"
     DEPRECATED = "Deprecated"
+
+
+class WaitStrategy:
+    # Usage Example => "--wait-strategy=network_idle"
+    READY_STATE = "ready_state"
+    NETWORK_IDLE = "network_idle"
+    valid_strategies = [READY_STATE, NETWORK_IDLE]
+
+
+class ScreenshotFormat:
+    # Usage Example => "--screenshot-format=jpeg"
+    PNG = "png"
+    JPEG = "jpeg"
+    WEBP = "webp"
+    valid_formats = [PNG, JPEG, WEBP]
+    extensions = {PNG: "png", JPEG: "jpg", WEBP: "webp"}
+
+
+class DatabaseBackend:
+    # Usage Example => "--with-db_reporting --db_backend=sqlite"
+    MYSQL = "mysql"
+    SQLITE = "sqlite"
+    valid_backends = [MYSQL, SQLITE]
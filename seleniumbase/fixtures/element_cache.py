@@ -0,0 +1,69 @@
+"""
+This module contains an opt-in cache for WebElements, so that consecutive
+actions on the same selector don't need to find the element again each time.
+Example:
+    self.click("#email")
+    self.update_text("#email", "test@example.com")  # Reuses the element
+Enable it by setting CACHE_ELEMENT_LOOKUPS = True in settings.py.
+
+A cached element is only reused if it's still attached to the page and
+visible. (Checked with one WebDriver call instead of two.) If the document
+changed, WebDriver raises a StaleElementReferenceException, and the element
+is dropped from the cache so that a fresh lookup happens instead.
+"""
+from seleniumbase.fixtures import shared_utils
+
+
+class ElementCache(object):
+    # Totals from all caches in this process (for reporting)
+    total_lookups = 0
+    total_lookups_avoided = 0
+
+    def __init__(self, max_size=100):
+        self.lookups = 0
+        self.lookups_avoided = 0
+        self.stale_elements = 0
+        self.__elements = shared_utils.LRUCache(max_size=max_size)
+
+    def get_visible_element(self, key):
+        """ Returns the cached element for the key if it's still attached to
+            the page and visible. Otherwise returns None. """
+        self.lookups += 1
+        ElementCache.total_lookups += 1
+        element = self.__elements.get(key)
+        if element is None:
+            return None
+        try:
+            if element.is_displayed():
+                self.lookups_avoided += 1
+                ElementCache.total_lookups_avoided += 1
+                return element
+        except Exception:
+            # StaleElementReferenceException, NoSuchWindowException, etc.
+            self.stale_elements += 1
+        self.__elements.pop(key)
+        return None
+
+    def add(self, key, element):
+        self.__elements.set(key, element)
+
+    def remove(self, key):
+        self.__elements.pop(key)
+
+    def clear(self):
+        self.__elements.clear()
+
+    def stats(self):
+        return {
+            "lookups": self.lookups,
+            "lookups_avoided": self.lookups_avoided,
+            "stale_elements": self.stale_elements,
+        }
+
+
+def print_summary():
+    if ElementCache.total_lookups:
+        print(
+            "\nElement cache: %s of %s element lookups avoided."
+            % (ElementCache.total_lookups_avoided, ElementCache.total_lookups)
+        )
@@ -5,14 +5,186 @@ These helper methods SHOULD NOT be called directly from tests.
 import re
 import requests
 import time
+import weakref
 from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
 from seleniumbase import config as sb_config
 from seleniumbase.common import decorators
 from seleniumbase.config import settings
+from seleniumbase.core import asset_loader
 from seleniumbase.core import style_sheet
 from seleniumbase.fixtures import constants
 from seleniumbase.fixtures import shared_utils
 
+# The last async script timeout set for each WebDriver. (Weak references,
+# so that drivers that were quit and dropped don't stay in the dict.)
+_script_timeouts = weakref.WeakKeyDictionary()
+DEFAULT_SCRIPT_TIMEOUT = 30  # The WebDriver default (seconds)
+
+# Adds code to the page as an inline script / style. (Passed as arguments,
+# so that the code doesn't need any quote escaping.)
+INLINE_JS_SCRIPT = """
+var script = document.createElement("script");
+script.type = "text/javascript";
+script.text = arguments[0];
+(document.head || document.documentElement).appendChild(script);
+"""
+INLINE_CSS_SCRIPT = """
+var style = document.createElement("style");
+style.type = "text/css";
+style.appendChild(document.createTextNode(arguments[0]));
+(document.head || document.documentElement).appendChild(style);
+"""
+
+# JS helpers shared by the element scripts below (for CSS and XPath).
+# Visibility is based on the computed style and the client rects.
+ELEMENT_HELPERS_JS = """
+    function sbFindElement(selector, isXPath) {
+        if (isXPath) {
+            return document.evaluate(selector, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        return document.querySelector(selector);
+    }
+    function sbIsVisible(el) {
+        if (!el.getClientRects || !el.getClientRects().length) {
+            return false;
+        }
+        var style = window.getComputedStyle(el);
+        return (style.visibility !== 'hidden' && style.display !== 'none'
+                && parseFloat(style.opacity) !== 0);
+    }
+    function sbHasText(el, text, exact) {
+        var elText = el.innerText || el.textContent || '';
+        if (exact) {
+            return elText.trim() === text.trim();
+        }
+        return elText.indexOf(text) !== -1;
+    }
+    function sbFindByLocator(selector, by) {
+        switch (by) {
+            case 'css selector': return document.querySelector(selector);
+            case 'xpath': return sbFindElement(selector, true);
+            case 'id': return document.getElementById(selector);
+            case 'name': return document.getElementsByName(selector)[0];
+            case 'class name':
+                return document.getElementsByClassName(selector)[0];
+            case 'tag name': return document.getElementsByTagName(selector)[0];
+            case 'link text':
+            case 'partial link text':
+                var links = document.getElementsByTagName('a');
+                for (var i = 0; i < links.length; i++) {
+                    if (sbHasText(links[i], selector, by === 'link text')) {
+                        return links[i];
+                    }
+                }
+                return null;
+        }
+        throw new Error('Unknown selector type: ' + by);
+    }
+"""
+
+# Script for get_visible_elements()
+# Args: a list of [selector, by] pairs
+VISIBLE_ELEMENTS_SCRIPT = (
+    ELEMENT_HELPERS_JS
+    + """
+    var locators = arguments[0], results = [];
+    for (var i = 0; i < locators.length; i++) {
+        var el = null;
+        try {
+            el = sbFindByLocator(locators[i][0], locators[i][1]);
+        } catch (e) {
+            el = null;  // An invalid selector can't become visible
+        }
+        results.push(el && sbIsVisible(el) ? el : null);
+    }
+    return results;
+"""
+)
+
+# Script for get_element_status()
+# Args: selector, is_xpath, text
+ELEMENT_STATUS_SCRIPT = (
+    ELEMENT_HELPERS_JS
+    + """
+    var el = sbFindElement(arguments[0], arguments[1]), text = arguments[2];
+    var status = {element: null, visible: false,
+                  has_text: false, has_exact_text: false};
+    if (!el) {
+        return status;
+    }
+    status.element = el;
+    status.visible = sbIsVisible(el);
+    if (status.visible && text !== null) {
+        status.has_text = sbHasText(el, text, false);
+        status.has_exact_text = sbHasText(el, text, true);
+    }
+    return status;
+"""
+)
+
+# Async script for wait_for_dom_condition()
+# Args: selector, is_xpath, condition, text, timeout_ms, callback
+DOM_CONDITION_SCRIPT = (
+    ELEMENT_HELPERS_JS
+    + """
+    var selector = arguments[0], isXPath = arguments[1];
+    var condition = arguments[2], text = arguments[3];
+    var timeoutMs = arguments[4], done = arguments[arguments.length - 1];
+    function isMet() {
+        var el = sbFindElement(selector, isXPath);
+        var visible = !!el && sbIsVisible(el);
+        switch (condition) {
+            case 'present': return !!el;
+            case 'visible': return visible;
+            case 'text': return visible && sbHasText(el, text, false);
+            case 'exact_text': return visible && sbHasText(el, text, true);
+            case 'absent': return !el;
+            case 'not_visible': return !visible;
+            case 'text_not_visible':
+                return !visible || !sbHasText(el, text, false);
+        }
+        throw new Error('Unknown condition: ' + condition);
+    }
+    try {
+        if (isMet()) {
+            done('initial');
+            return;
+        }
+    } catch (e) {
+        done(null);  // Invalid selector, etc. (Let WebDriver report it.)
+        return;
+    }
+    var finished = false, observer = null, interval = null, timer = null;
+    function finish(result) {
+        if (finished) {
+            return;
+        }
+        finished = true;
+        if (observer) { observer.disconnect(); }
+        clearInterval(interval);
+        clearTimeout(timer);
+        done(result);
+    }
+    function recheck() {
+        try {
+            if (isMet()) { finish('changed'); }
+        } catch (e) {
+            finish(null);
+        }
+    }
+    if (window.MutationObserver) {
+        observer = new MutationObserver(recheck);
+        observer.observe(document.documentElement || document, {
+            childList: true, subtree: true, attributes: true,
+            characterData: true});
+    }
+    interval = setInterval(recheck, 100);
+    timer = setTimeout(function() { finish('timeout'); }, timeoutMs);
+"""
+)
+
 
 def wait_for_ready_state_complete(driver, timeout=settings.EXTREME_TIMEOUT):
     """
@@ -42,11 +214,338 @@ def wait_for_ready_state_complete(driver, timeout=settings.EXTREME_TIMEOUT):
     raise Exception("Page elements never fully loaded after %s seconds!" % timeout)
 
 
+NETWORK_IDLE_SCRIPT = """
+var idleMs = arguments[0];
+var timeoutMs = arguments[1];
+var callback = arguments[arguments.length - 1];
+if (!window.sbNetworkTracker) {
+    var tracker = {pending: 0, lastActivity: 0};
+    window.sbNetworkTracker = tracker;
+    var requestStarted = function() {
+        tracker.pending += 1;
+        tracker.lastActivity = Date.now();
+    };
+    var requestEnded = function() {
+        tracker.pending = Math.max(0, tracker.pending - 1);
+        tracker.lastActivity = Date.now();
+    };
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function() {
+            requestStarted();
+            return origFetch.apply(this, arguments).then(
+                function(response) { requestEnded(); return response; },
+                function(error) { requestEnded(); throw error; });
+        };
+    }
+    if (window.XMLHttpRequest) {
+        var origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function() {
+            requestStarted();
+            this.addEventListener("loadend", requestEnded);
+            return origSend.apply(this, arguments);
+        };
+    }
+}
+var tracker = window.sbNetworkTracker;
+var start = Date.now();
+var check = function() {
+    var now = Date.now();
+    if (document.readyState === "complete" && tracker.pending === 0
+            && now - tracker.lastActivity >= idleMs) {
+        callback(true);
+    } else if (now - start >= timeoutMs) {
+        callback(false);
+    } else {
+        setTimeout(check, 50);
+    }
+};
+check();
+"""
+
+
+def _raise_script_timeout(driver, timeout):
+    """ Makes sure that async scripts can run for at least timeout seconds.
+        The timeout is shared with every execute_async_script() call of the
+        driver, so it's only raised, and never set below the default. """
+    if driver in _script_timeouts and _script_timeouts[driver] >= timeout:
+        return
+    timeout = max(timeout, _script_timeouts.get(driver, DEFAULT_SCRIPT_TIMEOUT))
+    driver.set_script_timeout(timeout)
+    _script_timeouts[driver] = timeout
+
+
+def wait_for_network_idle(driver, idle_time=0.5, timeout=settings.SMALL_TIMEOUT):
+    """
+    Waits until document.readyState == "complete" and there are no fetch()
+    or XMLHttpRequest calls in flight for at least idle_time seconds.
+    The first call on a page adds the request tracking to that page, so
+    requests that started before then aren't seen. (Those are covered by
+    the readyState check for the initial page load.)
+    The waiting happens inside the browser, so it's one WebDriver call.
+    Returns True if the network went idle, or False if it didn't in time
+    or if the page navigated away while waiting.
+    """
+    script_timeout = timeout + 1
+    _raise_script_timeout(driver, script_timeout)
+    try:
+        return driver.execute_async_script(
+            NETWORK_IDLE_SCRIPT, int(idle_time * 1000.0), int(timeout * 1000.0)
+        )
+    except Exception:
+        return False
+
+
 def execute_async_script(driver, script, timeout=settings.EXTREME_TIMEOUT):
     driver.set_script_timeout(timeout)
+    _script_timeouts[driver] = timeout
     return driver.execute_async_script(script)
 
 
+def is_observer_wait_supported(driver):
+    """ Async scripts aren't reliable enough on Safari and IE for waiting on
+        page changes from inside the browser. Those use the polling loop. """
+    try:
+        browser_name = driver.name
+    except Exception:
+        return False
+    if browser_name in ("safari", "internet explorer"):
+        return False
+    return True
+
+
+def get_element_status(driver, selector, by, text=None):
+    """ Checks the presence, visibility, and text of the first element that
+        matches the selector with a single execute_script() call, instead of
+        separate find_element(), is_displayed(), and text WebDriver calls.
+        Supported selector types: By.CSS_SELECTOR and By.XPATH.
+        Returns a dict: {"element": WebElement or None, "visible": bool,
+                         "has_text": bool, "has_exact_text": bool}
+        (The "has_*" values are only checked if text is given and the element
+        is visible.) Returns None if the probe couldn't be used. """
+    if by not in (By.CSS_SELECTOR, By.XPATH):
+        return None
+    try:
+        return driver.execute_script(ELEMENT_STATUS_SCRIPT, selector, by == By.XPATH, text)
+    except Exception:
+        # Invalid selector, alert present, etc. (Let WebDriver report it.)
+        return None
+
+
+def get_visible_elements(driver, locators):
+    """ Checks a list of (selector, by) locators with one execute_script()
+        call. All selector types are supported. Link text selectors match
+        the first link with that text, like WebDriver does.
+        Returns a list with the first matching element for each locator if
+        that element is visible (or None if it isn't), in the same order.
+        Returns None if the script couldn't be used. """
+    locators = [[selector, by] for (selector, by) in locators]
+    try:
+        return driver.execute_script(VISIBLE_ELEMENTS_SCRIPT, locators)
+    except Exception:
+        return None
+
+
+def wait_for_dom_condition(driver, selector, by, condition, text=None, timeout=1.0):
+    """ Waits inside the browser for a condition on the first element that
+        matches the selector. A MutationObserver rechecks the condition on
+        every DOM change (with a light in-page recheck for CSS transitions),
+        so this returns as soon as the page reports that the condition is met
+        rather than polling WebDriver every 100 ms.
+        Supported selector types: By.CSS_SELECTOR and By.XPATH.
+        Conditions: "present", "visible", "text", "exact_text",
+                    "absent", "not_visible", "text_not_visible".
+        Returns "initial" if the condition was already met, "changed" if it
+        became met while waiting, "timeout" if it wasn't met in time,
+        or None if the observer couldn't be used on this page. """
+    if by not in (By.CSS_SELECTOR, By.XPATH):
+        return None
+    timeout_ms = int(timeout * 1000.0)
+    if timeout_ms <= 0:
+        return "timeout"
+    script_timeout = timeout + 1
+    _raise_script_timeout(driver, script_timeout)
+    try:
+        return driver.execute_async_script(
+            DOM_CONDITION_SCRIPT,
+            selector,
+            by == By.XPATH,
+            condition,
+            text,
+            timeout_ms,
+        )
+    except Exception:
+        # Page navigated away mid-wait, alert present, or async unsupported
+        return None
+
+
+CLEAR_ORIGIN_STORAGE_SCRIPT = """
+var callback = arguments[arguments.length - 1];
+try {
+    localStorage.clear();
+    sessionStorage.clear();
+} catch (e) {}
+var tasks = [];
+if (navigator.serviceWorker && navigator.serviceWorker.getRegistrations) {
+    tasks.push(navigator.serviceWorker.getRegistrations().then(
+        function(registrations) {
+            return Promise.all(registrations.map(
+                function(registration) { return registration.unregister(); }));
+        }));
+}
+if (window.indexedDB && indexedDB.databases) {
+    tasks.push(indexedDB.databases().then(function(databases) {
+        databases.forEach(function(db) { indexedDB.deleteDatabase(db.name); });
+    }));
+}
+if (window.caches) {
+    tasks.push(caches.keys().then(function(keys) {
+        return Promise.all(keys.map(function(key) { return caches.delete(key); }));
+    }));
+}
+Promise.all(tasks).then(
+    function() { callback(true); }, function() { callback(false); });
+"""
+
+
+def clear_origin_storage(driver):
+    """ Clears localStorage, sessionStorage, IndexedDB, Cache Storage, and
+        service workers for the origin of the current page. (One call.)
+        Returns True if everything was cleared. """
+    try:
+        return driver.execute_async_script(CLEAR_ORIGIN_STORAGE_SCRIPT)
+    except Exception:
+        return False  # Such as for pages without storage (Eg: "data:,")
+
+
+# Script for get_dom_fingerprint()
+# Args: details (null, true for all subtrees, or a list of subtree indexes)
+DOM_FINGERPRINT_SCRIPT = """
+var details = arguments[0];
+if (!document.body) {
+    return null;
+}
+var imul = Math.imul || function(a, b) {
+    var ah = (a >>> 16) & 0xffff, al = a & 0xffff;
+    var bh = (b >>> 16) & 0xffff, bl = b & 0xffff;
+    return ((al * bl) + (((ah * bl + al * bh) << 16) >>> 0)) | 0;
+};
+function sbHash(str) {
+    var h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (var i = 0; i < str.length; i++) {
+        var ch = str.charCodeAt(i);
+        h1 = imul(h1 ^ ch, 2654435761);
+        h2 = imul(h2 ^ ch, 1597334677);
+    }
+    h1 = imul(h1 ^ (h1 >>> 16), 2246822507) ^ imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = imul(h2 ^ (h2 >>> 16), 2246822507) ^ imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (h2 >>> 0).toString(16) + (h1 >>> 0).toString(16);
+}
+function sbEntries(el) {
+    var tag = el.tagName.toLowerCase(), attrs = [], names = [];
+    for (var i = 0; i < el.attributes.length; i++) {
+        attrs.push([el.attributes[i].name, el.attributes[i].value]);
+    }
+    attrs.sort(function(a, b) { return a[0] < b[0] ? -1 : (a[0] > b[0] ? 1 : 0); });
+    for (var j = 0; j < attrs.length; j++) {
+        names.push(attrs[j][0]);
+    }
+    return [[tag], [tag, names], [tag, attrs]];
+}
+function sbWalk(el, lists) {
+    var entries = sbEntries(el), childHashes = [[], [], []], size = 1, k;
+    if (lists) {
+        for (k = 0; k < 3; k++) {
+            lists[k].push(entries[k]);
+        }
+    }
+    for (var child = el.firstElementChild; child; child = child.nextElementSibling) {
+        var result = sbWalk(child, lists);
+        size += result.size;
+        for (k = 0; k < 3; k++) {
+            childHashes[k].push(result.hashes[k]);
+        }
+    }
+    var hashes = [];
+    for (k = 0; k < 3; k++) {
+        hashes.push(sbHash(JSON.stringify(entries[k]) + "[" + childHashes[k].join(",") + "]"));
+    }
+    return {hashes: hashes, size: size};
+}
+var fingerprint = {hashes: [], subtrees: [], sizes: [], details: []};
+var rootHashes = [[], [], []], index = 0, k;
+for (var el = document.body.firstElementChild; el; el = el.nextElementSibling) {
+    var lists = null;
+    if (details === true || (details && details.indexOf(index) !== -1)) {
+        lists = [[], [], []];
+    }
+    var result = sbWalk(el, lists);
+    fingerprint.subtrees.push(result.hashes);
+    fingerprint.sizes.push(result.size);
+    fingerprint.details.push(lists);
+    for (k = 0; k < 3; k++) {
+        rootHashes[k].push(result.hashes[k]);
+    }
+    index++;
+}
+for (k = 0; k < 3; k++) {
+    fingerprint.hashes.push(sbHash("[" + rootHashes[k].join(",") + "]"));
+}
+return fingerprint;
+"""
+
+
+def get_dom_fingerprint(driver, details=None):
+    """ Walks the elements inside the <body> of the current page (in one
+        call) and returns a dict with Merkle-style hashes of the tags for
+        each check_window() level. (1: tags, 2: + attribute names,
+        3: + attribute values) Each hash covers a whole subtree.
+        "hashes" -> The [level 1, level 2, level 3] hashes of the <body>.
+        "subtrees" -> The level hashes of each child element of the <body>.
+        "sizes" -> The number of elements in each of those subtrees.
+        "details" -> The [level 1, level 2, level 3] tag lists of each
+                     subtree that was requested (None for the others).
+        details - None (hashes only), True (all), or a list of subtrees.
+        Returns None if the page has no <body>. """
+    return driver.execute_script(DOM_FINGERPRINT_SCRIPT, details)
+
+
+# Script for get_unique_links()
+# Links are resolved by the browser (relative to the page's base URL).
+UNIQUE_LINKS_SCRIPT = """
+var attributes = {A: "href", IMG: "src", LINK: "href", SCRIPT: "src"};
+var tagLinks = {A: [], IMG: [], LINK: [], SCRIPT: []};
+var resolver = document.createElement("a");
+var elements = document.querySelectorAll(
+    "a[href], img[src], link[href], script[src]");
+for (var i = 0; i < elements.length; i++) {
+    var tag = elements[i].tagName.toUpperCase();
+    var link = elements[i].getAttribute(attributes[tag]);
+    if (link && link.trim().length > 1) {
+        resolver.href = link.trim();
+        tagLinks[tag].push(resolver.href);
+    }
+}
+var links = [], seen = {};
+var allLinks = tagLinks.A.concat(tagLinks.IMG, tagLinks.LINK, tagLinks.SCRIPT);
+for (var j = 0; j < allLinks.length; j++) {
+    if (!seen.hasOwnProperty(allLinks[j])) {
+        seen[allLinks[j]] = true;
+        links.push(allLinks[j]);
+    }
+}
+return links;
+"""
+
+
+def get_unique_links(driver):
+    """ Returns the unique "a"->"href", "img"->"src", "link"->"href", and
+        "script"->"src" links of the current page, found by the browser.
+        (Same links as page_utils._get_unique_links(), in the same order,
+         without sending the page source over the wire and parsing it.) """
+    return driver.execute_script(UNIQUE_LINKS_SCRIPT)
+
+
 def wait_for_angularjs(driver, timeout=settings.LARGE_TIMEOUT, **kwargs):
     if not settings.WAIT_FOR_ANGULARJS:
         return
@@ -130,6 +629,12 @@ def activate_jquery(driver):
         # jQuery is not currently defined. Let's proceed by defining it.
         pass
     jquery_js = constants.JQuery.MIN_JS
+    if add_bundled_asset(driver, jquery_js):
+        try:
+            driver.execute_script("jQuery('html')")
+            return
+        except Exception:
+            pass  # Such as if the site's CSP blocks inline scripts
     activate_jquery_script = (
         """var script = document.createElement('script');"""
         """script.src = "%s";document.getElementsByTagName('head')[0]"""
@@ -323,7 +828,25 @@ def highlight_with_jquery(driver, selector, loops, o_bs):
     driver.execute_script(script)
 
 
+def add_bundled_asset(driver, link):
+    """ If SeleniumBase has a bundled copy of the JS/CSS link, adds it to the
+        page inline, which skips the network request. (It runs right away.)
+        Returns True if the bundled copy was used. """
+    if not settings.USE_BUNDLED_ASSETS:
+        return False
+    code = asset_loader.get_bundled_asset(link)
+    if not code:
+        return False
+    if link.endswith(".css"):
+        driver.execute_script(INLINE_CSS_SCRIPT, code)
+    else:
+        driver.execute_script(INLINE_JS_SCRIPT, code)
+    return True
+
+
 def add_css_link(driver, css_link):
+    if add_bundled_asset(driver, css_link):
+        return
     script_to_add_css = """function injectCSS(css) {
               var head = document.getElementsByTagName("head")[0];
               var link = document.createElement("link");
@@ -339,6 +862,8 @@ def add_css_link(driver, css_link):
 
 
 def add_js_link(driver, js_link):
+    if add_bundled_asset(driver, js_link):
+        return
     script_to_add_js = """function injectJS(link) {
               var body = document.getElementsByTagName("body")[0];
               var script = document.createElement("script");
@@ -24,6 +24,7 @@ import os
 import sys
 import time
 import traceback
+import weakref
 from selenium.common.exceptions import StaleElementReferenceException
 from selenium.common import exceptions as selenium_exceptions
 from selenium.webdriver.common.by import By
@@ -34,7 +35,9 @@ from selenium.webdriver.remote.errorhandler import NoAlertPresentException
 from selenium.webdriver.remote.errorhandler import NoSuchFrameException
 from selenium.webdriver.remote.errorhandler import NoSuchWindowException
 from seleniumbase.config import settings
+from seleniumbase.core import image_helper
 from seleniumbase.core import log_helper
+from seleniumbase.fixtures import js_utils
 from seleniumbase.fixtures import page_utils
 from seleniumbase.fixtures import shared_utils
 
@@ -69,8 +72,7 @@ def is_element_visible(driver, selector, by=By.CSS_SELECTOR):
     Boolean (is element visible)
     """
     try:
-        element = driver.find_element(by=by, value=selector)
-        return element.is_displayed()
+        return _get_element_status(driver, selector, by)["visible"]
     except Exception:
         return False
 
@@ -87,12 +89,40 @@ def is_text_visible(driver, text, selector, by=By.CSS_SELECTOR):
     Boolean (is text visible)
     """
     try:
-        element = driver.find_element(by=by, value=selector)
-        return element.is_displayed() and text in element.text
+        return _get_element_status(driver, selector, by, text=text)["has_text"]
     except Exception:
         return False
 
 
+def _get_element_status(driver, selector, by=By.CSS_SELECTOR, text=None):
+    """
+    Returns a status record for the first element that matches the selector:
+    {"element": WebElement or None, "visible": bool,
+     "has_text": bool, "has_exact_text": bool}
+    (The "has_*" values are only checked if the text is given and the element
+    is visible.)
+    If settings.PROBE_ELEMENTS_WITH_JS is True, the record comes from a single
+    execute_script() call for CSS Selectors and XPath, rather than from up to
+    three WebDriver calls (find_element, is_displayed, and text).
+    """
+    if settings.PROBE_ELEMENTS_WITH_JS:
+        status = js_utils.get_element_status(driver, selector, by, text=text)
+        if status is not None:
+            return status
+    status = {"element": None, "visible": False, "has_text": False, "has_exact_text": False}
+    try:
+        element = driver.find_element(by=by, value=selector)
+    except Exception:
+        return status
+    status["element"] = element
+    status["visible"] = element.is_displayed()
+    if status["visible"] and text is not None:
+        element_text = element.text
+        status["has_text"] = text in element_text
+        status["has_exact_text"] = text.strip() == element_text.strip()
+    return status
+
+
 def hover_on_element(driver, selector, by=By.CSS_SELECTOR):
     """
     Fires the hover event for the specified element by the given selector.
@@ -142,6 +172,26 @@ def timeout_exception(exception, message):
     raise Exception(message)
 
 
+def _wait_before_next_check(driver, selector, by, stop_ms, condition, text=None):
+    """
+    Pauses between the checks of a wait_for_*() loop.
+    If settings.WAIT_FOR_ELEMENTS_WITH_OBSERVER is True, the pause happens
+    inside the browser with a MutationObserver, which returns as soon as
+    the page reports that the condition is met (or after at most 1 second),
+    instead of sleeping for a fixed 100 ms between WebDriver calls.
+    Otherwise (or if the observer can't be used), sleeps for 100 ms.
+    """
+    if settings.WAIT_FOR_ELEMENTS_WITH_OBSERVER and (js_utils.is_observer_wait_supported(driver)):
+        now_ms = time.time() * 1000.0
+        max_wait = min((stop_ms - now_ms) / 1000.0, 1.0)
+        result = js_utils.wait_for_dom_condition(driver, selector, by, condition, text=text, timeout=max_wait)
+        if result == "changed" or result == "timeout":
+            return
+        # Either the observer is unavailable, or the page already meets the
+        # condition from the browser's point of view. Don't loop too fast.
+    time.sleep(0.1)
+
+
 def hover_and_click(
     driver,
     hover_selector,
@@ -263,7 +313,7 @@ def wait_for_element_present(driver, selector, by=By.CSS_SELECTOR, timeout=setti
             now_ms = time.time() * 1000.0
             if now_ms >= stop_ms:
                 break
-            time.sleep(0.1)
+            _wait_before_next_check(driver, selector, by, stop_ms, "present")
     plural = "s"
     if timeout == 1:
         plural = ""
@@ -293,8 +343,9 @@ def wait_for_element_visible(driver, selector, by=By.CSS_SELECTOR, timeout=setti
     for x in range(int(timeout * 10)):
         shared_utils.check_if_time_limit_exceeded()
         try:
-            element = driver.find_element(by=by, value=selector)
-            if element.is_displayed():
+            status = _get_element_status(driver, selector, by)
+            if status["visible"]:
+                element = status["element"]
                 return element
             else:
                 element = None
@@ -303,7 +354,7 @@ def wait_for_element_visible(driver, selector, by=By.CSS_SELECTOR, timeout=setti
             now_ms = time.time() * 1000.0
             if now_ms >= stop_ms:
                 break
-            time.sleep(0.1)
+            _wait_before_next_check(driver, selector, by, stop_ms, "visible")
     plural = "s"
     if timeout == 1:
         plural = ""
@@ -315,6 +366,93 @@ def wait_for_element_visible(driver, selector, by=By.CSS_SELECTOR, timeout=setti
         timeout_exception(ElementNotVisibleException, message)
 
 
+def _get_visible_elements(driver, locators):
+    """
+    Returns a list with the first visible element (or None) for each of the
+    (selector, by) locators, using one execute_script() call for all of them.
+    Falls back to separate WebDriver calls if the script can't be used.
+    """
+    elements = js_utils.get_visible_elements(driver, locators)
+    if elements is not None:
+        return elements
+    elements = []
+    for (selector, by) in locators:
+        status = {"visible": False}
+        try:
+            status = _get_element_status(driver, selector, by)
+        except Exception:
+            pass
+        if status["visible"]:
+            elements.append(status["element"])
+        else:
+            elements.append(None)
+    return elements
+
+
+def wait_for_any_element_visible(driver, locators, timeout=settings.LARGE_TIMEOUT):
+    """
+    Waits for any of the specified elements to be visible on the page.
+    All of them are checked together with one WebDriver call per poll.
+    Raises an exception if none of them appear in the specified timeout.
+    @Params
+    driver - the webdriver object (required)
+    locators - a list of (selector, by) tuples for the page elements (required)
+    timeout - the time to wait for elements in seconds
+    @Returns
+    The index (in locators) of the first element that was found visible
+    """
+    start_ms = time.time() * 1000.0
+    stop_ms = start_ms + (timeout * 1000.0)
+    for x in range(int(timeout * 10)):
+        shared_utils.check_if_time_limit_exceeded()
+        elements = _get_visible_elements(driver, locators)
+        for index in range(len(elements)):
+            if elements[index]:
+                return index
+        now_ms = time.time() * 1000.0
+        if now_ms >= stop_ms:
+            break
+        time.sleep(0.1)
+    plural = "s"
+    if timeout == 1:
+        plural = ""
+    selectors = [selector for (selector, by) in locators]
+    message = "None of the elements %s were visible after %s second%s!" "" % (selectors, timeout, plural,)
+    timeout_exception(ElementNotVisibleException, message)
+
+
+def wait_for_all_elements_visible(driver, locators, timeout=settings.LARGE_TIMEOUT):
+    """
+    Waits for all of the specified elements to be visible on the page.
+    All of them are checked together with one WebDriver call per poll.
+    Raises an exception if any of them don't appear in the specified timeout.
+    @Params
+    driver - the webdriver object (required)
+    locators - a list of (selector, by) tuples for the page elements (required)
+    timeout - the time to wait for elements in seconds
+    @Returns
+    A list of web element objects (in the same order as the locators)
+    """
+    elements = []
+    start_ms = time.time() * 1000.0
+    stop_ms = start_ms + (timeout * 1000.0)
+    for x in range(int(timeout * 10)):
+        shared_utils.check_if_time_limit_exceeded()
+        elements = _get_visible_elements(driver, locators)
+        if all(elements):
+            return elements
+        now_ms = time.time() * 1000.0
+        if now_ms >= stop_ms:
+            break
+        time.sleep(0.1)
+    plural = "s"
+    if timeout == 1:
+        plural = ""
+    missing = [locators[i][0] for i in range(len(locators)) if i >= len(elements) or not elements[i]]
+    message = "Elements %s were not visible after %s second%s!" "" % (missing, timeout, plural,)
+    timeout_exception(ElementNotVisibleException, message)
+
+
 def wait_for_text_visible(driver, text, selector, by=By.CSS_SELECTOR, timeout=settings.LARGE_TIMEOUT):
     """
     Searches for the specified element by the given selector. Returns the
@@ -336,8 +474,9 @@ def wait_for_text_visible(driver, text, selector, by=By.CSS_SELECTOR, timeout=se
     for x in range(int(timeout * 10)):
         shared_utils.check_if_time_limit_exceeded()
         try:
-            element = driver.find_element(by=by, value=selector)
-            if element.is_displayed() and text in element.text:
+            status = _get_element_status(driver, selector, by, text=text)
+            if status["has_text"]:
+                element = status["element"]
                 return element
             else:
                 element = None
@@ -346,7 +485,7 @@ def wait_for_text_visible(driver, text, selector, by=By.CSS_SELECTOR, timeout=se
             now_ms = time.time() * 1000.0
             if now_ms >= stop_ms:
                 break
-            time.sleep(0.1)
+            _wait_before_next_check(driver, selector, by, stop_ms, "text", text=text)
     plural = "s"
     if timeout == 1:
         plural = ""
@@ -382,8 +521,9 @@ def wait_for_exact_text_visible(driver, text, selector, by=By.CSS_SELECTOR, time
     for x in range(int(timeout * 10)):
         shared_utils.check_if_time_limit_exceeded()
         try:
-            element = driver.find_element(by=by, value=selector)
-            if element.is_displayed() and text.strip() == element.text.strip():
+            status = _get_element_status(driver, selector, by, text=text)
+            if status["has_exact_text"]:
+                element = status["element"]
                 return element
             else:
                 element = None
@@ -392,7 +532,7 @@ def wait_for_exact_text_visible(driver, text, selector, by=By.CSS_SELECTOR, time
             now_ms = time.time() * 1000.0
             if now_ms >= stop_ms:
                 break
-            time.sleep(0.1)
+            _wait_before_next_check(driver, selector, by, stop_ms, "exact_text", text=text)
     plural = "s"
     if timeout == 1:
         plural = ""
@@ -426,7 +566,7 @@ def wait_for_element_absent(driver, selector, by=By.CSS_SELECTOR, timeout=settin
             now_ms = time.time() * 1000.0
             if now_ms >= stop_ms:
                 break
-            time.sleep(0.1)
+            _wait_before_next_check(driver, selector, by, stop_ms, "absent")
         except Exception:
             return True
     plural = "s"
@@ -452,12 +592,11 @@ def wait_for_element_not_visible(driver, selector, by=By.CSS_SELECTOR, timeout=s
     for x in range(int(timeout * 10)):
         shared_utils.check_if_time_limit_exceeded()
         try:
-            element = driver.find_element(by=by, value=selector)
-            if element.is_displayed():
+            if _get_element_status(driver, selector, by)["visible"]:
                 now_ms = time.time() * 1000.0
                 if now_ms >= stop_ms:
                     break
-                time.sleep(0.1)
+                _wait_before_next_check(driver, selector, by, stop_ms, "not_visible")
             else:
                 return True
         except Exception:
@@ -492,7 +631,7 @@ def wait_for_text_not_visible(driver, text, selector, by=By.CSS_SELECTOR, timeou
         now_ms = time.time() * 1000.0
         if now_ms >= stop_ms:
             break
-        time.sleep(0.1)
+        _wait_before_next_check(driver, selector, by, stop_ms, "text_not_visible", text=text)
     plural = "s"
     if timeout == 1:
         plural = ""
@@ -527,10 +666,11 @@ def save_screenshot(driver, name, folder=None):
     """
     Saves a screenshot to the current directory (or to a subfolder if provided)
     If the folder provided doesn't exist, it will get created.
-    The screenshot will be in PNG format.
+    The screenshot will be in PNG format, unless SCREENSHOT_FORMAT was changed.
+    (The file extension of the name is set to match the screenshot format.)
+    Returns the path of the saved screenshot.
     """
-    if not name.endswith(".png"):
-        name = name + ".png"
+    name = image_helper.get_screenshot_file_name(name)
     if folder:
         abs_path = os.path.abspath(".")
         file_path = abs_path + "/%s" % folder
@@ -539,16 +679,24 @@ def save_screenshot(driver, name, folder=None):
         screenshot_path = "%s/%s" % (file_path, name)
     else:
         screenshot_path = name
+    if not driver:
+        return None
+    image_data = image_helper.encode_screenshot(get_screenshot_png(driver))[0]
+    with open(screenshot_path, "wb") as file:
+        file.write(image_data)
+    return screenshot_path
+
+
+def get_screenshot_png(driver):
+    """
+    Returns a PNG screenshot (as bytes) of the page's <body>.
+    (Or of the browser window if the <body> can't be captured.)
+    """
     try:
         element = driver.find_element(by=By.TAG_NAME, value="body")
-        element_png = element.screenshot_as_png
-        with open(screenshot_path, "wb") as file:
-            file.write(element_png)
+        return element.screenshot_as_png
     except Exception:
-        if driver:
-            driver.get_screenshot_as_file(screenshot_path)
-        else:
-            pass
+        return driver.get_screenshot_as_png()
 
 
 def save_page_source(driver, name, folder=None):
@@ -751,3 +899,61 @@ def switch_to_window(driver, window, timeout=settings.SMALL_TIMEOUT):
             plural = ""
         message = "Window {%s} was not present after %s second%s!" "" % (window, timeout, plural,)
         timeout_exception(Exception, message)
+
+
+# The http(s) origins opened by each WebDriver (for resets). (Weak references,
+# so that drivers that were quit and dropped don't stay in the dict.)
+_visited_origins = weakref.WeakKeyDictionary()
+
+
+def add_visited_origin(driver, url):
+    """ Remembers the origin of a URL opened in the browser, so that
+        reset_browser_state() can clear that origin's data later. """
+    if url.startswith("http://") or url.startswith("https://"):
+        origin = page_utils.get_domain_url(url)
+        _visited_origins.setdefault(driver, set()).add(origin)
+
+
+def reset_browser_state(driver):
+    """
+    Returns the browser to a clean state without relaunching it:
+    * Closes all windows except for the first one.
+    * Deletes all cookies.
+    * Clears localStorage, sessionStorage, IndexedDB, Cache Storage,
+      and service workers.
+    * Leaves the browser on a blank page. ("data:,")
+    The storage of each open page is cleared with JavaScript first.
+    (sessionStorage belongs to a window, so only the open pages have any.)
+    On Chromium browsers, the data of every visited origin is then cleared
+    with one CDP call per origin (Storage.clearDataForOrigin).
+    Other browsers can only clear the storage of the pages that are open.
+    (Visited origins are the ones opened with open() / get(), plus the ones
+    of the open pages. Origins that were only reached by clicking links or
+    by in-page navigation aren't tracked, unless a window is still there.)
+    @Params
+    driver - the webdriver object (required)
+    """
+    origins = _visited_origins.pop(driver, set())
+    use_cdp = hasattr(driver, "execute_cdp_cmd")
+    handles = driver.window_handles
+    for handle in handles[1:] + handles[:1]:
+        driver.switch_to.window(handle)
+        url = driver.current_url
+        if url.startswith("http://") or url.startswith("https://"):
+            origins.add(page_utils.get_domain_url(url))
+            js_utils.clear_origin_storage(driver)
+        if handle != handles[0]:
+            driver.close()
+    driver.switch_to.window(handles[0])
+    if use_cdp:
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in origins:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"},
+                )
+        except Exception:
+            use_cdp = False  # Such as when using a Selenium Grid
+    if not use_cdp:
+        driver.delete_all_cookies()
+    driver.get("data:,")
@@ -2,8 +2,26 @@
 This module contains useful utility methods.
 """
 import codecs
+import collections
+import hashlib
 import re
 import requests
+from selenium.webdriver.common.by import By
+from seleniumbase.config import settings
+from seleniumbase.core import link_checker
+from seleniumbase.fixtures import shared_utils
+
+try:
+    from urllib.parse import urljoin  # Python 3
+except ImportError:
+    from urlparse import urljoin  # Python 2
+
+# The attribute with the link for each tag type checked by _get_unique_links()
+LINK_ATTRIBUTES = collections.OrderedDict([("a", "href"), ("img", "src"), ("link", "href"), ("script", "src")])
+
+# Resolved (selector, by) pairs from recalculate_selector()
+# (Use selector_cache.stats() to see the hit/miss counts.)
+selector_cache = shared_utils.LRUCache(max_size=1000)
 
 
 def get_domain_url(url):
@@ -95,6 +113,44 @@ def get_name_from_selector(selector):
     return selector
 
 
+def recalculate_selector(selector, by):
+    """
+    Determines the type of selector automatically from its prefix/format.
+    Examples: "//div" is XPath, "link=Home" is Link Text,
+              "partial_link=Ho" is Partial Link Text, and "name=q" is
+              converted into the CSS Selector '[name="q"]'.
+    Results are cached because tests reuse the same selectors often.
+    @Returns
+    A (selector, by) tuple
+    """
+    try:
+        key = (selector, by)
+        result = selector_cache.get(key)
+    except TypeError:
+        # Unhashable selector (not a string). Let WebDriver deal with it.
+        return (selector, by)
+    if result is None:
+        result = _recalculate_selector(selector, by)
+        selector_cache.set(key, result)
+    return result
+
+
+def _recalculate_selector(selector, by):
+    if is_xpath_selector(selector):
+        by = By.XPATH
+    if is_link_text_selector(selector):
+        selector = get_link_text_from_selector(selector)
+        by = By.LINK_TEXT
+    if is_partial_link_text_selector(selector):
+        selector = get_partial_link_text_from_selector(selector)
+        by = By.PARTIAL_LINK_TEXT
+    if is_name_selector(selector):
+        name = get_name_from_selector(selector)
+        selector = '[name="%s"]' % name
+        by = By.CSS_SELECTOR
+    return (selector, by)
+
+
 def is_valid_url(url):
     regex = re.compile(
         r"^(?:http)s?://"  # http:// or https://
@@ -115,66 +171,70 @@ def is_valid_url(url):
         return False
 
 
+def get_html_parser(parser=None):
+    """
+    Returns the name of the BeautifulSoup parser to use: the one given, or
+    else settings.HTML_PARSER. Parsers that aren't installed (Eg: "lxml")
+    fall back to Python's built-in "html.parser".
+    """
+    from bs4.builder import builder_registry
+
+    parser = parser or settings.HTML_PARSER
+    if not builder_registry.lookup(parser):
+        parser = "html.parser"
+    return parser
+
+
+def _get_beautiful_soup(source, parser=None, cache=None):
+    """
+    Parses the HTML source with BeautifulSoup.
+    If a cache (LRUCache) is given, the tree is saved there, keyed by a hash
+    of the source (and the parser), and parsing the same source again
+    returns the saved tree. (The saved tree is shared, so don't modify it.)
+    """
+    from bs4 import BeautifulSoup
+
+    parser = get_html_parser(parser)
+    key = None
+    if cache is not None:
+        data = source
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        key = (hashlib.sha1(data).hexdigest(), parser)
+        soup = cache.get(key)
+        if soup is not None:
+            return soup
+    soup = BeautifulSoup(source, parser)
+    if key:
+        cache.set(key, soup)
+    return soup
+
+
 def _get_unique_links(page_url, soup):
     """
     Returns all unique links.
     Includes:
         "a"->"href", "img"->"src", "link"->"href", and "script"->"src" links.
+    Links are found in a single pass over the page, and are resolved
+    relative to the page URL (or to the <base href> if the page has one).
     """
     if not page_url.startswith("http://") and (not page_url.startswith("https://")):
         return []
-    prefix = "http:"
-    if page_url.startswith("https:"):
-        prefix = "https:"
-    simple_url = page_url.split("://")[1]
-    base_url = simple_url.split("/")[0]
-    full_base_url = prefix + "//" + base_url
-
-    raw_links = []
-    raw_unique_links = []
-
-    # Get "href" from all "a" tags
-    links = soup.find_all("a")
-    for link in links:
-        raw_links.append(link.get("href"))
-
-    # Get "src" from all "img" tags
-    img_links = soup.find_all("img")
-    for img_link in img_links:
-        raw_links.append(img_link.get("src"))
-
-    # Get "href" from all "link" tags
-    links = soup.find_all("link")
-    for link in links:
-        raw_links.append(link.get("href"))
-
-    # Get "src" from all "script" tags
-    img_links = soup.find_all("script")
-    for img_link in img_links:
-        raw_links.append(img_link.get("src"))
-
-    for link in raw_links:
-        if link not in raw_unique_links:
-            raw_unique_links.append(link)
-
-    unique_links = []
-    for link in raw_unique_links:
-        if link and len(link) > 1:
-            if link.startswith("//"):
-                link = prefix + link
-            elif link.startswith("/"):
-                link = full_base_url + link
-            elif link.startswith("./"):
-                link = full_base_url + link[1:]
-            elif link.startswith("#"):
-                link = full_base_url + link
-            elif "//" not in link:
-                link = full_base_url + "/" + link
-            else:
-                pass
-            unique_links.append(link)
-
-    return unique_links
+    base = soup.find("base", href=True)
+    if base:
+        page_url = urljoin(page_url, base["href"].strip())
+
+    # The links of each tag type (in the same order as LINK_ATTRIBUTES)
+    tag_links = collections.OrderedDict((tag, []) for tag in LINK_ATTRIBUTES)
+    for tag in soup.find_all(list(LINK_ATTRIBUTES.keys())):
+        tag_links[tag.name].append(tag.get(LINK_ATTRIBUTES[tag.name]))
+
+    unique_links = collections.OrderedDict()  # An insertion-ordered set
+    for links in tag_links.values():
+        for link in links:
+            if link and len(link.strip()) > 1:
+                unique_links[urljoin(page_url, link.strip())] = None
+    return list(unique_links.keys())
 
 
 def _get_link_status_code(link, allow_redirects=False, timeout=5):
@@ -182,14 +242,14 @@ def _get_link_status_code(link, allow_redirects=False, timeout=5):
         If the timeout is exceeded, will return a 404.
         For a list of available status codes, see:
         https://en.wikipedia.org/wiki/List_of_HTTP_status_codes
+        (Status codes are cached. See core/link_checker.py for details.)
     """
-    status_code = None
-    try:
-        response = requests.get(link, allow_redirects=allow_redirects, timeout=timeout)
-        status_code = response.status_code
-    except Exception:
-        status_code = 404
-    return status_code
+    return link_checker.get_status_code(link, allow_redirects=allow_redirects, timeout=timeout)
+
+
+def _get_link_status_codes(links, allow_redirects=False, timeout=5):
+    """ Get the status codes of a list of links. (Checked concurrently.) """
+    return link_checker.get_status_codes(links, allow_redirects=allow_redirects, timeout=timeout)
 
 
 def _print_unique_links_with_status_codes(page_url, soup):
@@ -200,8 +260,13 @@ def _print_unique_links_with_status_codes(page_url, soup):
         "a"->"href", "img"->"src", "link"->"href", and "script"->"src".
     """
     links = _get_unique_links(page_url, soup)
-    for link in links:
-        status_code = _get_link_status_code(link)
+    _print_links_with_status_codes(links)
+
+
+def _print_links_with_status_codes(links):
+    """ Prints out links with their status codes. (One link per line) """
+    status_codes = _get_link_status_codes(links)
+    for link, status_code in zip(links, status_codes):
         print(link, " -> ", status_code)
 
 
@@ -1,10 +1,128 @@
 """
 This module contains shared utility methods.
 """
+import collections
+import os
+import stat
+import tempfile
+import threading
 import time
 from seleniumbase import config as sb_config
 
 
+class LRUCache(object):
+    """
+    A bounded, thread-safe cache that drops the least-recently-used entry
+    when full. Hits and misses are counted for profiling. (See stats())
+    If ttl (seconds) is set, entries also expire that long after being set.
+    """
+
+    def __init__(self, max_size=1000, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__data = collections.OrderedDict()  # key -> (value, expiration)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__data)
+
+    def get(self, key, default=None):
+        with self.__lock:
+            if key in self.__data:
+                # Move the key to the most-recently-used position
+                value, expiration = self.__data.pop(key)
+                if not expiration or expiration > time.time():
+                    self.__data[key] = (value, expiration)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expiration = None
+        if self.ttl:
+            expiration = time.time() + self.ttl
+        with self.__lock:
+            if key in self.__data:
+                self.__data.pop(key)
+            elif len(self.__data) >= self.max_size:
+                self.__data.popitem(last=False)
+            self.__data[key] = (value, expiration)
+
+    def pop(self, key, default=None):
+        with self.__lock:
+            if key in self.__data:
+                return self.__data.pop(key)[0]
+            return default
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__data),
+            "max_size": self.max_size,
+        }
+
+
+def get_file_cache_key(file_path):
+    """ Returns (absolute path, mtime, size) of a file, which is a cache key
+        for data parsed from the file that changes when the file changes. """
+    file_path = os.path.abspath(file_path)
+    file_stat = os.stat(file_path)
+    return (file_path, file_stat.st_mtime, file_stat.st_size)
+
+
+_umask_lock = threading.Lock()
+
+
+def _get_new_file_mode(file_path):
+    """ Returns the permissions of an existing file, or else the ones that
+        open() would give a new file. (0o666 without the umask bits) """
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except OSError:
+        pass
+    with _umask_lock:
+        umask = os.umask(0)  # (The only way to read the umask)
+        os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_file_atomically(file_path, data):
+    """ Writes data (bytes or text) to a temp file in the same folder, and
+        then renames it to file_path. (Readers get the old file or the new
+        one, but never a partial file.) Text is saved as UTF-8.
+        The file gets the permissions of a normal new file (or keeps its
+        old ones), rather than the owner-only permissions of temp files. """
+    if not isinstance(data, bytes):
+        data = data.encode("utf-8")
+    folder = os.path.dirname(os.path.abspath(file_path))
+    mode = _get_new_file_mode(file_path)
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temp_path, mode)
+        if hasattr(os, "replace"):  # Python 3
+            os.replace(temp_path, file_path)
+        else:
+            if os.name == "nt" and os.path.exists(file_path):
+                os.remove(file_path)
+            os.rename(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def __time_limit_exceeded(message):
     raise Exception("TimeLimitExceeded: %s" % message)
 
@@ -3,6 +3,11 @@ Convert XPath selectors into CSS selectors
 """
 
 import re
+from seleniumbase.fixtures import shared_utils
+
+# Conversions are pure, and tests reuse the same selectors many times.
+# (Use css_cache.stats() to see the hit/miss counts.)
+css_cache = shared_utils.LRUCache(max_size=1000)
 
 _sub_regexes = {
     "tag": r"([a-zA-Z][a-zA-Z0-9]{0,10}|\*)",
@@ -122,6 +127,14 @@ def _get_raw_css_from_xpath(xpath):
 
 
 def convert_xpath_to_css(xpath):
+    css = css_cache.get(xpath)
+    if css is None:
+        css = _convert_xpath_to_css(xpath)
+        css_cache.set(xpath, css)
+    return css
+
+
+def _convert_xpath_to_css(xpath):
     if xpath[0] != '"' and xpath[-1] != '"' and xpath.count('"') % 2 == 0:
         xpath = _handle_brackets_in_strings(xpath)
 
@@ -5,6 +5,7 @@ import sys
 import time
 from nose.plugins import Plugin
 from nose.exc import SkipTest
+from seleniumbase.core import artifact_writer
 from seleniumbase.core import log_helper
 from seleniumbase.core import report_helper
 from seleniumbase.fixtures import constants, errors
@@ -159,6 +160,7 @@ class Base(Plugin):
         self.start_time = float(time.time())
 
     def finalize(self, result):
+        artifact_writer.flush()
         log_helper.archive_logs_if_set(self.options.log_path, self.options.archive_logs)
         if self.report_on:
             if not self.import_error:
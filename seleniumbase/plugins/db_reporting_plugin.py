@@ -7,6 +7,8 @@ import time
 import uuid
 from nose.plugins import Plugin
 from nose.exc import SkipTest
+from seleniumbase import config as sb_config
+from seleniumbase.core import db_writer
 from seleniumbase.core.application_manager import ApplicationManager
 from seleniumbase.core.testcase_manager import ExecutionQueryPayload
 from seleniumbase.core.testcase_manager import TestcaseDataPayload
@@ -51,10 +53,21 @@ class DBReporting(Plugin):
             default=constants.Environment.TEST,
             help="The database environment to run the tests in.",
         )
+        parser.add_option(
+            "--db_backend",
+            "--db-backend",
+            action="store",
+            dest="db_backend",
+            choices=constants.DatabaseBackend.valid_backends,
+            default=None,
+            help="""The database to use: "mysql" or "sqlite".
+                    (Overrides DB_BACKEND from settings.py)""",
+        )
 
     def configure(self, options, conf):
         super(DBReporting, self).configure(options, conf)
         self.options = options
+        sb_config.db_backend = self.options.db_backend
         self.testcase_manager = TestcaseManager(self.options.database_env)
 
     def begin(self):
@@ -92,6 +105,7 @@ class DBReporting(Plugin):
         update the DB row with the execution time. """
         runtime = int(time.time() * 1000) - self.execution_start_time
         self.testcase_manager.update_execution_data(self.execution_guid, runtime)
+        db_writer.flush()
 
     def addSuccess(self, test, capt):
         """
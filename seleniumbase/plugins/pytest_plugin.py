@@ -4,9 +4,16 @@
 import pytest
 import sys
 from seleniumbase import config as sb_config
+from seleniumbase.config import settings
+from seleniumbase.core import artifact_writer
+from seleniumbase.core import browser_pool
+from seleniumbase.core import db_writer
+from seleniumbase.core import duration_helper
 from seleniumbase.core import log_helper
 from seleniumbase.core import proxy_helper
+from seleniumbase.core import settings_parser
 from seleniumbase.fixtures import constants
+from seleniumbase.fixtures import element_cache
 
 
 def pytest_addoption(parser):
@@ -50,11 +57,16 @@ def pytest_addoption(parser):
     --guest  (The option to enable Chrome's Guest mode.)
     --devtools  (The option to open Chrome's DevTools when the browser opens.)
     --reuse-session  (The option to reuse the browser session between tests.)
-    --crumbs  (Option to delete all cookies between tests reusing a session.)
+    --crumbs  (Option to reset cookies & storage between tests reusing a session.)
+    --browser-pool=SIZE  (Keep SIZE pre-launched browsers ready for tests.)
     --maximize  (The option to start with the web browser maximized.)
     --save-screenshot  (The option to save a screenshot after each test.)
     --visual-baseline  (Set the visual baseline for Visual/Layout tests.)
     --timeout-multiplier=MULTIPLIER  (Multiplies the default timeout values.)
+    --wait-strategy=STRATEGY  ("ready_state" or "network_idle" after actions.)
+    --screenshot-format=FORMAT  (Save screenshots as "png", "jpeg", or "webp".)
+    --screenshot-quality=QUALITY  (JPEG/WebP screenshot quality: 1 to 100.)
+    --screenshot-max-size=PIXELS  (Scale down larger screenshots to fit.)
     """
     parser = parser.getgroup("SeleniumBase", "SeleniumBase specific configuration options")
     parser.addoption(
@@ -181,6 +193,19 @@ def pytest_addoption(parser):
         default=False,
         help="Use to record test data in the MySQL database.",
     )
+    parser.addoption(
+        "--db_backend",
+        "--db-backend",
+        action="store",
+        dest="db_backend",
+        type=str.lower,
+        choices=constants.DatabaseBackend.valid_backends,
+        default=None,
+        help="""The database for --with-db_reporting. Use "sqlite"
+                          to save results to a local file (SQLITE_DB_PATH)
+                          without a MySQL server.
+                          (Overrides DB_BACKEND from settings.py)""",
+    )
     parser.addoption(
         "--database_env",
         "--database-env",
@@ -537,9 +562,36 @@ def pytest_addoption(parser):
         action="store_true",
         dest="crumbs",
         default=False,
-        help="""The option to delete all cookies between tests
-                          that reuse the same browser session. This option
-                          is only needed when using "--reuse-session".""",
+        help="""The option to delete all cookies and storage, and
+                          to close extra windows, between tests that reuse
+                          the same browser session. (reset_browser_state())
+                          This option is only needed with "--reuse-session".""",
+    )
+    parser.addoption(
+        "--browser_pool",
+        "--browser-pool",
+        action="store",
+        dest="browser_pool_size",
+        type=int,
+        default=0,
+        help="""The number of browsers to launch ahead of time
+                          (per process) in background threads. Tests get a
+                          browser from the pool, which gets reset and put
+                          back into the pool when the test ends. (With
+                          pytest-xdist, each worker gets its own pool.)
+                          (Can't be used with --user_data_dir.)""",
+    )
+    parser.addoption(
+        "--duration_order",
+        "--duration-order",
+        action="store_true",
+        dest="duration_order",
+        default=False,
+        help="""The option to run the slowest tests first, using
+                          the test durations saved by earlier runs with this
+                          option. (TEST_DURATIONS_FILE) With pytest-xdist,
+                          this keeps one slow test from running last while
+                          other workers wait. New tests keep their order.""",
     )
     parser.addoption(
         "--maximize_window",
@@ -582,6 +634,54 @@ def pytest_addoption(parser):
                           by the multiplier when waiting for page elements.
                           Unused when tests overide the default value.""",
     )
+    parser.addoption(
+        "--wait_strategy",
+        "--wait-strategy",
+        action="store",
+        dest="wait_strategy",
+        type=str.lower,
+        choices=constants.WaitStrategy.valid_strategies,
+        default=None,
+        help="""How to wait for pages to be ready after page loads
+                          and clicks. "ready_state" waits for readyState to
+                          be "complete". "network_idle" also waits for
+                          fetch/XHR calls to finish. (Overrides the
+                          WAIT_STRATEGY value from settings.py)""",
+    )
+    parser.addoption(
+        "--screenshot_format",
+        "--screenshot-format",
+        action="store",
+        dest="screenshot_format",
+        type=str.lower,
+        choices=constants.ScreenshotFormat.valid_formats,
+        default=None,
+        help="""The image format of saved screenshots (for logs,
+                          save_screenshot(), and check_window() baselines).
+                          Formats other than "png" require Pillow.
+                          (Overrides SCREENSHOT_FORMAT from settings.py)""",
+    )
+    parser.addoption(
+        "--screenshot_quality",
+        "--screenshot-quality",
+        action="store",
+        dest="screenshot_quality",
+        type=int,
+        default=None,
+        help="""The quality (1 to 100) of JPEG/WebP screenshots.
+                          (Overrides SCREENSHOT_QUALITY from settings.py)""",
+    )
+    parser.addoption(
+        "--screenshot_max_size",
+        "--screenshot-max-size",
+        action="store",
+        dest="screenshot_max_size",
+        type=int,
+        default=None,
+        help="""Screenshots larger than this many pixels (width or
+                          height) get scaled down to fit. Requires Pillow.
+                          (Overrides SCREENSHOT_MAX_SIZE from settings.py)""",
+    )
     for arg in sys.argv:
         if "--timeout=" in arg:
             raise Exception(
@@ -623,6 +723,7 @@ def pytest_configure(config):
     sb_config.settings_file = config.getoption("settings_file")
     sb_config.user_data_dir = config.getoption("user_data_dir")
     sb_config.database_env = config.getoption("database_env")
+    sb_config.db_backend = config.getoption("db_backend")
     sb_config.log_path = "latest_logs/"  # (No longer editable!)
     sb_config.archive_logs = config.getoption("archive_logs")
     sb_config._time_limit = config.getoption("time_limit")
@@ -646,11 +747,31 @@ def pytest_configure(config):
     sb_config.reuse_session = config.getoption("reuse_session")
     sb_config.crumbs = config.getoption("crumbs")
     sb_config.shared_driver = None  # The default driver for session reuse
+    sb_config.browser_pool_size = config.getoption("browser_pool_size")
+    sb_config.browser_pool = None  # Started at the end of pytest_configure()
     sb_config.maximize_option = config.getoption("maximize_option")
     sb_config.save_screenshot = config.getoption("save_screenshot")
     sb_config.visual_baseline = config.getoption("visual_baseline")
     sb_config.timeout_multiplier = config.getoption("timeout_multiplier")
+    sb_config.wait_strategy = config.getoption("wait_strategy")
+    sb_config.screenshot_format = config.getoption("screenshot_format")
+    sb_config.screenshot_quality = config.getoption("screenshot_quality")
+    sb_config.screenshot_max_size = config.getoption("screenshot_max_size")
     sb_config.pytest_html_report = config.getoption("htmlpath")  # --html=FILE
+    sb_config.duration_order = config.getoption("duration_order")
+    # With pytest-xdist, the controller process saves the test durations
+    sb_config._is_xdist_worker = hasattr(config, "workerinput") or hasattr(config, "slaveinput")
+    sb_config._test_durations = {}
+    sb_config._passed_tests = set()
+
+    if sb_config.browser_pool_size and sb_config.user_data_dir:
+        # Chrome can't run two browsers with the same user data dir at once,
+        # and pooled browsers get reset between tests. (Clearing the profile)
+        raise Exception(
+            "\n\n  --browser_pool can't be used with --user_data_dir! "
+            "\n  Pooled browsers run at the same time, and get reset "
+            "\n  between tests, which would clear the user data dir!\n"
+        )
 
     if sb_config.reuse_session:
         arg_join = " ".join(sys.argv)
@@ -667,6 +788,26 @@ def pytest_configure(config):
     if sb_config.with_testing_base:
         log_helper.log_folder_setup(sb_config.log_path, sb_config.archive_logs)
     proxy_helper.remove_proxy_zip_if_present()
+    _start_browser_pool(config)
+
+
+def _start_browser_pool(config):
+    """ With "--browser-pool", starts launching the browsers now, so that
+        they're ready when the first test starts. (Skipped in the pytest-xdist
+        controller process, since only the workers run tests.) """
+    if not sb_config.browser_pool_size or config.getoption("collectonly"):
+        return
+    is_xdist_controller = getattr(config.option, "dist", "no") != "no" and not sb_config._is_xdist_worker
+    if is_xdist_controller:
+        return
+    device_metrics = None
+    if sb_config.device_metrics:
+        device_metrics = browser_pool.parse_device_metrics(sb_config.device_metrics)
+        if not device_metrics:
+            return  # (The first test raises the exception for invalid metrics)
+    if sb_config.settings_file:
+        settings_parser.set_settings(sb_config.settings_file)
+    sb_config.browser_pool = browser_pool.start_pool(sb_config, sb_config.browser_pool_size, device_metrics)
 
 
 def pytest_unconfigure():
@@ -682,7 +823,37 @@ def pytest_unconfigure():
             except Exception:
                 pass
         sb_config.shared_driver = None
+    if sb_config.browser_pool:
+        sb_config.browser_pool.close()
+        sb_config.browser_pool = None
+    artifact_writer.flush()
+    db_writer.flush()
     log_helper.archive_logs_if_set(sb_config.log_path, sb_config.archive_logs)
+    if settings.CACHE_ELEMENT_LOOKUPS:
+        element_cache.print_summary()
+    if sb_config.duration_order and not sb_config._is_xdist_worker:
+        durations = sb_config._test_durations
+        duration_helper.save_durations(
+            dict((test_id, durations[test_id]) for test_id in sb_config._passed_tests)
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    """ Runs the slowest tests first. (With "--duration_order")
+        (With pytest-xdist, every worker gets the same order.) """
+    if config.getoption("duration_order"):
+        durations = duration_helper.load_durations()
+        items[:] = duration_helper.order_by_duration(items, durations, lambda item: item.nodeid)
+
+
+def pytest_runtest_logreport(report):
+    """ Adds up the durations of the setup, call, and teardown of tests.
+        (Only the durations of passing tests get saved.) """
+    if sb_config.duration_order and not sb_config._is_xdist_worker:
+        durations = sb_config._test_durations
+        durations[report.nodeid] = durations.get(report.nodeid, 0) + report.duration
+        if report.when == "call" and report.passed:
+            sb_config._passed_tests.add(report.nodeid)
 
 
 def pytest_runtest_setup():
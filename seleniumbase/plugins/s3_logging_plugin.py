@@ -5,6 +5,7 @@ The S3 Logging Plugin to upload all logs to the S3 bucket specifed.
 import uuid
 import logging
 import os
+from seleniumbase.core import artifact_writer
 from seleniumbase.core.s3_manager import S3LoggingBucket
 from nose.plugins import Plugin
 
@@ -23,6 +24,7 @@ class S3Logging(Plugin):
 
     def afterTest(self, test):
         """ After each testcase, upload logs to the S3 bucket. """
+        artifact_writer.flush()  # Finish writing the log files first
         s3_bucket = S3LoggingBucket()
         guid = str(uuid.uuid4().hex)
         path = "%s/%s" % (self.options.log_path, test.test.id())
@@ -5,6 +5,7 @@ Contains the screenshot plugin for the selenium tests.
 import os
 from nose.plugins import Plugin
 from seleniumbase.config import settings
+from seleniumbase.core import log_helper
 
 
 class ScreenShots(Plugin):
@@ -30,8 +31,7 @@ class ScreenShots(Plugin):
         test_logpath = self.options.log_path + "/" + test.id()
         if not os.path.exists(test_logpath):
             os.makedirs(test_logpath)
-        screenshot_file = "%s/%s" % (test_logpath, self.logfile_name)
-        test.driver.get_screenshot_as_file(screenshot_file)
+        log_helper.log_screenshot(test_logpath, test.driver)
 
     def addError(self, test, err, capt=None):
         self.add_screenshot(test, err, capt=capt)
@@ -44,6 +44,10 @@ class SeleniumBrowser(Plugin):
     --save-screenshot  (The option to save a screenshot after each test.)
     --visual-baseline  (Set the visual baseline for Visual/Layout tests.)
     --timeout-multiplier=MULTIPLIER  (Multiplies the default timeout values.)
+    --wait-strategy=STRATEGY  ("ready_state" or "network_idle" after actions.)
+    --screenshot-format=FORMAT  (Save screenshots as "png", "jpeg", or "webp".)
+    --screenshot-quality=QUALITY  (JPEG/WebP screenshot quality: 1 to 100.)
+    --screenshot-max-size=PIXELS  (Scale down larger screenshots to fit.)
     """
 
     name = "selenium"  # Usage: --with-selenium
@@ -418,6 +422,52 @@ class SeleniumBrowser(Plugin):
                     by the multiplier when waiting for page elements.
                     Unused when tests overide the default value.""",
         )
+        parser.add_option(
+            "--wait_strategy",
+            "--wait-strategy",
+            action="store",
+            dest="wait_strategy",
+            choices=constants.WaitStrategy.valid_strategies,
+            default=None,
+            help="""How to wait for pages to be ready after page loads
+                    and clicks. "ready_state" waits for readyState to
+                    be "complete". "network_idle" also waits for
+                    fetch/XHR calls to finish. (Overrides the
+                    WAIT_STRATEGY value from settings.py)""",
+        )
+        parser.add_option(
+            "--screenshot_format",
+            "--screenshot-format",
+            action="store",
+            dest="screenshot_format",
+            choices=constants.ScreenshotFormat.valid_formats,
+            default=None,
+            help="""The image format of saved screenshots (for logs,
+                    save_screenshot(), and check_window() baselines).
+                    Formats other than "png" require Pillow.
+                    (Overrides SCREENSHOT_FORMAT from settings.py)""",
+        )
+        parser.add_option(
+            "--screenshot_quality",
+            "--screenshot-quality",
+            action="store",
+            dest="screenshot_quality",
+            type="int",
+            default=None,
+            help="""The quality (1 to 100) of JPEG/WebP screenshots.
+                    (Overrides SCREENSHOT_QUALITY from settings.py)""",
+        )
+        parser.add_option(
+            "--screenshot_max_size",
+            "--screenshot-max-size",
+            action="store",
+            dest="screenshot_max_size",
+            type="int",
+            default=None,
+            help="""Screenshots larger than this many pixels (width or
+                    height) get scaled down to fit. Requires Pillow.
+                    (Overrides SCREENSHOT_MAX_SIZE from settings.py)""",
+        )
 
     def configure(self, options, conf):
         super(SeleniumBrowser, self).configure(options, conf)
@@ -463,8 +513,13 @@ class SeleniumBrowser(Plugin):
         test.test.save_screenshot_after_test = self.options.save_screenshot
         test.test.visual_baseline = self.options.visual_baseline
         test.test.timeout_multiplier = self.options.timeout_multiplier
+        test.test.wait_strategy = self.options.wait_strategy
+        test.test.screenshot_format = self.options.screenshot_format
+        test.test.screenshot_quality = self.options.screenshot_quality
+        test.test.screenshot_max_size = self.options.screenshot_max_size
         test.test.use_grid = False
         test.test._reuse_session = False
+        test.test._browser_pool_size = 0
         if test.test.servername != "localhost":
             # Use Selenium Grid (Use --server="127.0.0.1" for localhost Grid)
             test.test.use_grid = True
@@ -24,17 +24,28 @@ Output:
         plus the 2-letter language code of the new language.
         (Example: Translating "test_1.py" into Japanese with
         "-c" will create a new file called "test_1_ja.py".)
+Recursive mode:
+        seleniumbase translate [FOLDER] [LANGUAGE] [ACTION] --recursive
+        (Or: -r) Translates all the SeleniumBase Python files in the
+        folder and its subfolders, in parallel (with a process pool),
+        and then prints a summary. The action must be "-o" or "-c".
+        (With "-c", files that end with a language code are skipped.)
 """
 
 import codecs
+import collections
 import colorama
+import os
 import re
 import sys
+import time
+from seleniumbase.console_scripts import rewrite_engine
 from seleniumbase.translate import master_dict
 
 MD_F = master_dict.MD_F
 MD_L_Codes = master_dict.MD_L_Codes
 MD = master_dict.MD
+CLASS_LINE_REGEX = re.compile(r"""^(\s*)class\s+([\S]+)\(([\S]+)\):([\S\s]*)$""")
 
 
 def invalid_run_command(msg=None):
@@ -62,61 +73,94 @@ def invalid_run_command(msg=None):
     exp += "         plus the 2-letter language code of the new language.\n"
     exp += '         (Example: Translating "test_1.py" into Japanese with\n'
     exp += '          "-c" will create a new file called "test_1_ja.py".)\n'
+    exp += "  Recursive mode:\n"
+    exp += "         seleniumbase translate [FOLDER] [LANGUAGE] [ACTION] -r\n"
+    exp += "         -r / --recursive  (Translate all files in the folder\n"
+    exp += "                            and its subfolders, in parallel.)\n"
     if not msg:
         raise Exception("INVALID RUN COMMAND!\n\n%s" % exp)
     else:
         raise Exception("INVALID RUN COMMAND!\n%s\n\n%s" % (msg, exp))
 
 
+_language_tables = None
+_method_tables = {}  # Key: (source_lang, target_lang)
+
+
+def get_language_tables():
+    """ Returns the lookup tables for finding the language of a file,
+        which are built from the master dictionary once per process:
+        (import_line_regex, import_lines, parent_classes)
+        import_lines -> Key: import line, Value: (language, is_masterqa)
+        parent_classes -> Key: parent class, Value: (language, is_masterqa) """
+    global _language_tables
+    if not _language_tables:
+        import_lines = {}
+        parent_classes = {}
+        for lang in MD_F.get_languages_list():
+            import_lines[MD_F.get_import_line(lang)] = (lang, False)
+            import_lines[MD_F.get_mqa_im_line(lang)] = (lang, True)
+            parent_classes[MD_F.get_lang_parent_class(lang)] = (lang, False)
+            parent_classes[MD_F.get_mqa_lang_par_class(lang)] = (lang, True)
+        alternatives = sorted(import_lines.keys(), key=len, reverse=True)
+        import_line_regex = re.compile(r"^\s*(%s)([\S\s]*)$" % "|".join(re.escape(a) for a in alternatives))
+        _language_tables = (import_line_regex, import_lines, parent_classes)
+    return _language_tables
+
+
+def get_method_table(source_lang, target_lang):
+    """ Returns (method_names, method_regex) for translating method calls
+        from one language to another. method_names maps method names of
+        the source language to those of the target language. method_regex
+        finds all the source method calls of a line in a single pass.
+        (Built from the master dictionary once per language pair.) """
+    key = (source_lang, target_lang)
+    if key not in _method_tables:
+        source_code = MD_L_Codes.lang[source_lang]
+        target_code = MD_L_Codes.lang[target_lang]
+        method_names = {}
+        for names in MD.md.values():
+            # (If a name has several translations, the first one is used)
+            method_names.setdefault(names[source_code], names[target_code])
+        alternatives = sorted(method_names.keys(), key=len, reverse=True)
+        method_regex = re.compile(r"self\.(%s)\(" % "|".join(re.escape(a) for a in alternatives))
+        _method_tables[key] = (method_names, method_regex)
+    return _method_tables[key]
+
+
 def process_test_file(code_lines, new_lang):
     detected_lang = None
     changed = False
     seleniumbase_lines = []
-    lang_codes = MD_L_Codes.lang
-    nl_code = lang_codes[new_lang]  # new_lang language code
-    dl_code = None  # detected_lang language code
-    md = MD.md  # Master Dictionary
+    import_line_regex, import_lines, parent_classes = get_language_tables()
+    method_names = None
+    method_regex = None
+    method_names_lang = None
+
+    def swap(match):
+        return "self." + method_names[match.group(1)] + "("
 
     for line in code_lines:
         line = line.rstrip()
 
         # Find imports that determine the language
         if line.lstrip().startswith("from seleniumbase") and "import" in line:
-            added_line = False
-            for lang in MD_F.get_languages_list():
-                data = re.match(r"^\s*" + MD_F.get_import_line(lang) + r"([\S\s]*)$", line)
-                if data:
-                    comments = "%s" % data.group(1)
-                    new_line = None
-                    detected_lang = lang
-                    dl_code = lang_codes[detected_lang]
-                    if detected_lang != new_lang:
-                        changed = True
-                        new_line = MD_F.get_import_line(new_lang) + comments
-                    else:
-                        new_line = line
-                    if new_line.endswith("  # noqa"):  # Remove flake8 skip
-                        new_line = new_line[0 : -len("  # noqa")]
-                    seleniumbase_lines.append(new_line)
-                    added_line = True
-                    break
-                data = re.match(r"^\s*" + MD_F.get_mqa_im_line(lang) + r"([\S\s]*)$", line)
-                if data:
-                    comments = "%s" % data.group(1)
-                    new_line = None
-                    detected_lang = lang
-                    dl_code = lang_codes[detected_lang]
-                    if detected_lang != new_lang:
-                        changed = True
+            data = import_line_regex.match(line)
+            if data:
+                comments = "%s" % data.group(2)
+                detected_lang, is_masterqa = import_lines[data.group(1)]
+                if detected_lang != new_lang:
+                    changed = True
+                    if is_masterqa:
                         new_line = MD_F.get_mqa_im_line(new_lang) + comments
                     else:
-                        new_line = line
-                    if new_line.endswith("  # noqa"):  # Remove flake8 skip
-                        new_line = new_line[0 : -len("  # noqa")]
-                    seleniumbase_lines.append(new_line)
-                    added_line = True
-                    break
-            if not added_line:
+                        new_line = MD_F.get_import_line(new_lang) + comments
+                else:
+                    new_line = line
+                if new_line.endswith("  # noqa"):  # Remove flake8 skip
+                    new_line = new_line[0 : -len("  # noqa")]
+                seleniumbase_lines.append(new_line)
+            else:
                 # Probably a language missing from the translator.
                 # Add the import line as it is and move on.
                 seleniumbase_lines.append(line)
@@ -124,66 +168,39 @@ def process_test_file(code_lines, new_lang):
 
         # Find class definitions that determine the language
         if line.lstrip().startswith("class ") and ":" in line:
-            added_line = False
-            data = re.match(r"""^(\s*)class\s+([\S]+)\(([\S]+)\):([\S\s]*)$""", line)
-            if data:
+            data = CLASS_LINE_REGEX.match(line)
+            if data and data.group(3) in parent_classes:
                 whitespace = data.group(1)
                 name = "%s" % data.group(2)
-                parent_class = "%s" % data.group(3)
                 comments = "%s" % data.group(4)
-                if parent_class in MD_F.get_parent_classes_list():
-                    detected_lang = MD_F.get_parent_class_lang(parent_class)
-                    dl_code = lang_codes[detected_lang]
-                    if detected_lang != new_lang:
-                        changed = True
-                        new_parent = MD_F.get_lang_parent_class(new_lang)
-                        new_line = "%sclass %s(%s):%s" "" % (whitespace, name, new_parent, comments,)
-                    else:
-                        new_line = line
-                    if new_line.endswith("  # noqa"):  # Remove flake8 skip
-                        new_line = new_line[0 : -len("  # noqa")]
-                    seleniumbase_lines.append(new_line)
-                    added_line = True
-                    continue
-                elif parent_class in MD_F.get_masterqa_parent_classes_list():
-                    detected_lang = MD_F.get_mqa_par_class_lang(parent_class)
-                    dl_code = lang_codes[detected_lang]
-                    if detected_lang != new_lang:
-                        changed = True
+                detected_lang, is_masterqa = parent_classes[data.group(3)]
+                if detected_lang != new_lang:
+                    changed = True
+                    if is_masterqa:
                         new_parent = MD_F.get_mqa_lang_par_class(new_lang)
-                        new_line = "%sclass %s(%s):%s" "" % (whitespace, name, new_parent, comments,)
                     else:
-                        new_line = line
-                    if new_line.endswith("  # noqa"):  # Remove flake8 skip
-                        new_line = new_line[0 : -len("  # noqa")]
-                    seleniumbase_lines.append(new_line)
-                    added_line = True
-                    continue
-            if not added_line:
+                        new_parent = MD_F.get_lang_parent_class(new_lang)
+                    new_line = "%sclass %s(%s):%s" "" % (whitespace, name, new_parent, comments,)
+                else:
+                    new_line = line
+                if new_line.endswith("  # noqa"):  # Remove flake8 skip
+                    new_line = new_line[0 : -len("  # noqa")]
+                seleniumbase_lines.append(new_line)
+            else:
                 # Probably a language missing from the translator.
                 # Add the class definition line as it is and move on.
                 seleniumbase_lines.append(line)
             continue
 
         if "self." in line and "(" in line and detected_lang and (detected_lang != new_lang):
-            found_swap = False
-            replace_count = line.count("self.")  # Total possible replacements
-            for key in md.keys():
-                original = "self." + md[key][dl_code] + "("
-                if original in line:
-                    replacement = "self." + md[key][nl_code] + "("
-                    new_line = line.replace(original, replacement)
-                    found_swap = True
-                    replace_count -= 1
-                    if replace_count == 0:
-                        break  # Done making replacements
-                    else:
-                        # There might be another method to replace in the line.
-                        # Example: self.assert_true("Name" in self.get_title())
-                        line = new_line
-                        continue
+            if method_names_lang != detected_lang:
+                method_names, method_regex = get_method_table(detected_lang, new_lang)
+                method_names_lang = detected_lang
 
-            if found_swap:
+            # All the method calls of a line get swapped at the same time.
+            # Example: self.assert_true("Name" in self.get_title())
+            new_line, num_swaps = method_regex.subn(swap, line)
+            if num_swaps:
                 if new_line.endswith("  # noqa"):  # Remove flake8 skip
                     new_line = new_line[0 : -len("  # noqa")]
                 seleniumbase_lines.append(new_line)
@@ -194,6 +211,116 @@ def process_test_file(code_lines, new_lang):
     return seleniumbase_lines, changed, detected_lang
 
 
+def get_copy_file_name(file_path, new_lang):
+    """ Returns the file name of a translated copy ("-c" / "--copy"). """
+    base_file_name = file_path.split(".py")[0]
+    new_locale = MD_F.get_locale_code(new_lang)
+    new_ext = "_" + new_locale + ".py"
+    for locale in MD_F.get_locale_list():
+        ext = "_" + locale + ".py"
+        if file_path.endswith(ext):
+            base_file_name = file_path.split(ext)[0]
+            break
+    return base_file_name + new_ext
+
+
+def get_python_files(folder, skip_copies=False):
+    """ Returns the Python files in a folder and its subfolders. (Skipping
+        hidden folders.) With skip_copies, files that end with a language
+        code (such as "test_1_ja.py") are skipped, since translated copies
+        of them would have the same name as copies of the original files. """
+    python_files = []
+    locale_exts = tuple("_%s.py" % locale for locale in MD_F.get_locale_list())
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for file_name in sorted(files):
+            if not file_name.endswith(".py"):
+                continue
+            if skip_copies and file_name.endswith(locale_exts):
+                continue
+            python_files.append(os.path.join(root, file_name))
+    return python_files
+
+
+def translate_file(task):
+    """ Translates a file for a recursive run. (Runs in a worker process.)
+        task = (file_path, new_lang, copy)
+        Returns (file_path, status, detected_lang, new_file_name_or_error)
+        The status is "translated", "unchanged", "skipped", or "failed". """
+    file_path, new_lang, copy = task
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            all_code = f.read()
+        if "def test_" not in all_code and "from seleniumbase" not in all_code:
+            return file_path, "skipped", None, None
+        seleniumbase_lines, changed, detected_lang = process_test_file(all_code.split("\n"), new_lang)
+        if not changed:
+            return file_path, "unchanged", detected_lang, None
+        new_file_name = file_path
+        if copy:
+            new_file_name = get_copy_file_name(file_path, new_lang)
+        out_file = codecs.open(new_file_name, "w+", encoding="utf-8")
+        out_file.writelines("\r\n".join(seleniumbase_lines))
+        out_file.close()
+        return file_path, "translated", detected_lang, new_file_name
+    except Exception as e:
+        return file_path, "failed", None, "%s: %s" % (e.__class__.__name__, e)
+
+
+def translate_folder(folder, new_lang, copy=False):
+    """ Translates all the SeleniumBase files of a folder (and subfolders)
+        in parallel, and prints a summary. Returns the number of failures. """
+    c1 = colorama.Fore.BLUE + colorama.Back.LIGHTCYAN_EX
+    c2 = colorama.Fore.BLUE + colorama.Back.LIGHTYELLOW_EX
+    c5 = colorama.Fore.RED + colorama.Back.LIGHTYELLOW_EX
+    cr = colorama.Style.RESET_ALL
+    start_time = time.time()
+    tasks = [(file_path, new_lang, copy) for file_path in get_python_files(folder, skip_copies=copy)]
+    results = rewrite_engine.run_in_parallel(translate_file, tasks)
+    translated = collections.OrderedDict()  # Key: previous language
+    num_unchanged = 0
+    num_skipped = 0
+    failures = []
+    for file_path, status, detected_lang, info in results:
+        if status == "translated":
+            translated.setdefault(detected_lang, []).append((file_path, info))
+        elif status == "unchanged" and detected_lang:
+            num_unchanged += 1
+        elif status == "failed":
+            failures.append((file_path, info))
+        else:
+            num_skipped += 1  # Not a SeleniumBase test file
+    print("")
+    for detected_lang, files in translated.items():
+        for file_path, new_file_name in files:
+            if new_file_name == file_path:
+                print("%s (%s -> %s)" % (file_path, detected_lang, new_lang))
+            else:
+                print("%s (%s) -> %s%s%s" % (file_path, detected_lang, c1, new_file_name, cr))
+    for file_path, error in failures:
+        print("%s%s%s: %s" % (c5, file_path, cr, error))
+    num_translated = sum(len(files) for files in translated.values())
+    previous = ", ".join("%s: %s" % (lang, len(files)) for lang, files in translated.items())
+    print("")
+    summary = "* Translated %s%s%s file(s) to %s%s%s in %.2f seconds." % (
+        c1,
+        num_translated,
+        cr,
+        c2,
+        new_lang,
+        cr,
+        time.time() - start_time,
+    )
+    if previous:
+        summary += " (Previous: %s)" % previous
+    print(summary)
+    print(
+        "* Already in %s: %s | Not SeleniumBase tests: %s | Failed: %s\n"
+        % (new_lang, num_unchanged, num_skipped, len(failures))
+    )
+    return len(failures)
+
+
 def main():
     colorama.init(autoreset=True)
     c1 = colorama.Fore.BLUE + colorama.Back.LIGHTCYAN_EX
@@ -208,7 +335,7 @@ def main():
     command_args = sys.argv[2:]
 
     seleniumbase_file = command_args[0]
-    if not seleniumbase_file.endswith(".py"):
+    if not seleniumbase_file.endswith(".py") and not os.path.isdir(seleniumbase_file):
         raise Exception(
             "\n\n`%s` is not a Python file!\n\n" "Expecting: %s\n" % (seleniumbase_file, expected_arg)
         )
@@ -217,6 +344,7 @@ def main():
     overwrite = False
     copy = False
     print_only = False
+    recursive = False
     help_me = False
     if len(command_args) >= 2:
         options = command_args[1:]
@@ -230,6 +358,8 @@ def main():
                 copy = True
             elif option == "-p" or option == "--print":
                 print_only = True
+            elif option == "-r" or option == "--recursive":
+                recursive = True
             elif option == "--en" or option == "--english":
                 new_lang = "English"
             elif option == "--zh" or option == "--chinese":
@@ -362,6 +492,17 @@ def main():
         message = part_1 + example_run + usage
         raise Exception(message)
 
+    if recursive or os.path.isdir(seleniumbase_file):
+        if not os.path.isdir(seleniumbase_file):
+            raise Exception("\n\n`%s` is not a folder! (For -r / --recursive)\n" % seleniumbase_file)
+        if not recursive:
+            raise Exception("\n\n`%s` is a folder! Use -r / --recursive to translate it!\n" % seleniumbase_file)
+        if print_only or not (overwrite or copy):
+            raise Exception("\n\n-r / --recursive runs must use -o / --overwrite OR -c / --copy!\n")
+        if translate_folder(seleniumbase_file, new_lang, copy=copy):
+            sys.exit(1)
+        return
+
     with open(seleniumbase_file, "r", encoding="utf-8") as f:
         all_code = f.read()
     if "def test_" not in all_code and "from seleniumbase" not in all_code:
@@ -401,15 +542,7 @@ def main():
 
     new_file_name = None
     if copy:
-        base_file_name = seleniumbase_file.split(".py")[0]
-        new_locale = MD_F.get_locale_code(new_lang)
-        new_ext = "_" + new_locale + ".py"
-        for locale in MD_F.get_locale_list():
-            ext = "_" + locale + ".py"
-            if seleniumbase_file.endswith(ext):
-                base_file_name = seleniumbase_file.split(ext)[0]
-                break
-        new_file_name = base_file_name + new_ext
+        new_file_name = get_copy_file_name(seleniumbase_file, new_lang)
     elif overwrite:
         new_file_name = seleniumbase_file
     else:
@@ -0,0 +1,18 @@
+"""
+Unit tests for seleniumbase/core/asset_loader.py
+"""
+import os
+from seleniumbase.core import asset_loader
+from seleniumbase.fixtures import constants
+
+
+def test_bundled_assets_exist():
+    for link, file_name in asset_loader.BUNDLED_ASSETS.items():
+        assert os.path.exists(os.path.join(asset_loader.RESOURCES_DIR, file_name)), link
+        assert asset_loader.get_bundled_asset(link)
+
+
+def test_links_without_a_bundled_copy():
+    assert asset_loader.get_bundled_asset(constants.JQuery.MIN_JS) is None
+    assert asset_loader.get_bundled_asset("https://example.com/lib.js") is None
+
@@ -0,0 +1,150 @@
+"""
+Unit tests for seleniumbase/core/db_writer.py
+"""
+import threading
+from seleniumbase.config import settings
+from seleniumbase.core import db_writer
+from seleniumbase.core import results_store
+
+INSERT_QUERY = "INSERT INTO test_run_data (guid, state) VALUES (%(guid)s, %(state)s)"
+UPDATE_QUERY = "UPDATE test_run_data SET state = %(state)s WHERE guid = %(guid)s"
+
+
+class FakeDatabaseManager(object):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []  # A list of (method, query, params)
+        self.written = threading.Event()
+
+    def execute_many(self, query, params_list):
+        if self.fail:
+            raise Exception("Database unavailable")
+        self.calls.append(("execute_many", query, list(params_list)))
+        self.written.set()
+        return len(params_list)
+
+    def execute_query(self, query, params):
+        self.calls.append(("execute_query", query, params))
+        return 1
+
+
+def use_database(monkeypatch, manager):
+    monkeypatch.setattr(results_store, "get_database_manager", lambda database_env: manager)
+
+
+def make_writer(batch_size=100):
+    # (A long flush interval, so that only flush() and batch_size write)
+    return db_writer.DatabaseWriter("test", flush_interval=600, batch_size=batch_size)
+
+
+def test_consecutive_writes_of_a_query_are_grouped(monkeypatch):
+    manager = FakeDatabaseManager()
+    use_database(monkeypatch, manager)
+    writer = make_writer()
+    writer.write(INSERT_QUERY, {"guid": "a", "state": "Running"})
+    writer.write(INSERT_QUERY, {"guid": "b", "state": "Running"})
+    writer.write(UPDATE_QUERY, {"guid": "a", "state": "Passed"})
+    writer.write(UPDATE_QUERY, {"guid": "b", "state": "Failed"})
+    writer.write(UPDATE_QUERY, {"guid": "b", "state": "Passed"})
+    assert manager.calls == []  # (Nothing is written until a flush)
+    writer.flush()
+    assert manager.calls == [
+        (
+            "execute_many",
+            INSERT_QUERY,
+            [{"guid": "a", "state": "Running"}, {"guid": "b", "state": "Running"}],
+        ),
+        (
+            "execute_many",
+            UPDATE_QUERY,
+            [
+                {"guid": "a", "state": "Passed"},
+                {"guid": "b", "state": "Failed"},
+                {"guid": "b", "state": "Passed"},  # (Updates of a row stay in order)
+            ],
+        ),
+    ]
+    writer.flush()
+    assert len(manager.calls) == 2  # (The queue is empty after a flush)
+
+
+def test_interleaved_writes_are_not_reordered(monkeypatch):
+    # A batch that starts between the INSERT and the UPDATE of test "a"
+    manager = FakeDatabaseManager()
+    use_database(monkeypatch, manager)
+    writer = make_writer()
+    writer.write(UPDATE_QUERY, {"guid": "a", "state": "Passed"})
+    writer.write(INSERT_QUERY, {"guid": "b", "state": "Running"})
+    writer.write(UPDATE_QUERY, {"guid": "b", "state": "Passed"})
+    writer.flush()
+    assert [(call[1], [params["guid"] for params in call[2]]) for call in manager.calls] == [
+        (UPDATE_QUERY, ["a"]),
+        (INSERT_QUERY, ["b"]),
+        (UPDATE_QUERY, ["b"]),
+    ]
+
+
+def test_later_batches_keep_their_order(monkeypatch):
+    manager = FakeDatabaseManager()
+    use_database(monkeypatch, manager)
+    writer = make_writer()
+    writer.write(INSERT_QUERY, {"guid": "a", "state": "Running"})
+    writer.flush()
+    writer.write(UPDATE_QUERY, {"guid": "a", "state": "Passed"})
+    writer.write(INSERT_QUERY, {"guid": "b", "state": "Running"})
+    writer.flush()
+    assert [(call[1], len(call[2])) for call in manager.calls] == [
+        (INSERT_QUERY, 1),
+        (UPDATE_QUERY, 1),
+        (INSERT_QUERY, 1),
+    ]
+
+
+def test_full_batch_is_written_in_the_background(monkeypatch):
+    manager = FakeDatabaseManager()
+    use_database(monkeypatch, manager)
+    writer = make_writer(batch_size=3)
+    for guid in ("a", "b", "c"):
+        writer.write(INSERT_QUERY, {"guid": guid, "state": "Running"})
+    assert manager.written.wait(10)
+    assert manager.calls[0][0] == "execute_many"
+    assert [params["guid"] for params in manager.calls[0][2]] == ["a", "b", "c"]
+
+
+def test_write_errors_are_printed_on_flush(monkeypatch, capsys):
+    use_database(monkeypatch, FakeDatabaseManager(fail=True))
+    writer = make_writer()
+    writer.write(INSERT_QUERY, {"guid": "a", "state": "Running"})
+    writer.write(INSERT_QUERY, {"guid": "b", "state": "Running"})
+    writer.flush()
+    output = capsys.readouterr().out
+    assert "Unable to write 2 row(s) to the database! (Database unavailable)" in output
+    writer.flush()
+    assert capsys.readouterr().out == ""  # (Each error is printed once)
+
+
+def test_execute_query_inline(monkeypatch):
+    manager = FakeDatabaseManager()
+    use_database(monkeypatch, manager)
+    monkeypatch.setattr(settings, "DB_REPORTING_IN_BACKGROUND", False)
+    db_writer.execute_query("test", INSERT_QUERY, {"guid": "a", "state": "Running"})
+    assert manager.calls == [("execute_query", INSERT_QUERY, {"guid": "a", "state": "Running"})]
+
+
+def test_execute_query_in_the_background(monkeypatch):
+    manager = FakeDatabaseManager()
+    use_database(monkeypatch, manager)
+    monkeypatch.setattr(settings, "DB_REPORTING_IN_BACKGROUND", True)
+    monkeypatch.setattr(settings, "DB_REPORTING_FLUSH_INTERVAL", 600)
+    monkeypatch.setattr(db_writer, "_writers", {})
+    db_writer.execute_query("test", INSERT_QUERY, {"guid": "a", "state": "Running"})
+    db_writer.execute_query("test", INSERT_QUERY, {"guid": "b", "state": "Running"})
+    assert db_writer.get_writer("test") is db_writer.get_writer("test")
+    db_writer.flush()
+    assert manager.calls == [
+        (
+            "execute_many",
+            INSERT_QUERY,
+            [{"guid": "a", "state": "Running"}, {"guid": "b", "state": "Running"}],
+        )
+    ]
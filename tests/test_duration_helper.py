@@ -0,0 +1,75 @@
+"""
+Unit tests for seleniumbase/core/duration_helper.py
+"""
+import json
+from seleniumbase.core import duration_helper
+
+
+def get_test_id(test):
+    return test
+
+
+def test_order_by_duration():
+    durations = {"fast": 1.0, "slow": 9.0, "medium": 5.0}
+    tests = ["fast", "medium", "slow"]
+    ordered = duration_helper.order_by_duration(tests, durations, get_test_id)
+    assert ordered == ["slow", "medium", "fast"]
+    assert tests == ["fast", "medium", "slow"]  # (Not sorted in place)
+
+
+def test_unknown_tests_get_the_average_duration():
+    durations = {"fast": 1.0, "slow": 9.0}  # (Average: 5.0)
+    tests = ["new", "fast", "slow"]
+    assert duration_helper.order_by_duration(tests, durations, get_test_id) == ["slow", "new", "fast"]
+    durations = {"fast": 1.0, "slow": 9.0, "slower": 20.0}  # (Average: 10.0)
+    tests = ["fast", "slow", "new", "slower"]
+    assert duration_helper.order_by_duration(tests, durations, get_test_id) == [
+        "slower",
+        "new",
+        "slow",
+        "fast",
+    ]
+
+
+def test_equal_durations_keep_their_order():
+    durations = {"a": 2.0, "b": 2.0, "c": 3.0, "d": 2.0}
+    tests = ["d", "a", "c", "b"]
+    assert duration_helper.order_by_duration(tests, durations, get_test_id) == ["c", "d", "a", "b"]
+
+
+def test_order_without_durations():
+    tests = ["b", "c", "a"]
+    assert duration_helper.order_by_duration(tests, {}, get_test_id) == ["b", "c", "a"]
+    assert duration_helper.order_by_duration(tests, {"other": 1.0}, get_test_id) == ["b", "c", "a"]
+    assert duration_helper.order_by_duration([], {"other": 1.0}, get_test_id) == []
+
+
+def test_order_with_test_ids():
+    tests = [("file_a.py", "test_1"), ("file_b.py", "test_2")]
+    durations = {"file_a.py::test_1": 1.0, "file_b.py::test_2": 2.0}
+    ordered = duration_helper.order_by_duration(tests, durations, lambda test: "::".join(test))
+    assert ordered == [("file_b.py", "test_2"), ("file_a.py", "test_1")]
+
+
+def test_save_and_load_durations(tmp_path):
+    durations_file = str(tmp_path / "test_durations.json")
+    assert duration_helper.load_durations(durations_file) == {}
+    duration_helper.save_durations({"a": 2.0, "b": 1.23456}, durations_file)
+    assert duration_helper.load_durations(durations_file) == {"a": 2.0, "b": 1.235}
+    # Saved durations are a moving average (SMOOTHING = 0.5)
+    duration_helper.save_durations({"a": 4.0, "c": 3.0}, durations_file)
+    assert duration_helper.load_durations(durations_file) == {"a": 3.0, "b": 1.235, "c": 3.0}
+    duration_helper.save_durations({}, durations_file)
+    assert duration_helper.load_durations(durations_file) == {"a": 3.0, "b": 1.235, "c": 3.0}
+
+
+def test_load_invalid_durations(tmp_path):
+    durations_file = str(tmp_path / "test_durations.json")
+    with open(durations_file, "w") as f:
+        f.write("{Not JSON")
+    assert duration_helper.load_durations(durations_file) == {}
+    with open(durations_file, "w") as f:
+        f.write(json.dumps([1, 2, 3]))
+    assert duration_helper.load_durations(durations_file) == {}
+    duration_helper.save_durations({"a": 1.0}, durations_file)  # (Replaces the file)
+    assert duration_helper.load_durations(durations_file) == {"a": 1.0}
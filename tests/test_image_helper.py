@@ -0,0 +1,90 @@
+"""
+Unit tests for seleniumbase/core/image_helper.py (These require Pillow.)
+"""
+import io
+import pytest
+from seleniumbase.config import settings
+from seleniumbase.core import image_helper
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def make_png(size=(64, 48), color=(255, 255, 255), pixels=None):
+    """ Returns a PNG (as bytes). pixels: {(x, y): color} """
+    image = Image.new("RGB", size, color)
+    for position, pixel_color in (pixels or {}).items():
+        image.putpixel(position, pixel_color)
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+def test_compare_identical_images():
+    result = image_helper.compare_images(make_png(), make_png())
+    assert result["matches"]
+    assert result["ratio"] == 0.0
+    assert result["diff_png"] is None
+    assert result["size"] == result["baseline_size"] == (64, 48)
+
+
+def test_compare_images_with_a_different_pixel():
+    changed = make_png(pixels={(10, 10): (0, 0, 0)})
+    result = image_helper.compare_images(make_png(), changed)
+    assert not result["matches"]
+    assert result["ratio"] == 1 / (64.0 * 48)
+    diff_image = Image.open(io.BytesIO(result["diff_png"])).convert("RGB")
+    assert diff_image.getpixel((10, 10)) == (255, 0, 0)
+    assert diff_image.getpixel((0, 0)) == (255, 255, 255)
+
+
+def test_compare_images_within_tolerance():
+    changed = make_png(pixels={(10, 10): (250, 255, 255)})
+    assert image_helper.compare_images(make_png(), changed, tolerance=5)["matches"]
+    assert not image_helper.compare_images(make_png(), changed, tolerance=4)["matches"]
+
+
+def test_compare_images_within_max_ratio():
+    pixels = dict(((x, 0), (0, 0, 0)) for x in range(30))  # 30 of 3072 pixels
+    changed = make_png(pixels=pixels)
+    assert image_helper.compare_images(make_png(), changed, max_ratio=0.1)["matches"]
+    result = image_helper.compare_images(make_png(), changed, max_ratio=0.005)
+    assert not result["matches"]
+    assert result["ratio"] == 30 / (64.0 * 48)  # (Counted at full resolution)
+
+
+def test_compare_images_with_masks():
+    changed = make_png(pixels={(10, 10): (0, 0, 0), (40, 30): (0, 0, 0)})
+    masks = [(8, 8, 4, 4)]
+    result = image_helper.compare_images(make_png(), changed, masks=masks)
+    assert not result["matches"]
+    assert result["ratio"] == 1 / (64.0 * 48)
+    masks.append((40, 30, 1, 1))
+    assert image_helper.compare_images(make_png(), changed, masks=masks)["matches"]
+
+
+def test_compare_images_of_different_sizes():
+    result = image_helper.compare_images(make_png(), make_png(size=(64, 50)), max_ratio=1.0)
+    assert not result["matches"]
+    assert result["ratio"] == 1.0
+    assert result["size"] == (64, 50)
+    assert result["baseline_size"] == (64, 48)
+
+
+def test_scale_masks():
+    png = make_png()
+    assert image_helper.scale_masks([(1, 2, 3, 4)], png) == [(1, 2, 3, 4)]
+    assert image_helper.scale_masks([(1, 2, 3, 4)], png, pixel_ratio=2) == [(2, 4, 6, 8)]
+    # Rounded outwards, so the scaled masks cover the whole area
+    assert image_helper.scale_masks([(1, 1, 1, 1)], png, pixel_ratio=1.5) == [(1, 1, 2, 2)]
+    assert image_helper.scale_masks([], png) == []
+
+
+def test_scale_masks_of_a_scaled_down_screenshot(monkeypatch):
+    monkeypatch.setattr(settings, "SCREENSHOT_MAX_SIZE", 32)
+    image_data, _ = image_helper.encode_screenshot(make_png(size=(64, 48)))
+    assert Image.open(io.BytesIO(image_data)).size == (32, 24)
+    assert image_helper.get_original_size(image_data) == (64, 48)
+    masks = image_helper.scale_masks([(2, 2, 4, 4), (3, 3, 2, 2)], image_data)
+    assert masks == [(1, 1, 2, 2), (1, 1, 2, 2)]
+    masks = image_helper.scale_masks([(2, 2, 4, 4)], image_data, pixel_ratio=2)
+    assert masks == [(2, 2, 4, 4)]
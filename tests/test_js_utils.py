@@ -0,0 +1,37 @@
+"""
+Unit tests for seleniumbase/fixtures/js_utils.py (With a fake WebDriver)
+"""
+from selenium.webdriver.common.by import By
+from seleniumbase.fixtures import js_utils
+
+
+class FakeDriver(object):
+    def __init__(self):
+        self.script_timeouts = []
+
+    def set_script_timeout(self, timeout):
+        self.script_timeouts.append(timeout)
+
+    def execute_async_script(self, script, *args):
+        return True
+
+
+def test_waits_never_lower_the_script_timeout():
+    driver = FakeDriver()
+    js_utils.wait_for_network_idle(driver, timeout=6)
+    assert driver.script_timeouts == [js_utils.DEFAULT_SCRIPT_TIMEOUT]
+    js_utils.wait_for_dom_condition(driver, "div", By.CSS_SELECTOR, "present", timeout=2)
+    js_utils.wait_for_network_idle(driver, timeout=6)
+    assert driver.script_timeouts == [js_utils.DEFAULT_SCRIPT_TIMEOUT]  # (Set once)
+    js_utils.wait_for_network_idle(driver, timeout=60)
+    assert driver.script_timeouts == [js_utils.DEFAULT_SCRIPT_TIMEOUT, 61]
+    js_utils.wait_for_dom_condition(driver, "div", By.CSS_SELECTOR, "present", timeout=2)
+    assert driver.script_timeouts == [js_utils.DEFAULT_SCRIPT_TIMEOUT, 61]
+
+
+def test_execute_async_script_sets_the_given_timeout():
+    driver = FakeDriver()
+    js_utils.execute_async_script(driver, "arguments[0](true);", timeout=5)
+    assert driver.script_timeouts == [5]
+    js_utils.wait_for_network_idle(driver, timeout=10)
+    assert driver.script_timeouts == [5, 11]
@@ -0,0 +1,22 @@
+"""
+Unit tests for seleniumbase/core/log_helper.py
+"""
+import os
+import pytest
+from seleniumbase.config import settings
+from seleniumbase.core import log_helper
+
+PNG = b"\x89PNG\r\n\x1a\nNot a real image"  # (Saved as-is with default settings)
+
+
+@pytest.mark.parametrize("screenshot_name", ["screenshot.png", "screenshot", "failure.shot"])
+def test_screenshot_is_saved_where_the_reports_link(tmp_path, monkeypatch, screenshot_name):
+    monkeypatch.setattr(settings, "SCREENSHOT_NAME", screenshot_name)
+    monkeypatch.setattr(settings, "WRITE_LOG_FILES_IN_BACKGROUND", False)
+    test_logpath = str(tmp_path)
+    log_helper.log_screenshot(test_logpath, None, screenshot=PNG)
+    screenshot_path = log_helper.get_screenshot_path(test_logpath)
+    assert os.path.basename(screenshot_path).endswith(".png")
+    assert os.listdir(test_logpath) == [os.path.basename(screenshot_path)]
+    with open(screenshot_path, "rb") as f:
+        assert f.read() == PNG
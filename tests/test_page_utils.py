@@ -0,0 +1,100 @@
+"""
+Unit tests for seleniumbase/fixtures/page_utils.py
+"""
+from bs4 import BeautifulSoup
+from seleniumbase.fixtures import page_utils
+from seleniumbase.fixtures import shared_utils
+
+PAGE_URL = "https://example.com/docs/page.html"
+
+
+def get_unique_links(html, page_url=PAGE_URL):
+    return page_utils._get_unique_links(page_url, BeautifulSoup(html, "html.parser"))
+
+
+def test_get_unique_links_resolves_relative_links():
+    html = """
+        <a href="other.html">Other</a>
+        <a href="/root.html">Root</a>
+        <a href="../up.html">Up</a>
+        <a href="//cdn.example.com/lib.js">CDN</a>
+        <a href="https://example.org/">Absolute</a>
+        <a href="?page=2">Query</a>
+        """
+    assert get_unique_links(html) == [
+        "https://example.com/docs/other.html",
+        "https://example.com/root.html",
+        "https://example.com/up.html",
+        "https://cdn.example.com/lib.js",
+        "https://example.org/",
+        "https://example.com/docs/page.html?page=2",
+    ]
+
+
+def test_get_unique_links_uses_base_href():
+    html = """
+        <head><base href="https://static.example.com/v2/"></head>
+        <a href="other.html">Other</a>
+        <a href="/root.html">Root</a>
+        <img src="images/logo.png">
+        """
+    assert get_unique_links(html) == [
+        "https://static.example.com/v2/other.html",
+        "https://static.example.com/root.html",
+        "https://static.example.com/v2/images/logo.png",
+    ]
+
+
+def test_get_unique_links_uses_relative_base_href():
+    html = '<base href="/v3/"><a href="other.html">Other</a>'
+    assert get_unique_links(html) == ["https://example.com/v3/other.html"]
+
+
+def test_get_unique_links_order_and_duplicates():
+    # Links are grouped by tag type: "a", "img", "link", then "script"
+    html = """
+        <script src="app.js"></script>
+        <link href="style.css" rel="stylesheet">
+        <img src="logo.png">
+        <a href="other.html">Other</a>
+        <a href=" other.html ">Other again</a>
+        <a href="https://example.com/docs/other.html">Other, absolute</a>
+        <a href="/">Too short</a>
+        <a>No href</a>
+        """
+    assert get_unique_links(html) == [
+        "https://example.com/docs/other.html",
+        "https://example.com/docs/logo.png",
+        "https://example.com/docs/style.css",
+        "https://example.com/docs/app.js",
+    ]
+
+
+def test_get_unique_links_ignores_non_http_pages():
+    html = '<a href="other.html">Other</a>'
+    assert get_unique_links(html, page_url="file:///tmp/page.html") == []
+    assert get_unique_links(html, page_url="data:text/html,<p>") == []
+
+
+def test_get_beautiful_soup_cache():
+    cache = shared_utils.LRUCache(max_size=10)
+    source = "<html><body><p>Hello</p></body></html>"
+    soup = page_utils._get_beautiful_soup(source, parser="html.parser", cache=cache)
+    assert soup.p.text == "Hello"
+    assert page_utils._get_beautiful_soup(source, parser="html.parser", cache=cache) is soup
+    other_source = source.replace("Hello", "Goodbye")
+    other_soup = page_utils._get_beautiful_soup(other_source, parser="html.parser", cache=cache)
+    assert other_soup is not soup
+    assert other_soup.p.text == "Goodbye"
+    assert cache.stats()["hits"] == 1
+
+
+def test_get_beautiful_soup_without_cache():
+    source = "<p>Hello</p>"
+    soup = page_utils._get_beautiful_soup(source, parser="html.parser")
+    assert page_utils._get_beautiful_soup(source, parser="html.parser") is not soup
+
+
+def test_get_html_parser_falls_back_to_html_parser():
+    assert page_utils.get_html_parser("html.parser") == "html.parser"
+    assert page_utils.get_html_parser("not-a-parser") == "html.parser"
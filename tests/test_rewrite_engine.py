@@ -0,0 +1,120 @@
+"""
+Unit tests for seleniumbase/console_scripts/rewrite_engine.py
+"""
+from seleniumbase.console_scripts import objectify
+from seleniumbase.console_scripts import rewrite_engine
+
+
+def get_calls(code, methods=None):
+    parsed_code = rewrite_engine.ParsedCode(code)
+    return parsed_code, list(parsed_code.find_method_calls(methods))
+
+
+def test_find_method_calls():
+    code = 'self.open("https://example.com/")\nself.click("#button")\n'
+    parsed_code, calls = get_calls(code)
+    assert [call.method for call in calls] == ["open", "click"]
+    assert [parsed_code.get_text(call.args[0]) for call in calls] == ['"https://example.com/"', '"#button"']
+    assert [call.end_row for call in calls] == [1, 2]
+
+
+def test_find_method_calls_of_some_methods():
+    code = 'self.open("https://example.com/")\nself.click("#button")\nsb.click("#other")\n'
+    _, calls = get_calls(code, methods=["click"])
+    assert [call.method for call in calls] == ["click"]
+    code = 'self.driver.click("#button")\nself.helper.self.click("#other")\n'
+    _, calls = get_calls(code, methods=["click"])
+    assert calls == []  # (Only calls of "self.<method>(...)")
+
+
+def test_multi_line_call():
+    code = (
+        "self.update_text(\n"
+        '    "input#name",  # The name field\n'
+        '    "Hello, (World)!",\n'
+        "    timeout=10,\n"
+        ")\n"
+        'self.click("#go")\n'
+    )
+    parsed_code, calls = get_calls(code)
+    assert [call.method for call in calls] == ["update_text", "click"]
+    call = calls[0]
+    assert [parsed_code.get_text(arg) for arg in call.args] == ['"input#name"', '"Hello, (World)!"']
+    assert parsed_code.get_text(call.kwargs["timeout"]) == "10"
+    assert call.start == (1, 0)
+    assert call.end_row == 5
+    assert call.args[0].start == (2, 4)
+
+
+def test_nested_calls():
+    code = 'self.click(self.get_selector("a", ("b", "c")), by=By.CSS_SELECTOR)\n'
+    parsed_code, calls = get_calls(code)
+    assert [call.method for call in calls] == ["click", "get_selector"]
+    outer, inner = calls
+    assert len(outer.args) == 1
+    assert parsed_code.get_text(outer.args[0]) == 'self.get_selector("a", ("b", "c"))'
+    assert parsed_code.get_text(outer.kwargs["by"]) == "By.CSS_SELECTOR"
+    assert [parsed_code.get_text(arg) for arg in inner.args] == ['"a"', '("b", "c")']
+
+
+def test_get_argument():
+    _, calls = get_calls('self.click("#a", timeout=5)\nself.click(selector="#b")\n')
+    assert rewrite_engine.get_argument(calls[0], 0, "selector").tokens[0][1] == '"#a"'
+    assert rewrite_engine.get_argument(calls[1], 0, "selector").tokens[0][1] == '"#b"'
+    assert rewrite_engine.get_argument(calls[0], 1) is None
+    assert rewrite_engine.get_argument(calls[0], 1, "by") is None
+
+
+def test_argument_types():
+    code = 'self.click("#a" + b, r"#raw", f"#{c}", Page.button, x.y(), "#one" "#two")\n'
+    _, calls = get_calls(code)
+    args = calls[0].args
+    string_literals = [rewrite_engine.is_string_literal(arg) for arg in args]
+    assert string_literals == [False, True, False, False, False, False]
+    dotted_names = [rewrite_engine.is_dotted_name(arg) for arg in args]
+    assert dotted_names == [False, False, False, True, False, False]
+
+
+def test_comments_and_line_ends():
+    code = 'self.click("#a")  # Click it\nself.click(\n    "#b"\n)\n'
+    parsed_code = rewrite_engine.ParsedCode(code)
+    assert list(parsed_code.comments.keys()) == [1]
+    assert parsed_code.comments[1][1] == "# Click it"
+    assert parsed_code.get_line_end(1) == (1, 28)
+    assert parsed_code.get_line_end(4) == (4, 1)
+
+
+def test_apply_edits():
+    code = "self.click(\n    '#a',\n)\nself.type('#b', 'text')\n"
+    parsed_code, calls = get_calls(code)
+    edits = [
+        (calls[1].args[0].start, calls[1].args[0].end, "Page.b"),
+        (calls[0].args[0].start, calls[0].args[0].end, "Page.a"),
+    ]
+    new_code = parsed_code.apply_edits(edits)
+    assert new_code == "self.click(\n    Page.a,\n)\nself.type(Page.b, 'text')\n"
+
+
+def test_objectify_multi_line_and_nested_calls():
+    code_lines = [
+        "    def test_it(self):",
+        "        self.click(",
+        '            "button#submit"',
+        "        )",
+        '        self.assert_text("Done", self.find_element("div.result").text)',
+        '        self.type("input#name", "button#submit")',
+    ]
+    _, page_selectors, _ = objectify.process_test_file(code_lines)
+    # (The text of assert_text() isn't a string, and find_element() is nested)
+    assert page_selectors == ['"button#submit"', '"div.result"', '"input#name"']
+    selector_dict = {'"button#submit"': "Page.submit", '"input#name"': "Page.name"}
+    new_lines, _, changed = objectify.process_test_file(code_lines, selector_dict=selector_dict)
+    assert new_lines == [
+        "    def test_it(self):",
+        "        self.click(",
+        "            Page.submit",
+        "        )",
+        '        self.assert_text("Done", self.find_element("div.result").text)',
+        '        self.type(Page.name, "button#submit")',
+    ]
+    assert changed == ["Page", "Page"]
@@ -0,0 +1,89 @@
+"""
+Unit tests for the file caches of settings_parser.py and capabilities_parser.py
+"""
+import json
+import os
+import pytest
+from seleniumbase.config import settings
+from seleniumbase.core import capabilities_parser
+from seleniumbase.core import settings_parser
+from seleniumbase.fixtures import shared_utils
+
+
+@pytest.fixture
+def parser_state(monkeypatch):
+    """ Gives each test empty caches, and restores the settings it changes. """
+    monkeypatch.setattr(settings_parser, "_cache", shared_utils.LRUCache(max_size=16))
+    monkeypatch.setattr(settings_parser, "_applied_key", None)
+    monkeypatch.setattr(capabilities_parser, "_cache", shared_utils.LRUCache(max_size=16))
+    for key in ("MINI_TIMEOUT", "SMALL_TIMEOUT"):
+        monkeypatch.setattr(settings, key, getattr(settings, key))
+
+
+def write_file(file_path, content, mtime):
+    with open(file_path, "w") as f:
+        f.write(content)
+    os.utime(file_path, (mtime, mtime))
+
+
+def test_settings_file_is_parsed_once(tmp_path, monkeypatch, parser_state):
+    settings_file = str(tmp_path / "my_settings.py")
+    write_file(settings_file, 'MINI_TIMEOUT = 3\nSMALL_TIMEOUT = 7\nNAME = "value"\n', 1000000)
+    parsed_files = []
+    parse_settings_file = settings_parser._parse_settings_file
+
+    def counting_parse_settings_file(file_path):
+        parsed_files.append(file_path)
+        return parse_settings_file(file_path)
+
+    monkeypatch.setattr(settings_parser, "_parse_settings_file", counting_parse_settings_file)
+    overrides = settings_parser.set_settings(settings_file)
+    assert overrides == {"MINI_TIMEOUT": 3, "SMALL_TIMEOUT": 7, "NAME": "value"}
+    assert settings.MINI_TIMEOUT == 3
+    assert settings.SMALL_TIMEOUT == 7
+    overrides["MINI_TIMEOUT"] = 99  # (Each call gets its own copy)
+    assert settings_parser.set_settings(settings_file)["MINI_TIMEOUT"] == 3
+    assert len(parsed_files) == 1
+
+
+def test_settings_file_is_parsed_again_when_changed(tmp_path, parser_state):
+    settings_file = str(tmp_path / "my_settings.py")
+    write_file(settings_file, "MINI_TIMEOUT = 3\n", 1000000)
+    assert settings_parser.set_settings(settings_file) == {"MINI_TIMEOUT": 3}
+    # A new mtime (with the same size) invalidates the cached file
+    write_file(settings_file, "MINI_TIMEOUT = 4\n", 1000010)
+    assert settings_parser.set_settings(settings_file) == {"MINI_TIMEOUT": 4}
+    assert settings.MINI_TIMEOUT == 4
+    # A new size invalidates it too, even if the mtime is the same
+    write_file(settings_file, "MINI_TIMEOUT = 5\nSMALL_TIMEOUT = 8\n", 1000010)
+    assert settings_parser.set_settings(settings_file) == {"MINI_TIMEOUT": 5, "SMALL_TIMEOUT": 8}
+    assert settings.MINI_TIMEOUT == 5
+    assert settings.SMALL_TIMEOUT == 8
+
+
+def test_settings_are_applied_again_after_another_file(tmp_path, parser_state):
+    first_file = str(tmp_path / "first_settings.py")
+    second_file = str(tmp_path / "second_settings.py")
+    write_file(first_file, "MINI_TIMEOUT = 3\n", 1000000)
+    write_file(second_file, "MINI_TIMEOUT = 6\n", 1000000)
+    settings_parser.set_settings(first_file)
+    settings_parser.set_settings(second_file)
+    assert settings.MINI_TIMEOUT == 6
+    settings_parser.set_settings(first_file)  # (Cached, but applied again)
+    assert settings.MINI_TIMEOUT == 3
+
+
+def test_settings_file_must_be_a_python_file(tmp_path, parser_state):
+    with pytest.raises(Exception):
+        settings_parser.set_settings(str(tmp_path / "my_settings.txt"))
+
+
+def test_capabilities_file_cache(tmp_path, parser_state):
+    cap_file = str(tmp_path / "capabilities.json")
+    write_file(cap_file, json.dumps({"browserName": "chrome"}), 1000000)
+    capabilities = capabilities_parser.get_desired_capabilities(cap_file)
+    assert capabilities == {"browserName": "chrome"}
+    capabilities["browserName"] = "firefox"  # (Each call gets its own copy)
+    assert capabilities_parser.get_desired_capabilities(cap_file) == {"browserName": "chrome"}
+    write_file(cap_file, json.dumps({"browserName": "safari"}), 1000010)
+    assert capabilities_parser.get_desired_capabilities(cap_file) == {"browserName": "safari"}
@@ -0,0 +1,97 @@
+"""
+Unit tests for seleniumbase/fixtures/shared_utils.py
+"""
+import os
+import stat
+import pytest
+from seleniumbase.fixtures import shared_utils
+
+
+class FakeTime(object):
+    """ Replaces the time module of shared_utils, to control time.time() """
+
+    now = 1000.0
+
+    @classmethod
+    def time(cls):
+        return cls.now
+
+
+def test_lru_cache_get_and_set():
+    cache = shared_utils.LRUCache(max_size=2)
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    cache.set("a", 2)
+    assert cache.get("a") == 2
+    assert len(cache) == 1
+
+
+def test_lru_cache_drops_least_recently_used():
+    cache = shared_utils.LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least-recently-used entry
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_ttl(monkeypatch):
+    monkeypatch.setattr(shared_utils, "time", FakeTime)
+    FakeTime.now = 1000.0
+    cache = shared_utils.LRUCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    FakeTime.now = 1059.0
+    assert cache.get("a") == 1
+    FakeTime.now = 1061.0
+    assert cache.get("a") is None
+    assert len(cache) == 0  # (Expired entries get removed)
+    cache.set("a", 2)  # Setting an entry again restarts its ttl
+    FakeTime.now = 1120.0
+    assert cache.get("a") == 2
+
+
+def test_lru_cache_without_ttl_never_expires(monkeypatch):
+    monkeypatch.setattr(shared_utils, "time", FakeTime)
+    FakeTime.now = 1000.0
+    cache = shared_utils.LRUCache(max_size=10)
+    cache.set("a", 1)
+    FakeTime.now = 10 ** 9
+    assert cache.get("a") == 1
+
+
+def test_lru_cache_stats():
+    cache = shared_utils.LRUCache(max_size=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 10}
+
+
+def test_write_file_atomically(tmp_path):
+    file_path = str(tmp_path / "data.json")
+    shared_utils.write_file_atomically(file_path, "Text \u2713")
+    with open(file_path, "rb") as f:
+        assert f.read() == "Text \u2713".encode("utf-8")
+    shared_utils.write_file_atomically(file_path, b"Bytes")
+    with open(file_path, "rb") as f:
+        assert f.read() == b"Bytes"
+    assert os.listdir(str(tmp_path)) == ["data.json"]  # (No temp files left)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Uses POSIX file permissions")
+def test_write_file_atomically_permissions(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        file_path = str(tmp_path / "new_file.txt")
+        shared_utils.write_file_atomically(file_path, "data")
+        assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o644  # (Not 0o600)
+        os.chmod(file_path, 0o640)
+        shared_utils.write_file_atomically(file_path, "new data")
+        assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o640  # (Kept)
+    finally:
+        os.umask(old_umask)
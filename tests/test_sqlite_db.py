@@ -0,0 +1,131 @@
+"""
+Unit tests for seleniumbase/core/sqlite_db.py (The SQLite results database)
+"""
+import multiprocessing
+import pytest
+from seleniumbase import config as sb_config
+from seleniumbase.config import settings
+from seleniumbase.core import db_writer
+from seleniumbase.core import results_store
+from seleniumbase.core import sqlite_db
+from seleniumbase.core import testcase_manager
+
+INSERT_QUERY = """INSERT INTO test_execution
+                  (guid, execution_start, total_execution_time, username)
+                  VALUES (%(guid)s, %(start)s, %(time)s, %(username)s)"""
+SELECT_QUERY = "SELECT guid, total_execution_time FROM test_execution WHERE guid=%(guid)s"
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """ Uses a new SQLite database (in a folder that doesn't exist yet). """
+    db_path = str(tmp_path / "results" / "test_results.db")
+    monkeypatch.setattr(settings, "SQLITE_DB_PATH", db_path)
+    monkeypatch.setattr(settings, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(sb_config, "db_backend", None, raising=False)
+    monkeypatch.setattr(sb_config, "settings_file", None, raising=False)
+    return db_path
+
+
+def test_convert_query():
+    assert sqlite_db.convert_query(SELECT_QUERY) == (
+        "SELECT guid, total_execution_time FROM test_execution WHERE guid=:guid"
+    )
+    assert sqlite_db.convert_query("SELECT 1") == "SELECT 1"
+
+
+def test_tables_are_created(db_path):
+    manager = sqlite_db.DatabaseManager()
+    assert manager.db_path == db_path
+    tables = manager.query_fetch_all("SELECT name FROM sqlite_master WHERE type='table'", {})
+    assert sorted(table[0] for table in tables) == ["test_execution", "test_run_data"]
+    indexes = manager.query_fetch_all("SELECT name FROM sqlite_master WHERE type='index'", {})
+    assert "idx_test_run_data_test_address" in [index[0] for index in indexes]
+    assert manager.query_fetch_one("PRAGMA journal_mode", {}) == ("wal",)
+
+
+def test_queries(db_path):
+    manager = sqlite_db.DatabaseManager()
+    params = {"guid": "a", "start": 1, "time": -1, "username": "user"}
+    assert manager.execute_query(INSERT_QUERY, params) == 1
+    assert manager.query_fetch_one(SELECT_QUERY, {"guid": "a"}) == ("a", -1)
+    assert manager.query_fetch_one(SELECT_QUERY, {"guid": "b"}) is None
+    params_list = [
+        {"guid": "b", "start": 2, "time": 20, "username": "user"},
+        {"guid": "c", "start": 3, "time": 30, "username": "user"},
+    ]
+    assert manager.execute_many(INSERT_QUERY, params_list) == 2
+    rows = manager.query_fetch_all("SELECT guid FROM test_execution ORDER BY guid", {})
+    assert rows == [("a",), ("b",), ("c",)]
+    # Another DatabaseManager (in the same thread) shares the connection
+    assert sqlite_db.DatabaseManager().conn is manager.conn
+
+
+def test_failed_execute_many_is_rolled_back(db_path):
+    manager = sqlite_db.DatabaseManager()
+    params_list = [
+        {"guid": "a", "start": 1, "time": 10, "username": "user"},
+        {"guid": "a", "start": 2, "time": 20, "username": "user"},  # (Duplicate key)
+    ]
+    with pytest.raises(Exception):
+        manager.execute_many(INSERT_QUERY, params_list)
+    assert manager.query_fetch_all("SELECT guid FROM test_execution", {}) == []
+    assert manager.execute_many(INSERT_QUERY, params_list[:1]) == 1  # (No open transaction)
+
+
+def test_get_database_manager(db_path, monkeypatch):
+    assert results_store.get_backend() == "sqlite"
+    assert isinstance(results_store.get_database_manager(), sqlite_db.DatabaseManager)
+    monkeypatch.setattr(sb_config, "db_backend", "SQLite")  # (From "--db_backend")
+    monkeypatch.setattr(settings, "DB_BACKEND", "mysql")
+    assert results_store.get_backend() == "sqlite"
+    monkeypatch.setattr(sb_config, "db_backend", "postgres")
+    with pytest.raises(Exception):
+        results_store.get_backend()
+
+
+@pytest.mark.parametrize("in_background", [False, True])
+def test_testcase_history(db_path, monkeypatch, in_background):
+    monkeypatch.setattr(settings, "DB_REPORTING_IN_BACKGROUND", in_background)
+    monkeypatch.setattr(db_writer, "_writers", {})
+    manager = testcase_manager.TestcaseManager("test")
+    for run, state in enumerate(["Passed", "Failed", "Passed"]):
+        payload = testcase_manager.TestcaseDataPayload()
+        payload.guid = "guid_%s" % run
+        payload.test_address = "test_file.MyTests.test_one"
+        payload.execution_guid = "execution_%s" % run
+        payload.start_time = 1000 + run
+        payload.state = "Running"
+        manager.insert_testcase_data(payload)
+        payload.state = state
+        payload.runtime = 100 * (run + 1)
+        manager.update_testcase_data(payload)
+    history = manager.get_testcase_history("test_file.MyTests.test_one", limit=2)
+    assert history == [("1002", 300, "Passed", "execution_2"), ("1001", 200, "Failed", "execution_1")]
+    assert manager.get_testcase_history("test_file.MyTests.test_two") == []
+
+
+def insert_rows(task):
+    """ Inserts rows from another process. (See the test below) """
+    db_path, process_number = task
+    settings.SQLITE_DB_PATH = db_path
+    manager = sqlite_db.DatabaseManager()
+    for i in range(20):
+        params_list = [
+            {"guid": "%s_%s_%s" % (process_number, i, j), "start": i, "time": j, "username": "user"}
+            for j in range(5)
+        ]
+        manager.execute_many(INSERT_QUERY, params_list)
+    return process_number
+
+
+def test_parallel_processes(db_path):
+    sqlite_db.DatabaseManager()  # (Creates the database first)
+    pool = multiprocessing.Pool(4)
+    try:
+        assert pool.map(insert_rows, [(db_path, number) for number in range(4)]) == [0, 1, 2, 3]
+    finally:
+        pool.close()
+        pool.join()
+    manager = sqlite_db.DatabaseManager()
+    assert manager.query_fetch_one("SELECT COUNT(*) FROM test_execution", {}) == (4 * 20 * 5,)
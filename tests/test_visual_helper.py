@@ -0,0 +1,141 @@
+"""
+Unit tests for seleniumbase/core/visual_helper.py
+"""
+import os
+import pytest
+from seleniumbase.config import settings
+from seleniumbase.core import visual_helper
+
+PNG = b"\x89PNG\r\n\x1a\nNot a real image"  # (Saved as-is with default settings)
+PAGE_URL = "https://example.com/"
+LEVELS = (
+    [["html"], ["body"]],
+    [["html", ["lang"]], ["body", ["class"]]],
+    [["html", [["lang", "en"]]], ["body", [["class", "a b"]]]],
+)
+FINGERPRINT = {"version": 1, "tags": ["html", "body"], "details": {"big": "data"}}
+
+
+def save(baseline_dir, name="first", fingerprint=FINGERPRINT):
+    return visual_helper.save_baseline(
+        "test_id", name, PAGE_URL, LEVELS, fingerprint, PNG, baseline_dir=str(baseline_dir)
+    )
+
+
+def check_baseline(baseline):
+    assert baseline["page_url"] == PAGE_URL
+    assert baseline["levels"] == [list(level) for level in LEVELS]
+    with open(baseline["screenshot"], "rb") as f:
+        assert f.read() == PNG
+
+
+def test_compact_baseline_round_trip(tmp_path):
+    baseline_file = save(tmp_path)
+    assert baseline_file == str(tmp_path / "test_id" / "first.json.gz")
+    assert os.path.exists(str(tmp_path / "test_id" / "first.png"))
+    baseline = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    check_baseline(baseline)
+    assert baseline["fingerprint"] == {"version": 1, "tags": ["html", "body"]}  # (No "details")
+
+
+def test_compact_baseline_without_fingerprint(tmp_path):
+    save(tmp_path, fingerprint=None)
+    baseline = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    check_baseline(baseline)
+    assert baseline["fingerprint"] is None
+
+
+def test_folders_baseline_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "folders")
+    folder = save(tmp_path)
+    assert folder == str(tmp_path / "test_id" / "first")
+    assert os.path.exists(os.path.join(folder, "tags_level_3.txt"))
+    baseline = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    check_baseline(baseline)
+    assert baseline["fingerprint"] == {"version": 1, "tags": ["html", "body"]}
+
+
+def test_missing_baseline(tmp_path):
+    assert visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path)) is None
+
+
+def test_corrupt_baseline_raises_an_exception(tmp_path):
+    baseline_file = save(tmp_path)
+    with open(baseline_file, "wb") as f:
+        f.write(b"Not gzip data")
+    with pytest.raises(Exception) as e:
+        visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    assert "--visual_baseline" in str(e.value)
+
+
+def test_baseline_without_a_screenshot(tmp_path):
+    save(tmp_path)
+    os.remove(str(tmp_path / "test_id" / "first.png"))
+    baseline = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    assert baseline["levels"] == [list(level) for level in LEVELS]
+    assert baseline["screenshot"] is None
+
+
+def test_folders_baseline_with_another_screenshot_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "folders")
+    folder = save(tmp_path)
+    os.rename(os.path.join(folder, "screenshot.png"), os.path.join(folder, "screenshot.webp"))
+    baseline = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    assert baseline["screenshot"] == os.path.join(folder, "screenshot.webp")
+    os.remove(os.path.join(folder, "screenshot.webp"))
+    baseline = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    assert baseline["levels"] == [list(level) for level in LEVELS]
+    assert baseline["screenshot"] is None
+
+
+def test_list_baselines(tmp_path):
+    save(tmp_path, name="second")
+    save(tmp_path, name="first")
+    save(tmp_path, name="first")  # (The latest index entry is used)
+    entries = visual_helper.list_baselines(baseline_dir=str(tmp_path))
+    assert [(entry["test_id"], entry["name"]) for entry in entries] == [
+        ("test_id", "first"),
+        ("test_id", "second"),
+    ]
+    assert entries[0]["file"] == "test_id/first.json.gz"
+    os.remove(str(tmp_path / visual_helper.INDEX_FILE))
+    rebuilt_entries = visual_helper.list_baselines(baseline_dir=str(tmp_path))
+    assert [entry["file"] for entry in rebuilt_entries] == [entry["file"] for entry in entries]
+
+
+def test_migrate_baselines(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "folders")
+    save(tmp_path, name="first")
+    save(tmp_path, name="second", fingerprint=None)
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "compact")
+    migrated = visual_helper.migrate_baselines(baseline_dir=str(tmp_path))
+    assert migrated == [("test_id", "first"), ("test_id", "second")]
+    assert not os.path.exists(str(tmp_path / "test_id" / "first"))
+    assert os.path.exists(str(tmp_path / "test_id" / "first.json.gz"))
+    first = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    check_baseline(first)
+    assert first["fingerprint"] == {"version": 1, "tags": ["html", "body"]}
+    second = visual_helper.load_baseline("test_id", "second", baseline_dir=str(tmp_path))
+    check_baseline(second)
+    assert second["fingerprint"] is None
+    assert visual_helper.migrate_baselines(baseline_dir=str(tmp_path)) == []
+
+
+def test_migrate_baselines_and_keep_the_folders(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "folders")
+    save(tmp_path)
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "compact")
+    assert visual_helper.migrate_baselines(baseline_dir=str(tmp_path), keep=True) == [("test_id", "first")]
+    assert os.path.exists(str(tmp_path / "test_id" / "first" / "page_url.txt"))
+    check_baseline(visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path)))
+
+
+def test_migrate_baselines_without_a_screenshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "folders")
+    folder = save(tmp_path)
+    os.remove(os.path.join(folder, "screenshot.png"))
+    monkeypatch.setattr(settings, "VISUAL_BASELINE_FORMAT", "compact")
+    assert visual_helper.migrate_baselines(baseline_dir=str(tmp_path)) == [("test_id", "first")]
+    baseline = visual_helper.load_baseline("test_id", "first", baseline_dir=str(tmp_path))
+    assert baseline["page_url"] == PAGE_URL
+    assert baseline["screenshot"] is None